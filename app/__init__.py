@@ -20,6 +20,23 @@ REDIS_URL = os.getenv(
     "REDIS_URL",
     f"redis://{REDIS_USERNAME}:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/0",
 )
+# Redis connection pool, timeouts in seconds
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+# Namespace policies, TTLs in seconds (0 keeps keys forever)
+REDIS_RESUME_TEXT_TTL = int(os.getenv("REDIS_RESUME_TEXT_TTL", 30 * 24 * 60 * 60))
+REDIS_ENHANCED_RESUME_TTL = int(os.getenv("REDIS_ENHANCED_RESUME_TTL", 7 * 24 * 60 * 60))
+REDIS_MAX_VALUE_BYTES = int(os.getenv("REDIS_MAX_VALUE_BYTES", 1024 * 1024))
+# In-process cache in front of Redis reads, TTL in seconds (0 disables it)
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", 30))
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 10000))
+# Compression of cached values: zlib, zstd (zstandard), lz4 (lz4) or none
+REDIS_COMPRESSION = os.getenv("REDIS_COMPRESSION", "zlib").lower()
+REDIS_COMPRESSION_MIN_BYTES = int(os.getenv("REDIS_COMPRESSION_MIN_BYTES", 1024))
 
 # JWT
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -36,6 +53,91 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY") or os.getenv(
     "CONVERSATION_SERVICE_GROQ_API_KEY"
 )
 
+# Backend routing: "single" sends every call to the primary backend, "hedged"
+# also sends a call to the secondary when the primary fails or is slower than
+# its recent latency percentile, and keeps the first answer
+LLM_ROUTING = os.getenv("LLM_ROUTING", "single").lower()
+LLM_PRIMARY_BACKEND = os.getenv("LLM_PRIMARY_BACKEND") or ("groq" if USE_GROQ else "ollama")
+LLM_SECONDARY_BACKEND = os.getenv("LLM_SECONDARY_BACKEND") or (
+    "ollama" if LLM_PRIMARY_BACKEND == "groq" else "groq"
+)
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 0.95))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+# Hedge delay bounds in seconds; the maximum is also used until enough samples exist
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", 1))
+LLM_HEDGE_MAX_DELAY = float(os.getenv("LLM_HEDGE_MAX_DELAY", 10))
+
+# Maximum concurrent LLM calls per backend
+LLM_MAX_CONCURRENCY = {
+    "groq": int(os.getenv("GROQ_MAX_CONCURRENCY", 256)),
+    "ollama": int(os.getenv("OLLAMA_MAX_CONCURRENCY", 8)),
+}
+
+# Adaptive concurrency: the limit of each backend moves between the minimum
+# and its max concurrency, halving on 429s or latency spikes over the factor
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", 1))
+LLM_LATENCY_BACKOFF_FACTOR = float(os.getenv("LLM_LATENCY_BACKOFF_FACTOR", 3))
+
+# Provider rate limits per backend as (requests, tokens) per minute, 0 for none
+LLM_RATE_LIMITS = {
+    "groq": (
+        int(os.getenv("GROQ_REQUESTS_PER_MINUTE", 0)),
+        int(os.getenv("GROQ_TOKENS_PER_MINUTE", 0)),
+    ),
+    "ollama": (
+        int(os.getenv("OLLAMA_REQUESTS_PER_MINUTE", 0)),
+        int(os.getenv("OLLAMA_TOKENS_PER_MINUTE", 0)),
+    ),
+}
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", 5))
+LLM_RATE_LIMIT_BACKOFF = float(os.getenv("LLM_RATE_LIMIT_BACKOFF", 1))
+# Completion tokens assumed per call when charging the token rate limit
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", 1024))
+
+# Micro-batching of concurrent calls to the same chain
+LLM_BATCHING = os.getenv("LLM_BATCHING", "false").lower() == "true"
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", 8))
+LLM_BATCH_MAX_WAIT_MS = float(os.getenv("LLM_BATCH_MAX_WAIT_MS", 10))
+
+# Enhancement mode: "pipeline" makes separate calls for the enhanced text,
+# keywords and structured resume, "combined" makes a single structured call
+ENHANCE_MODE = os.getenv("ENHANCE_MODE", "pipeline").lower()
+
+# Keyword extraction: "local" ranks keywords with BM25 and the skill
+# vocabulary, "llm" asks the model
+KEYWORD_EXTRACTOR = os.getenv("KEYWORD_EXTRACTOR", "local").lower()
+KEYWORD_LIMIT = int(os.getenv("KEYWORD_LIMIT", 30))
+SKILLS_PATH = os.getenv("SKILLS_PATH") or os.path.join(
+    os.path.dirname(__file__), "data", "skills.json"
+)
+
+# Resume to job match scoring, jobs scored per batch request
+MATCH_MAX_JOBS = int(os.getenv("MATCH_MAX_JOBS", 500))
+
+# Enhancement pipeline stage settings, in seconds
+LLM_STAGE_TIMEOUT = float(os.getenv("LLM_STAGE_TIMEOUT", 120))
+LLM_STAGE_CACHE_TTL = float(os.getenv("LLM_STAGE_CACHE_TTL", 300))
+
+# LLM response cache, 0 disables it
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 24 * 60 * 60))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024))
+
+# Prompt input budgets, in tokens per variable (0 disables a budget)
+LLM_TEXT_TOKEN_BUDGET = int(os.getenv("LLM_TEXT_TOKEN_BUDGET", 3000))
+LLM_USER_DATA_TOKEN_BUDGET = int(os.getenv("LLM_USER_DATA_TOKEN_BUDGET", 1500))
+# Longer job descriptions are analyzed once before being used in prompts
+LLM_JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("LLM_JOB_DESCRIPTION_TOKEN_BUDGET", 600))
+LLM_SUMMARY_INPUT_TOKEN_BUDGET = int(os.getenv("LLM_SUMMARY_INPUT_TOKEN_BUDGET", 6000))
+
+# Job description analyses shared by all applicants, in seconds (0 disables storing)
+JOB_ANALYSIS_TTL = int(os.getenv("JOB_ANALYSIS_TTL", 7 * 24 * 60 * 60))
+
+# Coalescing of concurrent identical requests, in seconds. Leaders renew their
+# lock while computing, so the TTL only bounds how long a crashed leader blocks
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", 30))
+SINGLE_FLIGHT_RESULT_TTL = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL", 30))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", 0.2))
+
 
 # RabbitMQ URL
 RABBITMQ_USERNAME = os.getenv("RABBITMQ_USERNAME")
@@ -56,6 +158,21 @@ RPC_QUEUE = os.getenv("SERVICE_RPC", "CONVERSATION_RPC")
 USER_QUEUE = os.getenv("USER_QUEUE")
 USER_RPC = os.getenv("USER_RPC")
 
+# PDF download settings
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", 10 * 1024 * 1024))
+PDF_SPOOL_BYTES = int(os.getenv("PDF_SPOOL_BYTES", 1024 * 1024))
+PDF_CHUNK_BYTES = int(os.getenv("PDF_CHUNK_BYTES", 64 * 1024))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 20))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))
+
+# PDF extraction settings
+PDF_ENGINE = os.getenv("PDF_ENGINE", "pypdf2")
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS") or os.cpu_count() or 1)
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", 30))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 50))
+PDF_PAGES_PER_TASK = max(1, int(os.getenv("PDF_PAGES_PER_TASK", 2)))
+
 _imported_variable = {
     "HOST": HOST,
     "PORT": PORT,
@@ -65,9 +182,27 @@ _imported_variable = {
     "EXCHANGE_NAME": EXCHANGE_NAME,
 }
 
-if USE_GROQ:
+if ENHANCE_MODE not in ("pipeline", "combined"):
+    raise ValueError(f"Invalid ENHANCE_MODE: {ENHANCE_MODE}")
+
+if REDIS_COMPRESSION not in ("zlib", "zstd", "lz4", "none"):
+    raise ValueError(f"Invalid REDIS_COMPRESSION: {REDIS_COMPRESSION}")
+
+if KEYWORD_EXTRACTOR not in ("local", "llm"):
+    raise ValueError(f"Invalid KEYWORD_EXTRACTOR: {KEYWORD_EXTRACTOR}")
+
+if LLM_ROUTING not in ("single", "hedged"):
+    raise ValueError(f"Invalid LLM_ROUTING: {LLM_ROUTING}")
+
+_backends = {LLM_PRIMARY_BACKEND}
+if LLM_ROUTING == "hedged":
+    _backends.add(LLM_SECONDARY_BACKEND)
+
+if not _backends <= {"groq", "ollama"}:
+    raise ValueError(f"Invalid LLM backends: {sorted(_backends)}")
+if "groq" in _backends:
     _imported_variable.update({"GROQ_API_KEY": GROQ_API_KEY, "GROQ_MODEL": GROQ_MODEL})
-else:
+if "ollama" in _backends:
     _imported_variable.update({"MODEL": MODEL})
 
 if not all(_imported_variable.values()):
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 
 from app.routers import resume  # Only import resume router
+from app.services.llm import LLMCache, LLMRouter
 from app.utils.errors import (
     BaseException,
     base_exception_handler,
@@ -28,5 +29,15 @@ async def root():
         "service": "resume",
         "endpoints": {
             "POST /resume/process/{user_id}": "Process or enhance a resume",
+            "POST /resume/process/{user_id}/stream": "Enhance a resume, streamed as server-sent events",
+            "POST /resume/match/{user_id}": "Score how well a resume fits a job",
+            "POST /resume/match/{user_id}/batch": "Score a resume against many jobs, best first",
+            "GET /stats": "Cache and routing counters of this worker process",
         }
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/stats")
+async def stats():
+    """Cache and routing counters of this worker process, reset when it restarts"""
+    return {"llm_cache": LLMCache.stats(), "llm_routing": LLMRouter.stats()}
\ No newline at end of file
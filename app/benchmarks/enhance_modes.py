@@ -0,0 +1,212 @@
+"""
+Benchmark the resume enhancement modes against the configured LLM backends
+
+Runs the ``pipeline`` mode (enhanced text, then keywords and the structured
+resume concurrently) and the single-call ``combined`` mode on the same resume
+and reports latency, round trips and token usage per run. Like the service,
+the pipeline ranks keywords locally unless ``KEYWORD_EXTRACTOR=llm``. The LLM
+cache is bypassed so every run reaches the model. Token counts come from the
+provider's usage metadata when langchain reports it, otherwise they are
+estimated from the prompts and outputs.
+
+Usage::
+
+    python -m app.benchmarks.enhance_modes [--resume resume.pdf] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app import KEYWORD_EXTRACTOR, LLM_COMPLETION_TOKEN_ESTIMATE
+from app.benchmarks.pdf_engines import SAMPLE_LINES
+from app.services.llm import ChainRegistry, LLMRouter
+from app.services.redis import RedisService
+from app.services.textEditing import TextEditingService
+from app.utils.keywords import rank_keywords
+from app.utils.pdf_engines import get_engine
+from app.utils.pdf_text import HTTPClient
+from app.utils.skills import detected_skills
+from app.utils.tokens import compact_text, count_tokens
+
+try:
+    from langchain_core.callbacks import get_usage_metadata_callback
+except ImportError:  # langchain-core < 0.3.49
+    get_usage_metadata_callback = None
+
+_JOB_TITLE = "Senior Backend Engineer"
+_JOB_DESCRIPTION = (
+    "We are looking for a senior backend engineer to design and operate Python "
+    "APIs with FastAPI, PostgreSQL and Redis on Kubernetes in AWS. You will own "
+    "event-driven services on RabbitMQ, mentor engineers and improve reliability."
+)
+
+
+def load_resume(path: Optional[str]) -> str:
+    """Text of a .txt or .pdf resume, or a sample resume without a path"""
+    if not path:
+        return "\n".join(SAMPLE_LINES)
+    if path.endswith(".pdf"):
+        engine = get_engine()
+        document = engine.open(Path(path).read_bytes())
+        return "\n".join(
+            engine.extract_page(document, page) for page in range(engine.page_count(document))
+        )
+    return Path(path).read_text()
+
+
+async def _call(name: str, inputs: Dict[str, Any], usage: Counter) -> Any:
+    """Invoke a chain the way the service does, without the LLM cache"""
+    inputs = TextEditingService._fit_inputs(name, inputs)
+    result = await LLMRouter.invoke(name, inputs)
+
+    output = result.model_dump_json() if isinstance(result, BaseModel) else str(result)
+    usage["calls"] += 1
+    usage["estimated_input"] += (
+        TextEditingService._estimate_tokens(name, inputs) - LLM_COMPLETION_TOKEN_ESTIMATE
+    )
+    usage["estimated_output"] += count_tokens(output)
+    return result
+
+
+async def _keywords(text: str, job_description: str, usage: Counter) -> Any:
+    """Extract keywords with the configured extractor, as the service does"""
+    if KEYWORD_EXTRACTOR == "local":
+        return rank_keywords(text, job_description)
+    return await _call("extract_keywords", {"text": text, "job_description": job_description}, usage)
+
+
+async def _pipeline_mode(text: str, job_title: str, job_description: str, usage: Counter) -> None:
+    enhanced = await _call(
+        "enhance_text",
+        {"text": text, "job_title": job_title, "job_description": job_description},
+        usage,
+    )
+    await asyncio.gather(
+        _keywords(enhanced, job_description, usage),
+        _call(
+            "process_resume",
+            {
+                "text": enhanced,
+                "domain": "",
+                "job_title": job_title,
+                "job_description": job_description,
+                "user_data": "",
+                "detected_skills": ", ".join(detected_skills(enhanced)),
+            },
+            usage,
+        ),
+    )
+
+
+async def _combined_mode(text: str, job_title: str, job_description: str, usage: Counter) -> None:
+    await _call(
+        "combined_enhance",
+        {
+            "text": text,
+            "domain": "",
+            "job_title": job_title,
+            "job_description": job_description,
+            "user_data": "",
+            "detected_skills": ", ".join(detected_skills(text)),
+        },
+        usage,
+    )
+
+
+MODES = {"pipeline": _pipeline_mode, "combined": _combined_mode}
+
+
+async def _run_mode(mode: str, text: str, job_title: str, job_description: str, repeat: int) -> dict:
+    """Run one mode ``repeat`` times and collect its latencies and token usage"""
+    latencies: List[float] = []
+    usage: Counter = Counter()
+    errors = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            if get_usage_metadata_callback is None:
+                await MODES[mode](text, job_title, job_description, usage)
+            else:
+                with get_usage_metadata_callback() as callback:
+                    await MODES[mode](text, job_title, job_description, usage)
+                for metadata in callback.usage_metadata.values():
+                    usage["input"] += metadata.get("input_tokens", 0)
+                    usage["output"] += metadata.get("output_tokens", 0)
+        except Exception as e:
+            errors += 1
+            print(f"{mode}: {e}")
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    runs = max(1, len(latencies))
+    reported = bool(usage["input"])
+    return {
+        "mode": mode,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "max": max(latencies, default=0.0),
+        "calls": usage["calls"] / runs,
+        "input_tokens": (usage["input"] if reported else usage["estimated_input"]) / runs,
+        "output_tokens": (usage["output"] if reported else usage["estimated_output"]) / runs,
+        "reported": reported,
+        "errors": errors,
+    }
+
+
+async def _run_modes(
+    modes: List[str], text: str, job_title: str, job_description: str, repeat: int
+) -> List[dict]:
+    """
+    Run the modes one after another in a single event loop
+
+    The limiter, the Redis pool and the HTTP session are bound to the loop
+    that first uses them, so every mode has to run in the same one.
+    """
+    try:
+        return [
+            await _run_mode(mode, text, job_title, job_description, repeat) for mode in modes
+        ]
+    finally:
+        await RedisService.disconnect()
+        await HTTPClient.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resume", help="Resume as .txt or .pdf, default a sample resume")
+    parser.add_argument("--job-title", default=_JOB_TITLE)
+    parser.add_argument("--job-description", default=_JOB_DESCRIPTION)
+    parser.add_argument("--modes", default="pipeline,combined", help="Comma-separated modes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode")
+    args = parser.parse_args()
+
+    ChainRegistry.load()
+    text = load_resume(args.resume)
+    job_description = compact_text(args.job_description)
+
+    reports = asyncio.run(
+        _run_modes(args.modes.split(","), text, args.job_title, job_description, args.repeat)
+    )
+
+    print(
+        f"{'mode':<10}{'p50 s':>8}{'max s':>8}{'calls':>7}"
+        f"{'in tok':>9}{'out tok':>9}{'errors':>8}"
+    )
+    for report in reports:
+        print(
+            f"{report['mode']:<10}{report['p50']:>8.2f}{report['max']:>8.2f}"
+            f"{report['calls']:>7.1f}{report['input_tokens']:>9.0f}"
+            f"{report['output_tokens']:>9.0f}{report['errors']:>8}"
+        )
+    if not all(report["reported"] for report in reports):
+        print("\nToken counts are estimated; the backend did not report usage")
+
+
+if __name__ == "__main__":
+    main()
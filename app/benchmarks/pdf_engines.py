@@ -0,0 +1,222 @@
+"""
+Benchmark the PDF extraction engines on a corpus of resumes
+
+Runs every available engine in a fresh process over the same PDFs and reports
+pages per second, peak RSS and text fidelity. Fidelity is the bag-of-words F1
+score against ``<name>.txt`` next to each PDF when present, otherwise against
+the ``--reference`` engine. Without a corpus directory a synthetic corpus of
+resume-like PDFs with known text is generated.
+
+Usage::
+
+    python -m app.benchmarks.pdf_engines [CORPUS_DIR] [--engines pypdf2,textlayer]
+"""
+
+import argparse
+import multiprocessing
+import re
+import resource
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.pdf_engines import available_engines, get_engine
+
+_WORDS = re.compile(r"\w+")
+
+SAMPLE_LINES = [
+    "Jane Doe - Senior Software Engineer",
+    "jane.doe@example.com | +1 555 0100 | Berlin, Germany",
+    "Summary: Backend engineer with 8 years of experience building APIs.",
+    "Skills: Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS",
+    "Experience: Acme Corp, 2019 - Present",
+    "Led migration of 40 services to Kubernetes, cutting costs by 30%.",
+    "Designed event-driven pipelines with RabbitMQ processing 2M msgs/day.",
+    "Education: B.Tech Computer Science, Example University, 2016",
+    "Projects: Resume parser, real-time analytics dashboard",
+    "Certifications: AWS Certified Solutions Architect",
+]
+"""Lines of the sample resume shared by the benchmarks."""
+
+
+def synthetic_pdf(pages: int) -> Tuple[bytes, str]:
+    """Build a Helvetica-only PDF with ``pages`` pages and return it with its text"""
+    objects: List[bytes] = []
+    text_pages = []
+    page_ids = [4 + 2 * i for i in range(pages)]
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_num, page_id in enumerate(page_ids):
+        lines = [f"Page {page_num + 1}"] + SAMPLE_LINES * 4
+        text_pages.append("\n".join(lines))
+        escaped = [
+            line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            for line in lines
+        ]
+        stream = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(
+            f"({line}) Tj T*" for line in escaped
+        ) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode()
+        )
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(pdf), "\n".join(text_pages)
+
+
+def load_corpus(directory: Optional[str]) -> List[Tuple[str, bytes, Optional[str]]]:
+    """Load (name, PDF bytes, ground truth text) for every PDF in a directory"""
+    if not directory:
+        corpus = []
+        for pages in (1, 2, 3, 5, 10):
+            pdf, text = synthetic_pdf(pages)
+            corpus.append((f"synthetic-{pages}p.pdf", pdf, text))
+        return corpus
+
+    corpus = []
+    for path in sorted(Path(directory).glob("*.pdf")):
+        truth = path.with_suffix(".txt")
+        corpus.append(
+            (
+                path.name,
+                path.read_bytes(),
+                truth.read_text(encoding="utf-8") if truth.exists() else None,
+            )
+        )
+    return corpus
+
+
+def fidelity(text: str, reference: str) -> float:
+    """Bag-of-words F1 score of extracted text against a reference"""
+    found = Counter(word.lower() for word in _WORDS.findall(text))
+    expected = Counter(word.lower() for word in _WORDS.findall(reference))
+    if not found or not expected:
+        return float(found == expected)
+
+    overlap = sum((found & expected).values())
+    precision = overlap / sum(found.values())
+    recall = overlap / sum(expected.values())
+    return 2 * precision * recall / (precision + recall) if overlap else 0.0
+
+
+def _run_engine(engine_name: str, corpus, repeat: int, results) -> None:
+    """Extract the corpus with one engine. Runs in a dedicated process."""
+    engine = get_engine(engine_name)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    texts: Dict[str, str] = {}
+    pages = 0
+    errors = 0
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, pdf_bytes, _truth in corpus:
+            try:
+                document = engine.open(pdf_bytes)
+                count = engine.page_count(document)
+                texts[name] = "".join(
+                    engine.extract_page(document, page_num) for page_num in range(count)
+                )
+                pages += count
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - started
+
+    results.put(
+        {
+            "engine": engine_name,
+            "pages": pages,
+            "seconds": elapsed,
+            "errors": errors,
+            # ru_maxrss is reported in kilobytes on Linux
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "baseline_rss_mb": baseline_rss / 1024,
+            "texts": texts,
+        }
+    )
+
+
+def run(corpus, engines: List[str], repeat: int = 3) -> List[dict]:
+    """Benchmark each engine in a fresh process so peak RSS is not shared"""
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    for engine_name in engines:
+        results = context.Queue()
+        process = context.Process(
+            target=_run_engine, args=(engine_name, corpus, repeat, results)
+        )
+        process.start()
+        reports.append(results.get())
+        process.join()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus", nargs="?", help="Directory of PDFs (and .txt truths)")
+    parser.add_argument("--engines", help="Comma-separated engines, default all available")
+    parser.add_argument("--reference", default="pypdf2", help="Engine used when no .txt")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument(
+        "--min-fidelity", type=float, default=0.9, help="Fidelity needed to recommend"
+    )
+    args = parser.parse_args()
+
+    engines = args.engines.split(",") if args.engines else available_engines()
+    corpus = load_corpus(args.corpus)
+    reports = run(corpus, engines, args.repeat)
+
+    reference = next((r for r in reports if r["engine"] == args.reference), None)
+    if reference is None and any(truth is None for _, _, truth in corpus):
+        reference = run(corpus, [args.reference], 1)[0]
+
+    print(
+        f"{'engine':<12}{'pages/s':>10}{'peak MB':>10}{'base MB':>10}"
+        f"{'fidelity':>10}{'errors':>8}"
+    )
+    for report in reports:
+        scores = [
+            fidelity(
+                report["texts"].get(name, ""),
+                truth if truth is not None else reference["texts"].get(name, ""),
+            )
+            for name, _, truth in corpus
+        ]
+        report["fidelity"] = sum(scores) / len(scores) if scores else 0.0
+        report["pages_per_second"] = report["pages"] / report["seconds"] if report["seconds"] else 0.0
+        print(
+            f"{report['engine']:<12}{report['pages_per_second']:>10.1f}"
+            f"{report['peak_rss_mb']:>10.1f}{report['baseline_rss_mb']:>10.1f}"
+            f"{report['fidelity']:>10.3f}{report['errors']:>8}"
+        )
+
+    good_enough = [r for r in reports if r["fidelity"] >= args.min_fidelity and not r["errors"]]
+    if good_enough:
+        best = max(good_enough, key=lambda r: r["pages_per_second"])
+        print(f"\nRecommended: PDF_ENGINE={best['engine']}")
+    else:
+        print(f"\nNo engine reached fidelity {args.min_fidelity}")
+
+
+if __name__ == "__main__":
+    main()
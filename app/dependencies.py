@@ -1,9 +1,11 @@
+from functools import lru_cache
 from typing import Annotated
 
 import jwt
 from fastapi import Header
 
 from app import ENV, JWT_SECRET_KEY
+from app.services.resume_processor import ResumeProcessor
 from app.utils.errors import UnauthorizedException401
 
 
@@ -34,3 +36,9 @@ async def authorize(
 async def authorize_interview():
     """Authorize interview requests."""
     pass
+
+
+@lru_cache
+def get_resume_processor() -> ResumeProcessor:
+    """Resume processor shared by all requests."""
+    return ResumeProcessor()
@@ -8,7 +8,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from app import ENV, SERVICE_QUEUE
 from app.app_v1 import app as app_v1
 from app.services.broker import Broker, EventService, RPCService
+from app.services.llm import ChainRegistry
 from app.services.redis import RedisService
+from app.utils.pdf_executor import PDFExtractor
+from app.utils.pdf_text import HTTPClient
+from app.utils.skills import SkillIndex
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:\t  %(message)s")
 logging.getLogger("uvicorn.access").addFilter(
@@ -19,19 +23,28 @@ logging.getLogger("uvicorn.access").addFilter(
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     RedisService.connect()
+    if not await RedisService.ping():
+        logging.warning("Redis is unreachable; caches are bypassed until it recovers")
+    await HTTPClient.connect()
+    PDFExtractor.start()
+    ChainRegistry.load()
+    SkillIndex.load()
     await Broker.connect()
     logging.info(f"Serving in {ENV} environment")
 
     tasks = [
         EventService.subscribe(SERVICE_QUEUE, EventService),
         RPCService.respond(EventService),
+        RedisService.listen_invalidations(),
     ]
     tasks = [asyncio.create_task(task) for task in tasks]
 
     yield
 
     [task.cancel() for task in tasks]
-    RedisService.disconnect()
+    await RedisService.disconnect()
+    await HTTPClient.close()
+    PDFExtractor.shutdown()
     await Broker.close()
 
 
@@ -1,11 +1,17 @@
+import json
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Annotated, Dict, Any
+from typing import Optional, Annotated, Dict, Any, List, Literal
 
-from app.dependencies import authorize
+from app import MATCH_MAX_JOBS
+from app.dependencies import authorize, get_resume_processor
 from app.utils.resume_url import get_resume_url
 from app.services.resume_processor import ResumeProcessor
 from app.types.responseFormat import UserData
+from app.utils.errors import BadRequestException400
 
 router = APIRouter(prefix="/resume", tags=["resume"])
 
@@ -14,17 +20,25 @@ class JobDetails(BaseModel):
     job_description: str
     domain: Optional[str] = ""
     tone: Optional[str] = "professional"
+    mode: Optional[Literal["pipeline", "combined"]] = None
+
+class JobPosting(BaseModel):
+    id: Optional[str] = None
+    job_title: Optional[str] = ""
+    job_description: str
+
+class JobPostings(BaseModel):
+    jobs: List[JobPosting]
 
 @router.post("/process/{user_id}")
 async def process_resume(
         user_id: Annotated[str, Depends(authorize)],
+        resume_processor: Annotated[ResumeProcessor, Depends(get_resume_processor)],
         job_details: JobDetails = None,
         is_job: bool = False,
         user_data : str = " "
 ) -> Dict[str, Any]:
     try:
-        resume_processor = ResumeProcessor()
-        
         if is_job and job_details:
             result = await resume_processor.enhance_resume(
                 user_id=user_id,
@@ -32,7 +46,8 @@ async def process_resume(
                 job_title=job_details.job_title,
                 job_description=job_details.job_description,
                 domain=job_details.domain,
-                tone=job_details.tone
+                tone=job_details.tone,
+                mode=job_details.mode
             )
             return result
         else:
@@ -42,13 +57,84 @@ async def process_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/process/{user_id}/stream")
+async def stream_process_resume(
+        user_id: Annotated[str, Depends(authorize)],
+        resume_processor: Annotated[ResumeProcessor, Depends(get_resume_processor)],
+        job_details: JobDetails,
+        user_data : str = " "
+) -> StreamingResponse:
+    """
+    Enhance a resume for a job, streaming results as server-sent events.
+
+    Streaming always runs the pipeline mode, whose enhanced text can be
+    streamed token by token; ``mode`` is ignored.
+    """
+    events = resume_processor.stream_enhance_resume(
+        user_id=user_id,
+        user_data=user_data,
+        job_title=job_details.job_title,
+        job_description=job_details.job_description,
+        domain=job_details.domain,
+        tone=job_details.tone
+    )
+
+    async def event_stream():
+        async for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/match/{user_id}")
+async def match_resume(
+        user_id: Annotated[str, Depends(authorize)],
+        resume_processor: Annotated[ResumeProcessor, Depends(get_resume_processor)],
+        job: JobPosting
+) -> Dict[str, Any]:
+    """Score how well the resume fits a job, without LLM calls."""
+    try:
+        [match] = await resume_processor.match_jobs(
+            user_id, [(job.job_title or "", job.job_description)]
+        )
+        return {"user_id": user_id, "id": job.id, **match}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/match/{user_id}/batch")
+async def match_resume_batch(
+        user_id: Annotated[str, Depends(authorize)],
+        resume_processor: Annotated[ResumeProcessor, Depends(get_resume_processor)],
+        postings: JobPostings
+) -> Dict[str, Any]:
+    """Score the resume against many jobs, best matches first."""
+    if len(postings.jobs) > MATCH_MAX_JOBS:
+        raise BadRequestException400(f"At most {MATCH_MAX_JOBS} jobs can be scored at once")
+    try:
+        matches = await resume_processor.match_jobs(
+            user_id, [(job.job_title or "", job.job_description) for job in postings.jobs]
+        )
+        ranked = sorted(
+            (
+                {"id": job.id, "index": index, **match}
+                for index, (job, match) in enumerate(zip(postings.jobs, matches))
+            ),
+            key=lambda match: -match["score"],
+        )
+        return {"user_id": user_id, "matches": ranked}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/create/{user_id}")
 async def create_resume(
         user_id: Annotated[str, Depends(authorize)],
+        resume_processor: Annotated[ResumeProcessor, Depends(get_resume_processor)],
         user_data: UserData
 ) -> Dict[str, Any]:
     try:
-        resume_processor = ResumeProcessor()
         result = await resume_processor.create_resume_from_user_data(
             user_id=user_id,
             user_data=user_data.model_dump()
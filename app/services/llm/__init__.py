@@ -0,0 +1,5 @@
+from .batching import BatchDispatcher
+from .cache import LLMCache
+from .chains import CHAIN_SPECS, ChainRegistry
+from .limiter import LLMLimiter
+from .routing import LLMRouter
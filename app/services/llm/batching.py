@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set
+
+from app import (
+    LLM_BATCH_MAX_SIZE,
+    LLM_BATCH_MAX_WAIT_MS,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_LIMIT_BACKOFF,
+)
+from app.utils.errors.exceptions import LLMServiceError
+
+from .chains import ChainRegistry
+from .limiter import LLMLimiter, is_rate_limit_error
+
+
+@dataclass
+class _PendingCall:
+    """A chain call waiting for its batch to be sent"""
+
+    inputs: Dict[str, Any]
+    tokens: int
+    future: "asyncio.Future"
+
+
+class BatchDispatcher:
+    """
+    Collects concurrent calls to the same chain for up to
+    ``LLM_BATCH_MAX_WAIT_MS`` and sends them together with ``abatch``
+
+    A batch is sent as soon as it holds ``LLM_BATCH_MAX_SIZE`` calls, capped
+    by the backend's concurrency limit, and holds one limiter slot per call.
+    """
+
+    _queues: Dict[str, List[_PendingCall]] = {}
+    """Calls waiting to be sent, by chain name."""
+    _timers: Dict[str, asyncio.TimerHandle] = {}
+    """Scheduled flush of each non-empty queue."""
+    _batches: Set["asyncio.Task"] = set()
+    """Batches and retries being sent, referenced so they are not garbage collected."""
+
+    @staticmethod
+    def max_size(backend: str) -> int:
+        """Largest batch sent to a backend"""
+        return max(1, min(LLM_BATCH_MAX_SIZE, LLM_MAX_CONCURRENCY[backend]))
+
+    @classmethod
+    async def submit(cls, name: str, inputs: Dict[str, Any], tokens: int = 0) -> Any:
+        """
+        Invoke a shared chain as part of a batch
+
+        Args:
+            name: Name of the chain
+            inputs: Inputs of the chain
+            tokens: Estimated prompt and completion tokens of the call
+
+        Returns:
+            The chain output for these inputs
+
+        Raises:
+            LLMServiceError: The call failed
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = cls._queues.setdefault(name, [])
+        queue.append(_PendingCall(inputs, tokens, future))
+
+        if len(queue) >= cls.max_size(ChainRegistry.backend()):
+            cls._flush(name)
+        elif name not in cls._timers:
+            cls._timers[name] = loop.call_later(
+                LLM_BATCH_MAX_WAIT_MS / 1000, cls._flush, name
+            )
+        return await future
+
+    @classmethod
+    def _flush(cls, name: str) -> None:
+        """Send the queued calls of a chain"""
+        timer = cls._timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+
+        # Callers that were cancelled while waiting are left out
+        batch = [call for call in cls._queues.pop(name, []) if not call.future.done()]
+        if not batch:
+            return
+
+        cls._track(asyncio.ensure_future(cls._send(name, batch)))
+
+    @classmethod
+    def _track(cls, task: "asyncio.Task") -> None:
+        """Keep a reference to a background task until it finishes"""
+        cls._batches.add(task)
+        task.add_done_callback(cls._batches.discard)
+
+    @classmethod
+    async def _send(cls, name: str, batch: List[_PendingCall]) -> None:
+        """Run a batch and resolve the future of every call in it"""
+        backend = ChainRegistry.backend()
+        chain = ChainRegistry.get(name)
+        try:
+            async with LLMLimiter.limit(
+                backend,
+                calls=len(batch),
+                tokens=sum(call.tokens for call in batch),
+                chain=name,
+            ):
+                results = await chain.abatch(
+                    [call.inputs for call in batch],
+                    config={"max_concurrency": len(batch)},
+                    return_exceptions=True,
+                )
+        except asyncio.CancelledError:
+            for call in batch:
+                call.future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+
+        logging.debug(f"Sent batch of {len(batch)} {name} calls")
+        throttled = False
+        for call, result in zip(batch, results):
+            if call.future.done():
+                continue
+            if isinstance(result, Exception) and is_rate_limit_error(result):
+                # Calls the provider throttled are retried one by one with backoff
+                throttled = True
+                cls._track(asyncio.ensure_future(cls._retry(name, call)))
+            elif isinstance(result, Exception):
+                call.future.set_exception(LLMServiceError(str(result)))
+            else:
+                call.future.set_result(result)
+        if throttled:
+            LLMLimiter.throttled(backend)
+
+    @classmethod
+    async def _retry(cls, name: str, call: _PendingCall) -> None:
+        """Retry a throttled call of a batch on its own"""
+        chain = ChainRegistry.get(name)
+        try:
+            await asyncio.sleep(LLM_RATE_LIMIT_BACKOFF)
+            result = await LLMLimiter.run(
+                ChainRegistry.backend(), lambda: chain.ainvoke(call.inputs), call.tokens, name
+            )
+        except asyncio.CancelledError:
+            call.future.cancel()
+            raise
+        except Exception as e:
+            if not call.future.done():
+                call.future.set_exception(LLMServiceError(str(e)))
+        else:
+            if not call.future.done():
+                call.future.set_result(result)
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, Tuple
+
+from pydantic import BaseModel
+
+from app import LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL
+from app.services.redis import RedisService
+from app.utils import serialization
+
+from .chains import CHAIN_SPECS
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class LLMCache:
+    """
+    Persistent cache of chain outputs, keyed by a hash of the chain name,
+    template version, normalized inputs and model id
+    """
+
+    _hits: Counter = Counter()
+    """Cache hits per chain in this process."""
+    _misses: Counter = Counter()
+    """Cache misses per chain in this process."""
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        """Collapse whitespace so formatting-only differences share an entry"""
+        if isinstance(value, str):
+            return _WHITESPACE.sub(" ", value).strip()
+        if isinstance(value, dict):
+            return {key: LLMCache._normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [LLMCache._normalize(item) for item in value]
+        return value
+
+    @staticmethod
+    def key(chain: str, version: str, model_id: str, inputs: Dict[str, Any]) -> str:
+        """Cache key of a chain call"""
+        payload = json.dumps(
+            {
+                "chain": chain,
+                "version": version,
+                "model": model_id,
+                "inputs": LLMCache._normalize(inputs),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return serialization.dumps({"response": value})
+        return serialization.dumps({"text": value})
+
+    @staticmethod
+    def _decode(chain: str, raw: bytes) -> Any:
+        data = serialization.loads(raw)
+        if "response" in data:
+            return CHAIN_SPECS[chain].output_model.model_validate(data["response"])
+        return data["text"]
+
+    @classmethod
+    async def get(cls, chain: str, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached chain output
+
+        Returns:
+            Whether the key was found, and the cached output
+        """
+        if LLM_CACHE_TTL <= 0:
+            return False, None
+
+        try:
+            raw = await RedisService.getKeyWithNamespace(
+                RedisService.Namespace.LLM_RESPONSE, key
+            )
+        except Exception as e:
+            logging.warning(f"LLM cache lookup failed: {e}")
+            raw = None
+
+        if raw is None:
+            cls._misses[chain] += 1
+            return False, None
+
+        try:
+            value = cls._decode(chain, raw)
+        except Exception as e:
+            # Corrupt entries or entries of an older format are recomputed
+            logging.warning(f"Dropping undecodable LLM cache entry of {chain}: {e}")
+            cls._misses[chain] += 1
+            try:
+                await RedisService.deleteKeyWithNamespace(
+                    RedisService.Namespace.LLM_RESPONSE, key
+                )
+            except Exception as e:
+                logging.warning(f"LLM cache delete failed: {e}")
+            return False, None
+
+        cls._hits[chain] += 1
+        return True, value
+
+    @classmethod
+    async def set(cls, chain: str, key: str, value: Any) -> None:
+        """Cache a chain output unless it exceeds ``LLM_CACHE_MAX_BYTES``"""
+        if LLM_CACHE_TTL <= 0:
+            return
+
+        encoded = cls._encode(value)
+        if len(encoded) > LLM_CACHE_MAX_BYTES:
+            logging.info(f"Skipping LLM cache for {chain}: {len(encoded)} bytes")
+            return
+
+        try:
+            await RedisService.setKeyWithNamespace(
+                RedisService.Namespace.LLM_RESPONSE, key, encoded, ex=LLM_CACHE_TTL
+            )
+        except Exception as e:
+            logging.warning(f"LLM cache store failed: {e}")
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, int]]:
+        """Hit and miss counters per chain in this process"""
+        return {
+            chain: {"hits": cls._hits[chain], "misses": cls._misses[chain]}
+            for chain in sorted(set(cls._hits) | set(cls._misses))
+        }
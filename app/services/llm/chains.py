@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Type
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
+from langchain_groq import ChatGroq
+from langchain_ollama import ChatOllama
+from pydantic import BaseModel
+
+from app import (
+    GROQ_API_KEY,
+    GROQ_MODEL,
+    LLM_JOB_DESCRIPTION_TOKEN_BUDGET,
+    LLM_PRIMARY_BACKEND,
+    LLM_ROUTING,
+    LLM_SECONDARY_BACKEND,
+    LLM_SUMMARY_INPUT_TOKEN_BUDGET,
+    LLM_TEXT_TOKEN_BUDGET,
+    LLM_USER_DATA_TOKEN_BUDGET,
+    MODEL,
+)
+from app.services.system_messages import (
+    adjust_resume_prompts,
+    analyze_job_description_prompt,
+    bullet_format_prompts,
+    combined_enhance_prompt,
+    enhance_resume_prompts,
+    extract_keyword_prompts,
+    grammar_resume_prompts,
+    resume_prompts,
+    user_data_resume_prompt,
+)
+from app.types.responseFormat import CombinedResponse, JobAnalysis, Response
+
+
+@dataclass(frozen=True)
+class ChainSpec:
+    """Prompt template and output type of a chain"""
+
+    template: str
+    """Prompt template text."""
+    input_variables: List[str]
+    """Variables the template expects."""
+    output_model: Optional[Type[BaseModel]] = None
+    """Model of the structured output, None for chains returning a string."""
+    budgets: Mapping[str, int] = field(default_factory=dict)
+    """Maximum tokens of each input variable; longer inputs are compacted and cut."""
+
+    @property
+    def version(self) -> str:
+        """Short hash of the template, changes whenever the prompt changes"""
+        output = self.output_model.__name__ if self.output_model else None
+        payload = json.dumps([self.template, self.input_variables, output])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+_TEXT_BUDGETS = {
+    "text": LLM_TEXT_TOKEN_BUDGET,
+    "job_description": LLM_JOB_DESCRIPTION_TOKEN_BUDGET,
+    "user_data": LLM_USER_DATA_TOKEN_BUDGET,
+}
+
+CHAIN_SPECS: Dict[str, ChainSpec] = {
+    "process_resume": ChainSpec(
+        resume_prompts,
+        ["text", "domain", "job_title", "job_description", "user_data", "detected_skills"],
+        output_model=Response,
+        budgets=_TEXT_BUDGETS,
+    ),
+    "combined_enhance": ChainSpec(
+        combined_enhance_prompt,
+        ["text", "domain", "job_title", "job_description", "user_data", "detected_skills"],
+        output_model=CombinedResponse,
+        budgets=_TEXT_BUDGETS,
+    ),
+    "enhance_text": ChainSpec(
+        enhance_resume_prompts,
+        ["text", "job_title", "job_description"],
+        budgets=_TEXT_BUDGETS,
+    ),
+    "check_grammar": ChainSpec(grammar_resume_prompts, ["text"], budgets=_TEXT_BUDGETS),
+    "adjust_tone": ChainSpec(adjust_resume_prompts, ["text", "tone"], budgets=_TEXT_BUDGETS),
+    "extract_keywords": ChainSpec(
+        extract_keyword_prompts, ["text", "job_description"], budgets=_TEXT_BUDGETS
+    ),
+    "format_bullet_points": ChainSpec(bullet_format_prompts, ["text"], budgets=_TEXT_BUDGETS),
+    "create_resume_from_user_data": ChainSpec(
+        user_data_resume_prompt, ["user_data"], budgets=_TEXT_BUDGETS
+    ),
+    "analyze_job_description": ChainSpec(
+        analyze_job_description_prompt,
+        ["job_description", "max_words"],
+        output_model=JobAnalysis,
+        budgets={"job_description": LLM_SUMMARY_INPUT_TOKEN_BUDGET},
+    ),
+}
+"""Chains available to the text editing service, by name."""
+
+
+class ChainRegistry:
+    """Model clients and prompt chains built once and shared across requests"""
+
+    _models: Dict[str, BaseChatModel] = {}
+    """Chat model client per backend, shared so HTTP connections are kept alive."""
+    _chains: Dict[str, Dict[str, Runnable]] = {}
+    """Prebuilt chains per backend, by name."""
+
+    @staticmethod
+    def backend() -> str:
+        """Name of the primary LLM backend"""
+        return LLM_PRIMARY_BACKEND
+
+    @staticmethod
+    def backends() -> List[str]:
+        """Names of the backends calls are routed to, primary first"""
+        if LLM_ROUTING == "hedged":
+            return [LLM_PRIMARY_BACKEND, LLM_SECONDARY_BACKEND]
+        return [LLM_PRIMARY_BACKEND]
+
+    @classmethod
+    def model_id(cls, backend: Optional[str] = None) -> str:
+        """
+        Backend and model name of an LLM backend
+
+        Without a backend, identifies the models calls are routed to, e.g.
+        for cache keys shared by the outputs of hedged backends.
+        """
+        if backend is None:
+            return "|".join(cls.model_id(name) for name in cls.backends())
+        return f"groq:{GROQ_MODEL}" if backend == "groq" else f"ollama:{MODEL}"
+
+    @staticmethod
+    def _load_model(backend: str) -> BaseChatModel:
+        """Create the chat model client of a backend"""
+        if backend == "groq":
+            return ChatGroq(model=GROQ_MODEL, api_key=GROQ_API_KEY)
+        return ChatOllama(model=MODEL)
+
+    @classmethod
+    def load(cls) -> None:
+        """Build the model clients and every chain, once per process"""
+        if cls._chains:
+            return
+
+        models, chains = {}, {}
+        for backend in cls.backends():
+            model = cls._load_model(backend)
+            text_model = model | StrOutputParser()
+
+            chains[backend] = {}
+            for name, spec in CHAIN_SPECS.items():
+                prompt = PromptTemplate(
+                    template=spec.template, input_variables=spec.input_variables
+                )
+                chains[backend][name] = prompt | (
+                    model.with_structured_output(spec.output_model)
+                    if spec.output_model else text_model
+                )
+            models[backend] = model
+
+        cls._models = models
+        cls._chains = chains
+        logging.info(f"Built {len(CHAIN_SPECS)} LLM chains for {', '.join(chains)}")
+
+    @classmethod
+    def get(cls, name: str, backend: Optional[str] = None) -> Runnable:
+        """Get a prebuilt chain by name, for the primary backend by default"""
+        cls.load()
+        return cls._chains[backend or cls.backend()][name]
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from app import (
+    LLM_LATENCY_BACKOFF_FACTOR,
+    LLM_MAX_CONCURRENCY,
+    LLM_MIN_CONCURRENCY,
+    LLM_RATE_LIMIT_BACKOFF,
+    LLM_RATE_LIMIT_RETRIES,
+    LLM_RATE_LIMITS,
+)
+
+
+def _causes(error: Optional[BaseException]) -> Iterator[BaseException]:
+    """An error followed by the errors it was raised from"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an error, or one it was raised from, is a provider 429"""
+    for cause in _causes(error):
+        response = getattr(cause, "response", None)
+        status = getattr(cause, "status_code", None) or getattr(response, "status_code", None)
+        if status == 429 or type(cause).__name__ == "RateLimitError":
+            return True
+        message = str(cause).lower()
+        if "429" in message or "rate limit" in message:
+            return True
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait advertised by a 429 response, if any"""
+    for cause in _causes(error):
+        headers = getattr(getattr(cause, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class TokenBucket:
+    """
+    Allows ``per_minute`` units per minute, in bursts of up to a minute's
+    worth. Callers are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until ``amount`` units are available and take them"""
+        amount = min(amount, self.capacity)
+        # The lock queues callers in FIFO order behind the one waiting for a refill
+        async with self._lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.rate)
+                self._refill()
+            self.level -= amount
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. when the provider reports it is exhausted"""
+        self._refill()
+        self.level = 0.0
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit
+
+    The limit grows by one slot for every ``limit`` calls that succeed
+    without a latency spike, and halves when the provider throttles or a
+    call takes ``LLM_LATENCY_BACKOFF_FACTOR`` times the usual latency of its
+    chain. Chains are compared to their own baseline, since a structured
+    resume legitimately takes many times longer than a keyword list.
+    Callers waiting for a slot are admitted in arrival order.
+    """
+
+    BASELINE_WEIGHT = 0.05
+    """Weight of each successful call in the moving latency baselines."""
+
+    def __init__(self, minimum: int, maximum: int):
+        self.minimum = max(1, min(minimum, maximum))
+        self.maximum = max(1, maximum)
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[int, "asyncio.Future"]] = deque()
+        self._baselines: Dict[Optional[str], float] = {}
+        """Moving latency baseline per chain."""
+        self._last_decrease = 0.0
+
+    def _fits(self, calls: int) -> bool:
+        # A batch larger than the limit still runs once nothing else does
+        return self.in_flight == 0 or self.in_flight + calls <= int(self.limit)
+
+    def _wake(self) -> None:
+        """Admit waiters in arrival order while they fit"""
+        while self._waiters and self._fits(self._waiters[0][0]):
+            calls, future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += calls
+                future.set_result(None)
+
+    async def acquire(self, calls: int = 1) -> None:
+        """Wait for ``calls`` slots"""
+        if not self._waiters and self._fits(calls):
+            self.in_flight += calls
+            return
+
+        entry = (calls, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].done() and not entry[1].cancelled():
+                # Slots were granted right before the cancellation
+                self.in_flight -= calls
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+            self._wake()
+            raise
+
+    def _decrease(self, chain: Optional[str] = None) -> None:
+        now = time.monotonic()
+        # Signals within one usual call latency belong to the same congestion
+        window = self._baselines.get(chain) or max(self._baselines.values(), default=1.0)
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+        logging.warning(f"LLM concurrency limit lowered to {int(self.limit)}")
+
+    def throttled(self) -> None:
+        """Record a throttling response from the provider"""
+        self._decrease()
+
+    def release(
+        self,
+        calls: int = 1,
+        latency: Optional[float] = None,
+        throttled: bool = False,
+        chain: Optional[str] = None,
+    ) -> None:
+        """
+        Return ``calls`` slots
+
+        Args:
+            calls: Slots held by the finished call
+            latency: Seconds the call took, None when it failed
+            throttled: Whether the provider throttled the call
+            chain: Chain of the call, whose latency baseline it is compared to
+        """
+        self.in_flight -= calls
+        if throttled:
+            self._decrease(chain)
+        elif latency is not None:
+            baseline = self._baselines.setdefault(chain, latency)
+            if latency > baseline * LLM_LATENCY_BACKOFF_FACTOR:
+                self._decrease(chain)
+            else:
+                self.limit = min(self.maximum, self.limit + calls / self.limit)
+            self._baselines[chain] = baseline + self.BASELINE_WEIGHT * (latency - baseline)
+        self._wake()
+
+
+class LLMLimiter:
+    """
+    Admission control of LLM calls per backend: request and token rate
+    limits, then an adaptive concurrency limit
+    """
+
+    _limits: Dict[str, AdaptiveLimit] = {}
+    _buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+
+    @classmethod
+    def _limit(cls, backend: str) -> AdaptiveLimit:
+        """Get the concurrency limit of a backend, creating it on first use"""
+        if backend not in cls._limits:
+            cls._limits[backend] = AdaptiveLimit(
+                LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY[backend]
+            )
+        return cls._limits[backend]
+
+    @classmethod
+    def _rate_buckets(cls, backend: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        """Get the request and token buckets of a backend, None when unlimited"""
+        if backend not in cls._buckets:
+            requests, tokens = LLM_RATE_LIMITS[backend]
+            cls._buckets[backend] = (
+                TokenBucket(requests) if requests > 0 else None,
+                TokenBucket(tokens) if tokens > 0 else None,
+            )
+        return cls._buckets[backend]
+
+    @classmethod
+    def throttled(cls, backend: str) -> None:
+        """Record a provider 429 received outside of ``limit``"""
+        cls._limit(backend).throttled()
+        for bucket in cls._rate_buckets(backend):
+            if bucket is not None:
+                bucket.drain()
+
+    @classmethod
+    @asynccontextmanager
+    async def limit(
+        cls, backend: str, calls: int = 1, tokens: int = 0, chain: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        Admit a call to the backend and hold its slots while it runs
+
+        Args:
+            backend: Backend the call goes to
+            calls: Number of calls sent together, e.g. by a batch
+            tokens: Estimated prompt and completion tokens of the calls
+            chain: Chain of the calls, for latency tracking
+        """
+        requests_bucket, tokens_bucket = cls._rate_buckets(backend)
+        if requests_bucket is not None:
+            await requests_bucket.acquire(calls)
+        if tokens_bucket is not None and tokens:
+            await tokens_bucket.acquire(tokens)
+
+        limit = cls._limit(backend)
+        await limit.acquire(calls)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            throttled = is_rate_limit_error(e)
+            limit.release(calls, throttled=throttled, chain=chain)
+            if throttled:
+                for bucket in (requests_bucket, tokens_bucket):
+                    if bucket is not None:
+                        bucket.drain()
+            raise
+        except BaseException:
+            limit.release(calls)
+            raise
+        else:
+            limit.release(calls, latency=time.monotonic() - started, chain=chain)
+
+    @classmethod
+    async def run(
+        cls,
+        backend: str,
+        call: Callable[[], Awaitable[Any]],
+        tokens: int = 0,
+        chain: Optional[str] = None,
+    ) -> Any:
+        """
+        Run a call within the backend's limits, retrying with exponential
+        backoff when the provider answers 429
+
+        Args:
+            backend: Backend the call goes to
+            call: Coroutine function making the call
+            tokens: Estimated prompt and completion tokens of the call
+            chain: Chain of the call, for latency tracking
+
+        Returns:
+            The result of ``call``
+        """
+        for attempt in range(LLM_RATE_LIMIT_RETRIES + 1):
+            try:
+                async with cls.limit(backend, tokens=tokens, chain=chain):
+                    return await call()
+            except Exception as e:
+                if attempt == LLM_RATE_LIMIT_RETRIES or not is_rate_limit_error(e):
+                    raise
+                delay = _retry_after(e) or LLM_RATE_LIMIT_BACKOFF * 2 ** attempt
+                delay += random.uniform(0, delay / 2)
+                logging.warning(f"{backend} rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    @classmethod
+    def in_flight(cls, backend: str) -> int:
+        """Number of calls currently holding a slot of the backend"""
+        return cls._limit(backend).in_flight if backend in cls._limits else 0
+
+    @classmethod
+    def concurrency(cls, backend: str) -> int:
+        """Current concurrency limit of the backend"""
+        return int(cls._limit(backend).limit)
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app import (
+    LLM_HEDGE_MAX_DELAY,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_PERCENTILE,
+    LLM_ROUTING,
+)
+
+from .chains import ChainRegistry
+from .limiter import LLMLimiter
+
+
+class LLMRouter:
+    """
+    Routes chain calls to the configured backends
+
+    In ``hedged`` mode a call goes to the primary backend first. When it
+    fails, or is still running after the primary's recent latency
+    percentile, the same call is sent to the secondary backend and the first
+    successful answer wins; the other call is cancelled.
+
+    Cancelled calls are recorded with the time they ran, a lower bound of
+    their latency. Recording only the calls that finished would leave out
+    exactly the slow ones and pull the hedge delay down to its minimum.
+    """
+
+    LATENCY_WINDOW = 200
+    """Calls per backend the latency percentile is computed over."""
+
+    _latencies: Dict[str, Deque[float]] = {}
+    """Seconds taken by recent successful or cancelled calls, per backend."""
+    _hedged: Dict[str, int] = {}
+    """Hedged calls won by each backend."""
+
+    @classmethod
+    def record_latency(cls, backend: str, seconds: float) -> None:
+        """Record the latency of a successful call, or the time a cancelled call ran"""
+        cls._latencies.setdefault(backend, deque(maxlen=cls.LATENCY_WINDOW)).append(seconds)
+
+    @classmethod
+    def percentile(cls, backend: str, percentile: float) -> Optional[float]:
+        """Latency percentile of a backend's recent calls, None without samples"""
+        samples = sorted(cls._latencies.get(backend, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+    @classmethod
+    def hedge_delay(cls, backend: str) -> float:
+        """Seconds to wait on a backend before hedging a call"""
+        if len(cls._latencies.get(backend, ())) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_MAX_DELAY
+        delay = cls.percentile(backend, LLM_HEDGE_PERCENTILE)
+        return min(LLM_HEDGE_MAX_DELAY, max(LLM_HEDGE_MIN_DELAY, delay))
+
+    @classmethod
+    async def _call(cls, backend: str, name: str, inputs: Dict[str, Any], tokens: int) -> Any:
+        """Invoke a chain on one backend within its limits"""
+        chain = ChainRegistry.get(name, backend)
+
+        async def timed() -> Any:
+            started = time.monotonic()
+            try:
+                result = await chain.ainvoke(inputs)
+            except asyncio.CancelledError:
+                cls.record_latency(backend, time.monotonic() - started)
+                raise
+            cls.record_latency(backend, time.monotonic() - started)
+            return result
+
+        return await LLMLimiter.run(backend, timed, tokens, name)
+
+    @classmethod
+    async def invoke(cls, name: str, inputs: Dict[str, Any], tokens: int = 0) -> Any:
+        """
+        Invoke a shared chain on the configured backends
+
+        Args:
+            name: Name of the chain
+            inputs: Inputs of the chain
+            tokens: Estimated prompt and completion tokens of the call
+
+        Returns:
+            The chain output
+
+        Raises:
+            Exception: The error of the primary backend, when no backend
+                answered successfully
+        """
+        backends = ChainRegistry.backends()
+        primary = asyncio.ensure_future(cls._call(backends[0], name, inputs, tokens))
+        if LLM_ROUTING != "hedged" or len(backends) < 2:
+            return await primary
+
+        secondary = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=cls.hedge_delay(backends[0]))
+            if done and primary.exception() is None:
+                return primary.result()
+
+            logging.info(
+                f"Hedging {name} to {backends[1]}: {backends[0]} "
+                + ("failed" if done else "is slow")
+            )
+            secondary = asyncio.ensure_future(cls._call(backends[1], name, inputs, tokens))
+            pending = {primary, secondary} - done
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = backends[0] if task is primary else backends[1]
+                        cls._hedged[winner] = cls._hedged.get(winner, 0) + 1
+                        return task.result()
+
+            # Both failed; the primary's error is the one callers expect
+            return primary.result()
+        finally:
+            for task in (primary, secondary):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        """Latency percentiles and hedged wins per backend in this process"""
+        return {
+            backend: {
+                "samples": len(cls._latencies.get(backend, ())),
+                "p50": cls.percentile(backend, 0.5),
+                "p95": cls.percentile(backend, 0.95),
+                "hedge_delay": cls.hedge_delay(backend),
+                "hedged_wins": cls._hedged.get(backend, 0),
+            }
+            for backend in ChainRegistry.backends()
+        }
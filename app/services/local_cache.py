@@ -0,0 +1,112 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry
+
+    Entries are evicted least recently used first once either the byte or
+    the entry budget is exceeded. Every invalidation bumps ``epoch``, so a
+    value read from the backing store before an invalidation can be refused
+    instead of being cached stale.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl: float):
+        """
+        Args:
+            max_bytes: Total size of the cached values
+            max_entries: Number of cached values
+            ttl: Seconds a value is served, bounding staleness when an
+                invalidation is missed; 0 disables the cache
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.bytes = 0
+        """Size of the cached values."""
+        self.epoch = 0
+        """Number of invalidations so far."""
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        """Value, size and expiry time of every key, least recently used first."""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached value
+
+        Returns:
+            Whether the key was found, and its value
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return False, None
+        if entry[2] <= time.monotonic():
+            self._drop(key)
+            self._misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return True, entry[0]
+
+    def set(self, key: str, value: Any, size: int, epoch: Optional[int] = None) -> bool:
+        """
+        Cache a value
+
+        Args:
+            key: Key of the value
+            value: Value to serve until it expires, shared by every reader
+            size: Bytes the value accounts for
+            epoch: ``epoch`` when the value was read; the value is refused
+                if an invalidation happened since
+
+        Returns:
+            Whether the value was cached
+        """
+        if not self.enabled or size > self.max_bytes:
+            return False
+        if epoch is not None and epoch != self.epoch:
+            return False
+
+        self._drop(key)
+        self._entries[key] = (value, size, time.monotonic() + self.ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self._evictions += 1
+        return True
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key, e.g. because it was rewritten"""
+        self.epoch += 1
+        self._drop(key)
+
+    def clear(self) -> None:
+        """Drop every key, e.g. after invalidations may have been missed"""
+        self.epoch += 1
+        self._entries.clear()
+        self.bytes = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def stats(self) -> Dict[str, int]:
+        """Size, hit and eviction counters of this process"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
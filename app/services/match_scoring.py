@@ -0,0 +1,215 @@
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.utils.keywords import term_counts
+from app.utils.skills import SkillIndex
+
+NGRAM_FEATURES = 2 ** 18
+"""Hashed columns of the plain unigrams and bigrams."""
+SKILL_WEIGHT = 0.6
+"""Weight of the job's skills covered by the resume in the score."""
+TEXT_WEIGHT = 0.25
+"""Weight of the n-gram similarity of both texts in the score."""
+SENIORITY_WEIGHT = 0.15
+"""Weight of the seniority similarity in the score, when both texts have a cue."""
+SENIORITY_SPREAD = 1.0
+"""Levels a seniority cue spreads over, giving partial credit to neighbouring levels."""
+
+_ROLE = (
+    r"(?:\w+ )?(?:engineer|developer|designer|architect|analyst|scientist|consultant|"
+    r"programmer|manager)"
+)
+"""A role noun after a cue, optionally with one word in between, e.g. "data engineer"."""
+_LEVEL_CUES = [
+    re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE)
+    for pattern in (
+        r"intern|internship|trainee|apprentice",
+        r"junior|jr|entry[- ]level|graduate",
+        r"mid[- ]level|intermediate",
+        r"senior|sr",
+        # Only as a title, not "lead generation" or "lead the migration"
+        rf"(?:lead|staff) {_ROLE}|(?:team|tech|technical|engineering|development|project|qa) lead",
+        r"principal|architect|distinguished",
+        r"head of|director|vp|vice president|chief|cto",
+    )
+]
+"""Cues of each seniority level, from intern to executive."""
+_YEARS = re.compile(r"\b(\d{1,2})\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+_YEARS_LEVELS = ((2, 1), (5, 2), (8, 3))
+"""Level of experience below each number of years, lead beyond."""
+
+
+def seniority_level(text: str) -> Optional[int]:
+    """
+    Seniority level of a text, from 0 (intern) to 6 (executive)
+
+    The highest level named in the text wins; without one, the level follows
+    from the years of experience mentioned. None when the text has no cue.
+    """
+    levels = [level for level, cue in enumerate(_LEVEL_CUES) if cue.search(text)]
+    if levels:
+        return max(levels)
+    years = [int(value) for value in _YEARS.findall(text)]
+    if not years:
+        return None
+    return next((level for limit, level in _YEARS_LEVELS if max(years) < limit), 4)
+
+
+def _seniority_vector(level: Optional[int]) -> np.ndarray:
+    """Unit vector of a level spread over its neighbours, zero without a level"""
+    vector = np.zeros(len(_LEVEL_CUES))
+    if level is None:
+        return vector
+    vector = np.exp(-((np.arange(len(_LEVEL_CUES)) - level) ** 2) / (2 * SENIORITY_SPREAD ** 2))
+    return vector / np.linalg.norm(vector)
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1 / norms) @ matrix
+
+
+@dataclass
+class MatchFeatures:
+    """Feature vectors of a batch of texts, one row per text"""
+
+    skills: sparse.csr_matrix
+    """Sublinear counts of every skill of the taxonomy."""
+    ngrams: sparse.csr_matrix
+    """Unit-length sublinear counts of the hashed plain unigrams and bigrams."""
+    seniority: np.ndarray
+    """Unit-length seniority vectors, zero rows for texts without a cue."""
+
+
+def extract_features(texts: Sequence[str], levels: Sequence[Optional[int]]) -> MatchFeatures:
+    """
+    Build the sparse feature vectors of a batch of texts
+
+    Args:
+        texts: Texts to vectorize
+        levels: Seniority level of every text, None when unknown
+    """
+    columns = {skill.name: column for column, skill in enumerate(SkillIndex.get().skills)}
+    skill_entries: Tuple[List[int], List[int], List[float]] = ([], [], [])
+    ngram_entries: Tuple[List[int], List[int], List[float]] = ([], [], [])
+    for row, text in enumerate(texts):
+        for term, count in term_counts(text).items():
+            column = columns.get(term)
+            if column is not None:
+                entries = skill_entries
+            else:
+                entries = ngram_entries
+                column = zlib.crc32(term.encode("utf-8")) % NGRAM_FEATURES
+            entries[0].append(row)
+            entries[1].append(column)
+            entries[2].append(1 + math.log(count))
+
+    def matrix(entries, width: int) -> sparse.csr_matrix:
+        rows, cols, values = entries
+        # Hash collisions are summed by the conversion
+        return sparse.coo_matrix((values, (rows, cols)), shape=(len(texts), width)).tocsr()
+
+    return MatchFeatures(
+        skills=matrix(skill_entries, len(columns)),
+        ngrams=_normalize_rows(matrix(ngram_entries, NGRAM_FEATURES)),
+        seniority=np.array([_seniority_vector(level) for level in levels]).reshape(
+            len(texts), len(_LEVEL_CUES)
+        ),
+    )
+
+
+class MatchScorer:
+    """
+    Scores how well a resume fits job descriptions without LLM calls
+
+    The resume is vectorized once and every batch of jobs is scored with a
+    few sparse matrix products, so hundreds of postings take milliseconds.
+    A job's score is the weighted mean of the share of its skills the resume
+    covers, the cosine similarity of both texts' n-grams and the similarity
+    of their seniority. Components a job has no data for are left out.
+    """
+
+    def __init__(self, resume_text: str):
+        self.resume = extract_features([resume_text], [seniority_level(resume_text)])
+        self._skills = SkillIndex.get().skills
+        self._has_skill = self.resume.skills.toarray().ravel() > 0
+
+    def score(self, job_title: str, job_description: str) -> Dict[str, Any]:
+        """Score the resume against one job"""
+        return self.score_many([(job_title, job_description)])[0]
+
+    def score_many(self, jobs: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Score the resume against many jobs
+
+        Args:
+            jobs: Title and description of every job
+
+        Returns:
+            For every job in the same order, its ``score`` from 0 to 1, the
+            ``skills``, ``text`` and ``seniority`` components (None when left
+            out) and the ``matched_skills`` and ``missing_skills`` of the job
+        """
+        if not jobs:
+            return []
+        # A level in the title is more reliable than one in the description
+        levels = [
+            level if (level := seniority_level(title)) is not None
+            else seniority_level(description)
+            for title, description in jobs
+        ]
+        job = extract_features(
+            [f"{title}\n{description}" for title, description in jobs], levels
+        )
+
+        skill_total = np.asarray(job.skills.sum(axis=1)).ravel()
+        covered = job.skills @ self._has_skill.astype(float)
+        skill_score = np.divide(
+            covered, skill_total, out=np.zeros_like(skill_total), where=skill_total > 0
+        )
+        text_score = np.asarray((job.ngrams @ self.resume.ngrams.T).todense()).ravel()
+        seniority_score = job.seniority @ self.resume.seniority[0]
+
+        has_seniority = job.seniority.any(axis=1) & self.resume.seniority.any()
+        weights = np.column_stack(
+            [
+                np.where(skill_total > 0, SKILL_WEIGHT, 0.0),
+                np.full(len(jobs), TEXT_WEIGHT),
+                np.where(has_seniority, SENIORITY_WEIGHT, 0.0),
+            ]
+        )
+        components = np.column_stack([skill_score, text_score, seniority_score])
+        scores = (weights * components).sum(axis=1) / weights.sum(axis=1)
+
+        results = []
+        for row in range(len(jobs)):
+            start, end = job.skills.indptr[row], job.skills.indptr[row + 1]
+            # Most mentioned skills first
+            order = np.argsort(-job.skills.data[start:end], kind="stable")
+            columns = job.skills.indices[start:end][order]
+            results.append(
+                {
+                    "score": round(float(scores[row]), 4),
+                    "skills": round(float(skill_score[row]), 4) if skill_total[row] else None,
+                    "text": round(float(text_score[row]), 4),
+                    "seniority": (
+                        round(float(seniority_score[row]), 4) if has_seniority[row] else None
+                    ),
+                    "matched_skills": [
+                        self._skills[column].name for column in columns if self._has_skill[column]
+                    ],
+                    "missing_skills": [
+                        self._skills[column].name
+                        for column in columns
+                        if not self._has_skill[column]
+                    ],
+                }
+            )
+        return results
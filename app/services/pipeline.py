@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.errors import RequestTimeoutException408
+
+StageContext = Dict[str, Any]
+"""Pipeline inputs plus the outputs of a stage's dependencies, by stage name."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A step of a pipeline"""
+
+    name: str
+    """Unique name; the stage output is exposed to dependents under it."""
+    run: Callable[[StageContext], Awaitable[Any]]
+    """Coroutine function called with the stage context."""
+    depends_on: Tuple[str, ...] = ()
+    """Stages that must finish before this one starts."""
+    timeout: Optional[float] = None
+    """Seconds the stage may run, None for no limit."""
+    cache_ttl: Optional[float] = None
+    """Seconds to reuse the output for an identical context, None to disable."""
+
+
+@dataclass
+class PipelineResult:
+    """Outputs and timings of a pipeline run"""
+
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    """Output of every stage, by stage name."""
+    timings: Dict[str, float] = field(default_factory=dict)
+    """Seconds spent in every stage, plus ``total`` for the whole run."""
+    cached: List[str] = field(default_factory=list)
+    """Stages whose output was served from the cache."""
+
+
+class Pipeline:
+    """
+    Runs a graph of stages, starting every stage as soon as its dependencies
+    have finished so that independent stages run concurrently
+    """
+
+    MAX_CACHE_ENTRIES = 256
+    """Upper bound on cached stage outputs per pipeline."""
+
+    def __init__(self, name: str, stages: List[Stage]):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+        if len(self.stages) != len(stages):
+            raise ValueError(f"Pipeline {name} has duplicate stage names")
+        for stage in stages:
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown {sorted(unknown)}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        """Raise if the dependency graph has a cycle"""
+        state: Dict[str, str] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Pipeline {self.name} has a cycle through {name}")
+            state[name] = "visiting"
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name)
+
+    def _cache_key(self, stage: Stage, context: StageContext) -> str:
+        """Key of a stage output for a given context"""
+        payload = json.dumps(context, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{stage.name}:{digest}"
+
+    def _cache_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return False, None
+        return True, value
+
+    def _cache_set(self, key: str, value: Any, ttl: float) -> None:
+        if len(self._cache) >= self.MAX_CACHE_ENTRIES:
+            # Drop the oldest insertion; dicts keep insertion order
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (time.monotonic() + ttl, value)
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        inputs: Dict[str, Any],
+        tasks: Dict[str, "asyncio.Task"],
+        result: PipelineResult,
+    ) -> Any:
+        """Wait for the dependencies of a stage, then run it"""
+        context = dict(inputs)
+        for dependency in stage.depends_on:
+            context[dependency] = await tasks[dependency]
+
+        started = time.perf_counter()
+        try:
+            if stage.cache_ttl:
+                key = self._cache_key(stage, context)
+                hit, value = self._cache_get(key)
+                if hit:
+                    result.cached.append(stage.name)
+                    return value
+
+            try:
+                value = await asyncio.wait_for(stage.run(context), stage.timeout)
+            except asyncio.TimeoutError:
+                raise RequestTimeoutException408(
+                    f"Stage {stage.name} of {self.name} timed out after {stage.timeout}s"
+                )
+
+            if stage.cache_ttl:
+                self._cache_set(key, value, stage.cache_ttl)
+            return value
+        finally:
+            result.timings[stage.name] = time.perf_counter() - started
+
+    async def run(self, **inputs: Any) -> PipelineResult:
+        """
+        Run every stage of the pipeline
+
+        Args:
+            **inputs: Values available to every stage through its context
+
+        Returns:
+            The stage outputs and timings
+
+        Raises:
+            Exception: The first error raised by a stage; the other stages
+                are cancelled
+        """
+        result = PipelineResult()
+        tasks: Dict[str, asyncio.Task] = {}
+        started = time.perf_counter()
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(
+                self._run_stage(stage, inputs, tasks, result)
+            )
+
+        try:
+            outputs = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            result.timings["total"] = time.perf_counter() - started
+            logging.info(
+                f"Pipeline {self.name} timings: "
+                + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in result.timings.items())
+            )
+
+        result.outputs = dict(zip(tasks, outputs))
+        return result
@@ -1,15 +1,59 @@
 
+from collections import Counter, defaultdict
+from dataclasses import dataclass
 from enum import StrEnum
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Callable, List, Optional, Tuple
+import asyncio
 import json
-from redis import Redis
+import logging
+import random
+from redis.asyncio import BlockingConnectionPool, Redis
 from redis.commands.json.path import Path
 from redis.typing import ResponseT
-from app import REDIS_URL
+from app.services.local_cache import LocalCache
+from app.types.responseFormat import Response
+from app.utils import codec, serialization
+from app import (
+    JOB_ANALYSIS_TTL,
+    LLM_CACHE_MAX_BYTES,
+    LOCAL_CACHE_MAX_BYTES,
+    LOCAL_CACHE_MAX_ENTRIES,
+    LOCAL_CACHE_TTL,
+    LLM_CACHE_TTL,
+    REDIS_ENHANCED_RESUME_TTL,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_MAX_VALUE_BYTES,
+    REDIS_POOL_TIMEOUT,
+    REDIS_RESUME_TEXT_TTL,
+    REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_URL,
+)
+
+
+@dataclass(frozen=True)
+class NamespacePolicy:
+    """Expiry and size limit of the keys of a namespace"""
+
+    ttl: Optional[int] = None
+    """Seconds a key lives after it is written, None to keep it forever."""
+    max_bytes: Optional[int] = None
+    """Largest value stored, larger values are dropped; None for no limit."""
+    sliding: bool = False
+    """Whether reading a key renews its TTL, keeping hot keys alive."""
+    local: bool = False
+    """Whether reads are also cached in process, invalidated across workers on writes."""
 
 class RedisService:
-    """Service to interact with Redis."""
-    __client = Union[Redis, None]
+    """
+    Service to interact with Redis.
+
+    All commands go through an asyncio client sharing one connection pool,
+    so a slow Redis only delays the requests waiting on it instead of
+    blocking the event loop.
+    """
+    __client: Optional[Redis] = None
     """Redis client instance."""
 
     class Namespace(StrEnum):
@@ -25,12 +69,66 @@ class RedisService:
         RESUME = "resume"
         """Namespace for resume-related keys."""
         RESUME_RAW_TEXT = "resume_raw_text"
-        """Namespace for raw resume text."""
+        """Legacy namespace of raw resume text per user, superseded by ``PDF_TEXT``."""
         ENHANCED_RESUME = "enhanced_resume"
         """Namespace for enhanced resume data."""
+        PDF_TEXT = "pdf_text"
+        """Namespace for extracted text keyed by extractor version and PDF hash."""
+        PDF_PAGE_TEXT = "pdf_page_text"
+        """Namespace for per-page extracted text, one hash per PDF content key."""
+        RESUME_SOURCE = "resume_source"
+        """Namespace mapping users to their current resume URL, validators and hash."""
+        LLM_RESPONSE = "llm_response"
+        """Namespace for cached LLM chain outputs."""
+        SINGLE_FLIGHT = "single_flight"
+        """Namespace for cross-worker request coalescing locks and results."""
         FEEDBACK = "feedback"
         """Namespace for feedback-related keys."""
 
+    ENHANCED_RESUME_TYPES = {"processed_resume": Optional[Union[Response, str]]}
+    """Types of the enhanced resume fields holding models, validated when read."""
+
+    POLICIES: Dict[str, NamespacePolicy] = {
+        Namespace.JOB_DESCRIPTION: NamespacePolicy(
+            ttl=JOB_ANALYSIS_TTL or None, max_bytes=REDIS_MAX_VALUE_BYTES, local=True
+        ),
+        Namespace.RESUME_RAW_TEXT: NamespacePolicy(
+            ttl=REDIS_RESUME_TEXT_TTL or None,
+            max_bytes=REDIS_MAX_VALUE_BYTES,
+            sliding=True,
+            local=True,
+        ),
+        Namespace.PDF_TEXT: NamespacePolicy(
+            ttl=REDIS_RESUME_TEXT_TTL or None,
+            max_bytes=REDIS_MAX_VALUE_BYTES,
+            sliding=True,
+            local=True,
+        ),
+        Namespace.PDF_PAGE_TEXT: NamespacePolicy(
+            ttl=REDIS_RESUME_TEXT_TTL or None, max_bytes=REDIS_MAX_VALUE_BYTES, sliding=True
+        ),
+        Namespace.RESUME_SOURCE: NamespacePolicy(
+            ttl=REDIS_RESUME_TEXT_TTL or None, sliding=True, local=True
+        ),
+        Namespace.ENHANCED_RESUME: NamespacePolicy(
+            ttl=REDIS_ENHANCED_RESUME_TTL or None,
+            max_bytes=REDIS_MAX_VALUE_BYTES,
+            sliding=True,
+            local=True,
+        ),
+        Namespace.LLM_RESPONSE: NamespacePolicy(
+            ttl=LLM_CACHE_TTL or None, max_bytes=LLM_CACHE_MAX_BYTES
+        ),
+    }
+    """Policies of the cache namespaces; other namespaces keep keys forever."""
+    DEFAULT_POLICY = NamespacePolicy()
+    """Policy of the namespaces without one."""
+
+    INVALIDATION_CHANNEL = "cache_invalidation"
+    """Pub/sub channel announcing rewritten keys of the local namespaces."""
+    _local = LocalCache(LOCAL_CACHE_MAX_BYTES, LOCAL_CACHE_MAX_ENTRIES, LOCAL_CACHE_TTL)
+    """In-process tier in front of the reads of the local namespaces."""
+
     class Status(StrEnum):
         """Status values for Redis keys."""
         ACTIVE = "active"
@@ -45,15 +143,34 @@ class RedisService:
 
     @staticmethod
     def connect():
-        """Connect to Redis."""
-        RedisService.__client = Redis.from_url(REDIS_URL)
+        """Create the Redis client and its connection pool; connections open lazily."""
+        pool = BlockingConnectionPool.from_url(
+            REDIS_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            # Callers wait this long for a free connection before failing
+            timeout=REDIS_POOL_TIMEOUT,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            retry_on_timeout=True,
+        )
+        RedisService.__client = Redis.from_pool(pool)
 
     @staticmethod
-    def disconnect():
-        """Disconnect from Redis."""
+    async def disconnect():
+        """Close the Redis client and every pooled connection."""
         if RedisService.__client is not None:
-            RedisService.__client.close()
-            RedisService.__client = None
+            client, RedisService.__client = RedisService.__client, None
+            await client.aclose()
+
+    @staticmethod
+    async def ping() -> bool:
+        """Check that Redis answers."""
+        try:
+            return bool(await RedisService.get_client().ping())
+        except Exception as e:
+            logging.warning(f"Redis health check failed: {e}")
+            return False
 
     @staticmethod
     def get_client() -> Redis:
@@ -63,127 +180,369 @@ class RedisService:
         return RedisService.__client
 
     @staticmethod
-    def get(key) -> ResponseT:
+    def policy(namespace) -> NamespacePolicy:
+        """Get the policy of a namespace."""
+        return RedisService.POLICIES.get(namespace, RedisService.DEFAULT_POLICY)
+
+
+    @staticmethod
+    async def get(key) -> ResponseT:
         """Get a value from Redis."""
-        return RedisService.get_client().get(key)
+        return await RedisService.get_client().get(key)
 
     @staticmethod
-    def set(key, value) -> None:
+    async def set(key, value) -> None:
         """Set a value in Redis."""
-        RedisService.get_client().set(key, value)
+        await RedisService.get_client().set(key, value)
+
+    @staticmethod
+    async def setKeyWithNamespace(namespace, key, value, ex: Optional[int] = None) -> bool:
+        """
+        Set a value in Redis with a namespace.
+
+        Large values are compressed (see ``app.utils.codec``). The value
+        expires after ``ex`` seconds, defaulting to the namespace's TTL, and
+        is dropped when still larger than the namespace's size limit.
+
+        Returns:
+            Whether the value was stored
+        """
+        policy = RedisService.policy(namespace)
+        encoded = codec.encode(value)
+        if policy.max_bytes is not None and len(encoded) > policy.max_bytes:
+            logging.warning(
+                f"Not storing {namespace}:{key}: {len(encoded)} bytes over the namespace limit"
+            )
+            return False
+        await RedisService.get_client().set(
+            f"{namespace}:{key}", encoded, ex=ex if ex is not None else policy.ttl
+        )
+        if policy.local and RedisService._local.enabled:
+            await RedisService._invalidate(f"{namespace}:{key}")
+        return True
+
+    @staticmethod
+    async def getKeyWithNamespace(namespace, key) -> ResponseT:
+        """Get a value from Redis with a namespace, renewing its TTL for sliding namespaces."""
+        policy = RedisService.policy(namespace)
+        if policy.sliding and policy.ttl:
+            raw = await RedisService.get_client().getex(f"{namespace}:{key}", ex=policy.ttl)
+        else:
+            raw = await RedisService.get_client().get(f"{namespace}:{key}")
+        return codec.decode(raw) if raw is not None else None
+
+    @staticmethod
+    async def deleteKeyWithNamespace(namespace, key) -> None:
+        """Delete a value from Redis with a namespace."""
+        await RedisService.get_client().delete(f"{namespace}:{key}")
+        if RedisService.policy(namespace).local and RedisService._local.enabled:
+            await RedisService._invalidate(f"{namespace}:{key}")
+
+    @staticmethod
+    async def _read(namespace, key, decode: Callable[[bytes], Any]) -> Any:
+        """
+        Get and decode a value, through the in-process tier for local namespaces
+
+        Hits are served from process memory until ``LOCAL_CACHE_TTL`` runs
+        out or another worker announces that the key was rewritten.
+        """
+        if not RedisService.policy(namespace).local:
+            raw = await RedisService.getKeyWithNamespace(namespace, key)
+            return decode(raw) if raw is not None else None
+
+        full_key = f"{namespace}:{key}"
+        hit, value = RedisService._local.get(full_key)
+        if hit:
+            return value
+
+        epoch = RedisService._local.epoch
+        raw = await RedisService.getKeyWithNamespace(namespace, key)
+        if raw is None:
+            return None
+        value = decode(raw)
+        RedisService._local.set(full_key, value, len(full_key) + len(raw), epoch)
+        return value
 
     @staticmethod
-    def setKeyWithNamespace(namespace, key, value) -> None:
-        """Set a value in Redis with a namespace."""
-        RedisService.get_client().set(f"{namespace}:{key}", value)
+    async def _invalidate(full_key: str) -> None:
+        """Drop a rewritten key from the in-process tier of every worker"""
+        RedisService._local.invalidate(full_key)
+        try:
+            await RedisService.get_client().publish(RedisService.INVALIDATION_CHANNEL, full_key)
+        except Exception as e:
+            logging.warning(f"Failed to announce invalidation of {full_key}: {e}")
 
     @staticmethod
-    def getKeyWithNamespace(namespace, key) -> ResponseT:
-        """Get a value from Redis with a namespace."""
-        return RedisService.get_client().get(f"{namespace}:{key}")
+    async def listen_invalidations(max_retry_delay: float = 30.0) -> None:
+        """
+        Apply the invalidations announced by other workers until cancelled
+
+        The in-process tier is cleared whenever the subscription is
+        (re)established, since announcements may have been missed meanwhile.
+        """
+        if not RedisService._local.enabled:
+            return
+        retry_delay = 1.0
+        while True:
+            pubsub = RedisService.get_client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(RedisService.INVALIDATION_CHANNEL)
+                RedisService._local.clear()
+                retry_delay = 1.0
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        RedisService._local.invalidate(message["data"].decode("utf-8"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Cache invalidation subscription lost: {e}")
+                RedisService._local.clear()
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(max_retry_delay, retry_delay * 2)
+            finally:
+                await pubsub.aclose()
 
     @staticmethod
-    def set_time(key, value) -> None:
+    async def set_time(key, value) -> None:
         """Set a time-related value in Redis."""
-        RedisService.setKeyWithNamespace(RedisService.Namespace.TIME, key, value)
+        await RedisService.setKeyWithNamespace(RedisService.Namespace.TIME, key, value)
 
     @staticmethod
-    def get_time(key) -> ResponseT:
+    async def get_time(key) -> ResponseT:
         """Get a time-related value from Redis."""
-        return RedisService.getKeyWithNamespace(RedisService.Namespace.TIME, key)
+        return await RedisService.getKeyWithNamespace(RedisService.Namespace.TIME, key)
 
     @staticmethod
-    def set_status(key, value) -> None:
+    async def set_status(key, value) -> None:
         """Set a status-related value in Redis."""
-        RedisService.setKeyWithNamespace(RedisService.Namespace.STATUS, key, value)
+        await RedisService.setKeyWithNamespace(RedisService.Namespace.STATUS, key, value)
 
     @staticmethod
-    def get_status(key) -> Union[str, None]:
+    async def get_status(key) -> Union[str, None]:
         """Get a status-related value from Redis."""
-        raw = RedisService.getKeyWithNamespace(RedisService.Namespace.STATUS, key)
+        raw = await RedisService.getKeyWithNamespace(RedisService.Namespace.STATUS, key)
         return raw.decode("utf-8") if raw else None
 
     @staticmethod
-    def set_user(key, value) -> None:
+    async def set_user(key, value) -> None:
         """Set a user-related value in Redis."""
-        RedisService.setKeyWithNamespace(RedisService.Namespace.USER, key, value)
+        await RedisService.setKeyWithNamespace(RedisService.Namespace.USER, key, value)
 
     @staticmethod
-    def get_user(key) -> ResponseT:
+    async def get_user(key) -> ResponseT:
         """Get a user-related value from Redis."""
-        raw = RedisService.getKeyWithNamespace(RedisService.Namespace.USER, key)
+        raw = await RedisService.getKeyWithNamespace(RedisService.Namespace.USER, key)
         return raw.decode("utf-8") if raw else None
 
     @staticmethod
-    def set_job_description(key, value) -> None:
+    async def set_job_description(key, value) -> None:
         """Set a job description-related value in Redis."""
-        RedisService.setKeyWithNamespace(
+        await RedisService.setKeyWithNamespace(
             RedisService.Namespace.JOB_DESCRIPTION, key, value
         )
 
     @staticmethod
-    def get_job_description(key) -> ResponseT:
+    async def get_job_description(key) -> ResponseT:
         """Get a job description-related value from Redis."""
-        raw = RedisService.getKeyWithNamespace(
+        raw = await RedisService.getKeyWithNamespace(
             RedisService.Namespace.JOB_DESCRIPTION, key
         )
         return raw.decode("utf-8") if raw else None
 
     @staticmethod
-    def set_resume(key, value) -> None:
+    async def set_resume(key, value) -> None:
         """Set a resume-related value in Redis."""
-        RedisService.setKeyWithNamespace(RedisService.Namespace.RESUME, key, value)
+        await RedisService.setKeyWithNamespace(RedisService.Namespace.RESUME, key, value)
 
     @staticmethod
-    def get_resume(key) -> ResponseT:
+    async def get_resume(key) -> ResponseT:
         """Get a resume-related value from Redis."""
-        raw = RedisService.getKeyWithNamespace(RedisService.Namespace.RESUME, key)
+        raw = await RedisService.getKeyWithNamespace(RedisService.Namespace.RESUME, key)
         return raw.decode("utf-8") if raw else None
 
     @staticmethod
-    def set_feedback(key, value: dict) -> None:
+    async def set_feedback(key, value: dict) -> None:
         """Set a feedback-related value in Redis."""
-        RedisService.get_client().json().set(
+        await RedisService.get_client().json().set(
             f"{RedisService.Namespace.FEEDBACK}:{key}", Path.root_path(), value
         )
 
     @staticmethod
-    def get_feedback(key) -> dict:
+    async def get_feedback(key) -> dict:
         """Get a feedback-related value from Redis."""
-        return (
-            RedisService.get_client()
-            .json()
-            .get(f"{RedisService.Namespace.FEEDBACK}:{key}")
+        return await RedisService.get_client().json().get(
+            f"{RedisService.Namespace.FEEDBACK}:{key}"
         )
     
     """Writing for clarity and """
 
-    async def store_resume_raw_text(self, user_id: str, text: str) -> None:
+    async def get_resume_raw_text(self, user_id: str) -> Union[str, None]:
+        """
+        Get the cached text of a user's current resume
+        
+        Resolves the user's current content key and reads the text stored
+        under it, without revalidating the resume.
+        
+        Args:
+            user_id: The user ID to get the resume text for
+            
+        Returns:
+            The raw text of the resume or None if not found
+        """
+        source = await self.get_resume_source(user_id)
+        if not (source and source.get("content_key")):
+            return None
+        return await self.get_pdf_text(source["content_key"])
+
+    async def store_pdf_text(self, content_key: str, text: str) -> bool:
+        """
+        Store text extracted from a PDF under its content key
+        
+        Args:
+            content_key: Extractor version and SHA-256 of the PDF bytes
+            text: The extracted text
+
+        Returns:
+            Whether the text was stored, False when over the namespace limit
+        """
+        return await RedisService.setKeyWithNamespace(
+            RedisService.Namespace.PDF_TEXT, content_key, text
+        )
+
+    async def get_pdf_text(self, content_key: str) -> Union[str, None]:
+        """
+        Get text extracted from a PDF by its content key
+        
+        Args:
+            content_key: Extractor version and SHA-256 of the PDF bytes
+            
+        Returns:
+            The extracted text or None if not found
+        """
+        return await RedisService._read(
+            RedisService.Namespace.PDF_TEXT, content_key, lambda raw: raw.decode("utf-8")
+        )
+
+    async def store_pdf_pages(
+        self, content_key: str, page_count: int, pages: Dict[int, str]
+    ) -> None:
+        """
+        Store the text of some pages of a PDF
+        
+        Args:
+            content_key: Extractor version and SHA-256 of the PDF bytes
+            page_count: Total number of pages in the PDF
+            pages: Text keyed by zero-based page number
+        """
+        namespace = RedisService.Namespace.PDF_PAGE_TEXT
+        policy = RedisService.policy(namespace)
+        key = f"{namespace}:{content_key}"
+        encoded = {str(num): codec.encode(text) for num, text in pages.items()}
+        client = RedisService.get_client()
+
+        # Pages are stored in chunks as they are extracted, so the size limit
+        # applies to the hash as a whole: its running size is kept in a
+        # "bytes" field, less the pages being rewritten
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hget(key, "bytes")
+            for field in encoded:
+                pipe.hstrlen(key, field)
+            stored, *rewritten = await pipe.execute()
+        added = sum(len(text) for text in encoded.values()) - sum(rewritten)
+        size = int(stored or 0) + added
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            logging.warning(f"Not storing pages of {content_key}: {size} bytes over the namespace limit")
+            return
+
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={"count": page_count, **encoded})
+            pipe.hincrby(key, "bytes", added)
+            if policy.ttl:
+                pipe.expire(key, policy.ttl)
+            await pipe.execute()
+
+    async def get_pdf_pages(
+        self, content_key: str
+    ) -> Tuple[Optional[int], Dict[int, str]]:
+        """
+        Get the cached pages of a PDF
+        
+        Args:
+            content_key: Extractor version and SHA-256 of the PDF bytes
+            
+        Returns:
+            The page count (None if unknown) and text keyed by page number
+        """
+        namespace = RedisService.Namespace.PDF_PAGE_TEXT
+        policy = RedisService.policy(namespace)
+        key = f"{namespace}:{content_key}"
+        async with RedisService.get_client().pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            if policy.sliding and policy.ttl:
+                pipe.expire(key, policy.ttl)
+            raw = (await pipe.execute())[0]
+        count = raw.pop(b"count", None)
+        raw.pop(b"bytes", None)
+        pages = {int(num): codec.decode(text).decode("utf-8") for num, text in raw.items()}
+        return (int(count) if count is not None else None), pages
+
+    async def store_resume_source(self, user_id: str, source: Dict[str, Any]) -> None:
         """
-        Store raw resume text in Redis
+        Store where a user's resume was fetched from and what it contained
         
         Args:
-            user_id: The user ID to associate with the resume text
-            text: The raw text content of the resume
+            user_id: The user ID the resume belongs to
+            source: URL, HTTP validators and content key of the resume
         """
-        RedisService.setKeyWithNamespace(
-            RedisService.Namespace.RESUME_RAW_TEXT, user_id, text
+        await RedisService.setKeyWithNamespace(
+            RedisService.Namespace.RESUME_SOURCE, user_id, json.dumps(source)
         )
+
+    async def get_resume_source(self, user_id: str) -> Union[Dict[str, Any], None]:
+        """
+        Get where a user's resume was fetched from and what it contained
+        
+        Args:
+            user_id: The user ID the resume belongs to
+            
+        Returns:
+            URL, HTTP validators and content key, or None if not found
+        """
+        source = await RedisService._read(
+            RedisService.Namespace.RESUME_SOURCE, user_id, json.loads
+        )
+        # The cached dict is shared; callers get their own copy
+        return dict(source) if source is not None else None
     
-    async def get_resume_raw_text(self, user_id: str) -> Union[str, None]:
+    async def store_job_analysis(self, key: str, analysis: str, ttl: int) -> None:
         """
-        Get raw resume text from Redis
+        Store the analysis of a job description
         
         Args:
-            user_id: The user ID to get the resume text for
+            key: Prompt version, model and hash of the normalized description
+            analysis: The analysis as JSON
+            ttl: Seconds to keep the analysis
+        """
+        await RedisService.setKeyWithNamespace(
+            RedisService.Namespace.JOB_DESCRIPTION, f"analysis:{key}", analysis, ex=ttl
+        )
+
+    async def get_job_analysis(self, key: str) -> Union[str, None]:
+        """
+        Get the analysis of a job description
+        
+        Args:
+            key: Prompt version, model and hash of the normalized description
             
         Returns:
-            The raw text of the resume or None if not found
+            The analysis as JSON or None if not found
         """
-        raw = RedisService.getKeyWithNamespace(
-            RedisService.Namespace.RESUME_RAW_TEXT, user_id
+        return await RedisService._read(
+            RedisService.Namespace.JOB_DESCRIPTION,
+            f"analysis:{key}",
+            lambda raw: raw.decode("utf-8"),
         )
-        return raw.decode("utf-8") if raw else None
     
     async def store_enhanced_resume(self, user_id: str, job_title: str, data: Dict[str, Any]) -> None:
         """
@@ -192,15 +551,16 @@ class RedisService:
         Args:
             user_id: The user ID to associate with the enhanced resume
             job_title: The job title the resume was enhanced for
-            data: The enhanced resume data
+            data: The enhanced resume data, models included
         """
         key = f"{user_id}:{job_title}"
-        json_data = json.dumps(data)
-        RedisService.setKeyWithNamespace(
-            RedisService.Namespace.ENHANCED_RESUME, key, json_data
+        await RedisService.setKeyWithNamespace(
+            RedisService.Namespace.ENHANCED_RESUME, key, serialization.dumps(data)
         )
     
-    async def get_enhanced_resume(self, user_id: str, job_title: str) -> Union[Dict[str, Any], None]:
+    async def get_enhanced_resume(
+        self, user_id: str, job_title: str
+    ) -> Union[serialization.LazyRecord, None]:
         """
         Get enhanced resume data from Redis
         
@@ -209,13 +569,129 @@ class RedisService:
             job_title: The job title the resume was enhanced for
             
         Returns:
-            The enhanced resume data or None if not found
+            The enhanced resume data or None if not found; the structured
+            resume is validated into a ``Response`` when first read
         """
         key = f"{user_id}:{job_title}"
-        raw = RedisService.getKeyWithNamespace(
-            RedisService.Namespace.ENHANCED_RESUME, key
+        # Records are read-only mappings, safe to share between requests
+        return await RedisService._read(
+            RedisService.Namespace.ENHANCED_RESUME,
+            key,
+            lambda raw: serialization.loads_record(raw, RedisService.ENHANCED_RESUME_TYPES),
         )
-        
-        if raw:
-            return json.loads(raw.decode("utf-8"))
-        return None
\ No newline at end of file
+
+    @staticmethod
+    async def namespace_report(sample_size: int = 100) -> Dict[str, Dict[str, Any]]:
+        """
+        Report key counts and memory per namespace.
+
+        Keys are counted in one SCAN of the keyspace. Memory is estimated
+        from the ``MEMORY USAGE`` of a uniform sample of each namespace's
+        keys, as are the keys stored without expiry.
+
+        Args:
+            sample_size: Keys sampled per namespace
+
+        Returns:
+            Counts, estimated bytes and policy of every namespace, largest first
+        """
+        client = RedisService.get_client()
+        counts: Counter = Counter()
+        samples: Dict[str, List[bytes]] = defaultdict(list)
+        async for key in client.scan_iter(count=1000):
+            namespace = key.split(b":", 1)[0].decode("utf-8", "replace")
+            counts[namespace] += 1
+            # Reservoir sampling keeps every key of a namespace equally likely
+            sample = samples[namespace]
+            if len(sample) < sample_size:
+                sample.append(key)
+            else:
+                index = random.randrange(counts[namespace])
+                if index < sample_size:
+                    sample[index] = key
+
+        report = {}
+        for namespace, sample in samples.items():
+            async with client.pipeline(transaction=False) as pipe:
+                for key in sample:
+                    pipe.memory_usage(key)
+                    pipe.ttl(key)
+                results = await pipe.execute()
+            usages = [usage for usage in results[0::2] if usage is not None]
+            mean = sum(usages) / len(usages) if usages else 0
+            persistent = sum(ttl == -1 for ttl in results[1::2]) / len(sample)
+            policy = RedisService.policy(namespace)
+            report[namespace] = {
+                "keys": counts[namespace],
+                "estimated_bytes": round(mean * counts[namespace]),
+                "mean_bytes": round(mean),
+                "estimated_without_ttl": round(persistent * counts[namespace]),
+                "ttl": policy.ttl,
+                "max_bytes": policy.max_bytes,
+                "sliding": policy.sliding,
+            }
+        return dict(sorted(report.items(), key=lambda item: -item[1]["estimated_bytes"]))
+
+    @staticmethod
+    async def apply_ttl(namespace) -> int:
+        """
+        Give the keys of a namespace stored without expiry the namespace's TTL.
+
+        Returns:
+            Number of keys that got a TTL
+        """
+        ttl = RedisService.policy(namespace).ttl
+        if not ttl:
+            return 0
+
+        client = RedisService.get_client()
+        updated = 0
+        batch = []
+        async for key in client.scan_iter(match=f"{namespace}:*", count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                updated += await RedisService._expire_persistent(batch, ttl)
+                batch = []
+        if batch:
+            updated += await RedisService._expire_persistent(batch, ttl)
+        return updated
+
+    @staticmethod
+    async def _expire_persistent(keys: List[bytes], ttl: int) -> int:
+        async with RedisService.get_client().pipeline(transaction=False) as pipe:
+            for key in keys:
+                # NX leaves keys that already expire untouched
+                pipe.expire(key, ttl, nx=True)
+            return sum(await pipe.execute())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report Redis keys and memory per namespace")
+    parser.add_argument("--sample-size", type=int, default=100, help="Keys sampled per namespace")
+    parser.add_argument(
+        "--apply-ttl", action="store_true",
+        help="Give keys stored without expiry their namespace's TTL first",
+    )
+    args = parser.parse_args()
+
+    async def main():
+        RedisService.connect()
+        try:
+            if args.apply_ttl:
+                for namespace in RedisService.POLICIES:
+                    updated = await RedisService.apply_ttl(namespace)
+                    print(f"{namespace}: {updated} keys now expire")
+            report = await RedisService.namespace_report(args.sample_size)
+        finally:
+            await RedisService.disconnect()
+
+        print(f"{'namespace':<20}{'keys':>10}{'est. MB':>10}{'no TTL':>10}{'TTL s':>10}")
+        for namespace, row in report.items():
+            print(
+                f"{namespace:<20}{row['keys']:>10}{row['estimated_bytes'] / 2**20:>10.1f}"
+                f"{row['estimated_without_ttl']:>10}{row['ttl'] or '-':>10}"
+            )
+
+    asyncio.run(main())
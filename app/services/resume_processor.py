@@ -1,8 +1,30 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Tuple
 from app.services.broker.rpc import RPCService, RPCPayloadType
+from app import (
+    ENHANCE_MODE,
+    JOB_ANALYSIS_TTL,
+    LLM_JOB_DESCRIPTION_TOKEN_BUDGET,
+    LLM_STAGE_CACHE_TTL,
+    LLM_STAGE_TIMEOUT,
+)
+from app.services.llm import CHAIN_SPECS, ChainRegistry
+from app.services.match_scoring import MatchScorer
+from app.services.pipeline import Pipeline, Stage
 from app.services.redis import RedisService
+from app.services.single_flight import SingleFlight
 from app.services.textEditing import TextEditingService
+from app.types.responseFormat import JobAnalysis
 from app.utils.errors.exceptions import PDFTextExtractionError, LLMServiceError
+from app.utils.keywords import keyword_records
+from app.utils.pdf_engines import extractor_version
+from app.utils.pdf_text import fetch_pdf
+from app.utils.serialization import LazyRecord
+from app.utils.tokens import compact_text
 
 
 class ResumeProcessor:
@@ -14,6 +36,113 @@ class ResumeProcessor:
     def __init__(self):
         self.redis_service = RedisService()
         self.text_editing_service = TextEditingService()
+        self.enhance_pipelines = {
+            "pipeline": self._build_enhance_pipeline(),
+            "combined": self._build_combined_pipeline(),
+        }
+
+    def _build_enhance_pipeline(self) -> Pipeline:
+        """
+        Stage graph of ``enhance_resume``
+        
+        Keyword extraction and structured processing only depend on the
+        enhanced text, so they run concurrently.
+        """
+        editor = self.text_editing_service
+        return Pipeline(
+            "enhance_resume",
+            [
+                Stage(
+                    "resume_text",
+                    lambda ctx: self.get_resume_text(ctx["user_id"]),
+                ),
+                # Job descriptions are analyzed once for all applicants, while
+                # the resume is fetched, instead of being pasted whole into
+                # every prompt
+                Stage(
+                    "job_brief",
+                    lambda ctx: self.get_job_brief(ctx["job_description"]),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+                Stage(
+                    "enhanced_text",
+                    lambda ctx: editor.enhance_text(
+                        text=ctx["resume_text"],
+                        job_title=ctx["job_title"],
+                        job_description=ctx["job_brief"],
+                    ),
+                    depends_on=("resume_text", "job_brief"),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+                # TODO: Future update - grammar suggestions, tone and bullet
+                # points as stages after "enhanced_text", e.g.
+                # Stage("professional_text", lambda ctx: editor.adjust_tone(
+                #     ctx["enhanced_text"], tone=ctx["tone"]), depends_on=("enhanced_text",)),
+                Stage(
+                    "keywords",
+                    lambda ctx: editor.extract_keywords(
+                        text=ctx["enhanced_text"],
+                        job_description=ctx["job_brief"],
+                    ),
+                    depends_on=("enhanced_text", "job_brief"),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+                Stage(
+                    "processed_resume",
+                    lambda ctx: editor.process_resume(
+                        text=ctx["enhanced_text"],
+                        domain=ctx["domain"],
+                        job_title=ctx["job_title"],
+                        job_description=ctx["job_brief"],
+                        user_data=ctx["user_data"],
+                    ),
+                    depends_on=("enhanced_text", "job_brief"),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+            ],
+        )
+    
+    def _build_combined_pipeline(self) -> Pipeline:
+        """
+        Stage graph of ``enhance_resume`` in combined mode
+
+        The enhanced text, keywords and structured resume come from a single
+        structured call, trading some quality for one round trip instead of
+        three.
+        """
+        editor = self.text_editing_service
+        return Pipeline(
+            "enhance_resume_combined",
+            [
+                Stage(
+                    "resume_text",
+                    lambda ctx: self.get_resume_text(ctx["user_id"]),
+                ),
+                Stage(
+                    "job_brief",
+                    lambda ctx: self.get_job_brief(ctx["job_description"]),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+                Stage(
+                    "combined",
+                    lambda ctx: editor.enhance_combined(
+                        text=ctx["resume_text"],
+                        domain=ctx["domain"],
+                        job_title=ctx["job_title"],
+                        job_description=ctx["job_brief"],
+                        user_data=ctx["user_data"],
+                    ),
+                    depends_on=("resume_text", "job_brief"),
+                    timeout=LLM_STAGE_TIMEOUT,
+                    cache_ttl=LLM_STAGE_CACHE_TTL,
+                ),
+            ],
+        )
     
     async def get_resume_url(self, user_id: str) -> str:
         """
@@ -42,36 +171,178 @@ class ResumeProcessor:
         except Exception as e:
             raise Exception(f"Failed to fetch resume URL: {str(e)}")
     
-    async def get_resume_text(self, user_id: str) -> str:
+    async def get_resume_text(self, user_id: str, engine: Optional[str] = None) -> str:
         """
         Get the raw text content of a resume
         
+        The resume is revalidated with a conditional GET on every call. A 304
+        answer reuses the text cached for the user's current content hash, and
+        a changed body is only parsed when no text is cached for its hash yet.
+        When the download or extraction fails, the text cached for the same
+        URL is served instead.
+        
         Args:
             user_id: The user ID to fetch the resume for
+            engine: PDF extraction engine, defaults to the ``PDF_ENGINE`` setting
             
         Returns:
             Raw text content of the resume
         """
         try:
-            
-            cached_text = await self.redis_service.get_resume_raw_text(user_id)
-            if cached_text:
-                return cached_text
-            
             resume_url = await self.get_resume_url(user_id)
-            
+
+            source = await self.redis_service.get_resume_source(user_id) or {}
+            if source.get("url") != resume_url:
+                source = {}
+
             try:
-                resume_text = await self.text_editing_service.load_resume_content(resume_url)
-            except PDFTextExtractionError as e:
-                raise
-            
-            await self.redis_service.store_resume_raw_text(user_id, resume_text)
-            
-            return resume_text
-            
+                return await self._revalidate_resume_text(user_id, resume_url, source, engine)
+            except Exception as e:
+                cached_text = None
+                if source.get("content_key"):
+                    cached_text = await self.redis_service.get_pdf_text(source["content_key"])
+                if cached_text is None:
+                    raise
+                logging.warning(f"Serving cached resume text of user {user_id}: {e}")
+                return cached_text
+
         except Exception as e:
             raise Exception(f"Failed to get resume text: {str(e)}")
+
+    async def _revalidate_resume_text(
+        self,
+        user_id: str,
+        resume_url: Any,
+        source: Mapping[str, Any],
+        engine: Optional[str] = None,
+    ) -> str:
+        """Revalidate a resume against its recorded source and extract it when it changed"""
+        version = extractor_version(engine)
+        download = await fetch_pdf(
+            resume_url,
+            etag=source.get("etag"),
+            last_modified=source.get("last_modified"),
+        )
+        if download and download.not_modified:
+            content_key = f"{version}:{source['sha256']}"
+            cached_text = await self.redis_service.get_pdf_text(content_key)
+            if cached_text is not None:
+                return cached_text
+            # Text was evicted or the extractor changed; fetch the body again
+            download = await fetch_pdf(resume_url)
+
+        if not download:
+            raise PDFTextExtractionError("Failed to download PDF")
+
+        try:
+            content_key = f"{version}:{download.sha256}"
+            resume_text = await self.redis_service.get_pdf_text(content_key)
+            if resume_text is None:
+                resume_text = await self.text_editing_service.extract_resume_text(
+                    download, content_key, page_cache=self.redis_service, engine=engine
+                )
+                if not await self.redis_service.store_pdf_text(content_key, resume_text):
+                    content_key = None
+        finally:
+            download.close()
+
+        # Without cached text a 304 answer is of no use, so text too large to
+        # cache is recorded without validators and always downloaded again
+        source = {"url": resume_url, "sha256": download.sha256, "content_key": content_key}
+        if content_key:
+            source.update(etag=download.etag, last_modified=download.last_modified)
+        await self.redis_service.store_resume_source(user_id, source)
+
+        return resume_text
     
+    @staticmethod
+    def _job_analysis_key(job_description: str) -> str:
+        """Prompt version, model and hash of a normalized job description"""
+        normalized = " ".join(compact_text(job_description).split())
+        payload = json.dumps([normalized, LLM_JOB_DESCRIPTION_TOKEN_BUDGET])
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        version = CHAIN_SPECS["analyze_job_description"].version
+        return f"{version}:{ChainRegistry.model_id()}:{digest}"
+
+    async def get_job_analysis(self, job_description: str) -> JobAnalysis:
+        """
+        Get the analysis of a job description, shared by every applicant
+        
+        Analyses are stored for ``JOB_ANALYSIS_TTL`` seconds under a hash of
+        the normalized description, so a popular posting is analyzed once.
+        Concurrent first requests, in this or another worker, wait for the
+        same analysis.
+        
+        Args:
+            job_description: The description of the job
+            
+        Returns:
+            Requirements, key skills and a compact summary of the job
+        """
+        key = self._job_analysis_key(job_description)
+        try:
+            cached = await self.redis_service.get_job_analysis(key)
+        except Exception as e:
+            logging.warning(f"Job analysis lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            return JobAnalysis.model_validate_json(cached)
+
+        async def analyze() -> JobAnalysis:
+            analysis = await self.text_editing_service.analyze_job_description(job_description)
+            if JOB_ANALYSIS_TTL > 0:
+                try:
+                    await self.redis_service.store_job_analysis(
+                        key, analysis.model_dump_json(), JOB_ANALYSIS_TTL
+                    )
+                except Exception as e:
+                    logging.warning(f"Job analysis store failed: {e}")
+            return analysis
+
+        return await SingleFlight.do(
+            f"job_analysis:{key}", analyze, decode=JobAnalysis.model_validate
+        )
+
+    async def get_job_brief(self, job_description: str) -> str:
+        """
+        Compact form of a job description to use in prompts
+        
+        Args:
+            job_description: The description of the job
+            
+        Returns:
+            The summary, requirements and key skills of the job as text
+        """
+        analysis = await self.get_job_analysis(job_description)
+        lines = [analysis.summary]
+        if analysis.requirements:
+            lines.append(f"Requirements: {'; '.join(analysis.requirements)}")
+        if analysis.key_skills:
+            lines.append(f"Key skills: {', '.join(analysis.key_skills)}")
+        return "\n".join(line for line in lines if line)
+
+    async def match_jobs(
+        self, user_id: str, jobs: List[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score how well a resume fits jobs, without LLM calls
+        
+        The text cached for the user's current resume is scored as is; the
+        resume is only fetched and revalidated when no text is cached.
+        
+        Args:
+            user_id: The user ID whose resume is scored
+            jobs: Title and description of every job
+            
+        Returns:
+            Match scores of every job, in the same order
+        """
+        resume_text = await self.redis_service.get_resume_raw_text(user_id)
+        if resume_text is None:
+            resume_text = await self.get_resume_text(user_id)
+        # Vectorizing hundreds of postings is CPU work; keep it off the event loop
+        return await asyncio.to_thread(lambda: MatchScorer(resume_text).score_many(jobs))
+
     async def enhance_resume(
         self, 
         user_id: str, 
@@ -79,7 +350,8 @@ class ResumeProcessor:
         job_description: str,
         domain: str = "",
         user_data : str= "",
-        tone: str = "professional"
+        tone: str = "professional",
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process and enhance a resume for a specific job
@@ -90,72 +362,183 @@ class ResumeProcessor:
             job_description: The description of the job being applied for
             domain: The domain/industry of the job
             tone: The tone to adjust the resume to
+            mode: ``pipeline`` or ``combined``, defaults to the ``ENHANCE_MODE`` setting
             
         Returns:
             Dictionary with the enhanced resume and related data
         """
+        mode = mode or ENHANCE_MODE
+        if mode not in self.enhance_pipelines:
+            raise ValueError(f"Unknown enhancement mode: {mode}")
+
+        # Double clicks and frontend retries attach to the computation that is
+        # already running for the same inputs, in this or another worker
+        request = json.dumps(
+            [user_id, job_title, job_description, domain, user_data, tone, mode]
+        )
+        key = f"enhance_resume:{hashlib.sha256(request.encode('utf-8')).hexdigest()}"
         try:
-            resume_text = await self.get_resume_text(user_id)
+            # Failures raise inside the single flight so they are not shared
+            # with retries
+            return await SingleFlight.do(
+                key,
+                lambda: self._enhance_resume(
+                    user_id, job_title, job_description, domain, user_data, tone, mode
+                ),
+                decode=lambda result: dict(
+                    LazyRecord(result, RedisService.ENHANCED_RESUME_TYPES)
+                ),
+            )
+        except Exception as e:
+            return {
+                "status": "error",
+                "user_id": user_id,
+                "error": str(e)
+            }
+
+    async def _enhance_resume(
+        self,
+        user_id: str,
+        job_title: str,
+        job_description: str,
+        domain: str,
+        user_data: str,
+        tone: str,
+        mode: str,
+    ) -> Dict[str, Any]:
+        """Run the enhancement pipeline of a mode and cache its result"""
+        run = await self.enhance_pipelines[mode].run(
+            user_id=user_id,
+            job_title=job_title,
+            job_description=job_description,
+            domain=domain,
+            user_data=user_data,
+            tone=tone,
+        )
+
+        outputs = run.outputs
+        if mode == "combined":
+            combined = outputs["combined"]
+            outputs = {
+                "resume_text": outputs["resume_text"],
+                "enhanced_text": combined.enhanced_text,
+                "keywords": keyword_records(combined.keywords),
+                "processed_resume": combined.resume,
+            }
+
+        result = {
+            "user_id": user_id,
+            "original_text": outputs["resume_text"],
+            "enhanced_text": outputs["enhanced_text"],
+            # "formatted_text": formatted_text,
+            # "grammar_suggestions": grammar_suggestions,  # Future update
+            # "professional_text": professional_text,      # Future update
+            "keywords": outputs["keywords"],
+            "processed_resume": outputs["processed_resume"],
+            "mode": mode,
+            "timings": run.timings,
+        }
+
+        await self.redis_service.store_enhanced_resume(user_id, job_title, result)
+
+        return result
+    
+    async def stream_enhance_resume(
+        self,
+        user_id: str,
+        job_title: str,
+        job_description: str,
+        domain: str = "",
+        user_data: str = "",
+        tone: str = "professional"
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Enhance a resume for a specific job, streaming partial results
+        
+        Args:
+            user_id: The user ID to fetch and enhance the resume for
+            job_title: The title of the job being applied for
+            job_description: The description of the job being applied for
+            domain: The domain/industry of the job
+            tone: The tone to adjust the resume to
             
-            try:
-                enhanced_text = await self.text_editing_service.enhance_text(
-                    text=resume_text,
-                    job_title=job_title,
-                    job_description=job_description
-                )
-                # TODO: Future update - grammar suggestions
-                # grammar_suggestions = await self.text_editing_service.check_grammar(enhanced_text)
-                # TODO: Future update - adjust tone
-                # professional_text = await self.text_editing_service.adjust_tone(enhanced_text, tone=tone)
-                # TODO: Future update - format bullet points
-                # formatted_text = await self.text_editing_service.format_bullet_points(professional_text)
-                # For now, use enhanced_text for further processing
-                formatted_text = enhanced_text
-                keywords = await self.text_editing_service.extract_keywords(
-                    text=formatted_text,
+        Yields:
+            ``(event, data)`` tuples: ``token`` chunks of the enhanced text as
+            the model generates them, ``enhanced_text`` once it is complete,
+            ``keywords`` and ``processed_resume`` as each stage finishes, then
+            ``done`` with stage timings, or ``error`` if a stage fails
+        """
+        editor = self.text_editing_service
+        timings: Dict[str, float] = {}
+        pending = set()
+        try:
+            started = time.perf_counter()
+            resume_text, job_description = await asyncio.gather(
+                self.get_resume_text(user_id),
+                self.get_job_brief(job_description),
+            )
+            timings["resume_text"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            chunks = []
+            async for chunk in editor.stream_enhance_text(
+                text=resume_text,
+                job_title=job_title,
+                job_description=job_description
+            ):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            enhanced_text = "".join(chunks)
+            timings["enhanced_text"] = time.perf_counter() - started
+            yield "enhanced_text", {"text": enhanced_text}
+
+            started = time.perf_counter()
+            stages = {
+                asyncio.ensure_future(editor.extract_keywords(
+                    text=enhanced_text,
                     job_description=job_description
-                )
-                processed_resume = await self.text_editing_service.process_resume(
-                    text=formatted_text,
+                )): "keywords",
+                asyncio.ensure_future(editor.process_resume(
+                    text=enhanced_text,
                     domain=domain,
                     job_title=job_title,
                     job_description=job_description,
                     user_data=user_data
-                )
-            except LLMServiceError as e:
-                return {
-                    "status": "error",
-                    "user_id": user_id,
-                    "error": str(e)
-                }
-            
+                )): "processed_resume",
+            }
             result = {
                 "user_id": user_id,
                 "original_text": resume_text,
                 "enhanced_text": enhanced_text,
-                # "formatted_text": formatted_text,
-                # "grammar_suggestions": grammar_suggestions,  # Future update
-                # "professional_text": professional_text,      # Future update
-                "keywords": keywords,
-                "processed_resume": processed_resume
             }
-            
-            await self.redis_service.store_enhanced_resume(user_id, job_title, result)
-            
-            return result
-            
+            pending = set(stages)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = stages[task]
+                    result[name] = task.result()
+                    timings[name] = time.perf_counter() - started
+                    yield name, result[name]
+
+            result["timings"] = timings
+            try:
+                await self.redis_service.store_enhanced_resume(user_id, job_title, result)
+            except Exception as e:
+                logging.warning(f"Failed to cache streamed enhancement for {user_id}: {e}")
+
+            yield "done", {"user_id": user_id, "timings": timings}
+
         except Exception as e:
-            return {
-                "status": "error",
-                "user_id": user_id,
-                "error": str(e)
-            }
-    
+            yield "error", {"status": "error", "user_id": user_id, "error": str(e)}
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def get_enhanced_resume(
         self, 
         user_id: str, 
         job_title: str
-    ) -> Dict[str, Any]:
+    ) -> Mapping[str, Any]:
         """
         Retrieve a previously enhanced resume
         
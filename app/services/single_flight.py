@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app import (
+    SINGLE_FLIGHT_LOCK_TTL,
+    SINGLE_FLIGHT_POLL_INTERVAL,
+    SINGLE_FLIGHT_RESULT_TTL,
+)
+from app.services.redis import RedisService
+from app.utils import codec, serialization
+
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_RENEW_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations
+
+    Callers in the same process share one in-flight future. Across workers a
+    Redis lock elects a leader that computes the result and publishes it
+    under a key living ``SINGLE_FLIGHT_RESULT_TTL`` seconds; the other
+    workers wait for that key instead of computing the result themselves,
+    and identical requests arriving within that window reuse it.
+
+    The leader renews its lock while it computes, so the lock outlives slow
+    computations but frees within ``SINGLE_FLIGHT_LOCK_TTL`` seconds of a
+    crashed leader. Failures raise and are never published: a waiting worker
+    then takes over, and retries compute again.
+    """
+
+    _in_flight: Dict[str, "asyncio.Task"] = {}
+    """Computations running in this process, by key."""
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{RedisService.Namespace.SINGLE_FLIGHT}:lock:{key}"
+
+    @staticmethod
+    def _result_key(key: str) -> str:
+        return f"{RedisService.Namespace.SINGLE_FLIGHT}:result:{key}"
+
+    @classmethod
+    async def do(
+        cls,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Run ``fn`` once for all concurrent callers using the same key
+
+        Args:
+            key: Identifies the computation; callers with equal keys share it
+            fn: Coroutine function computing a JSON-serializable result, and
+                raising on failure
+            decode: Rebuilds the result's type from its decoded JSON, for
+                results received from another worker
+
+        Returns:
+            The result of ``fn``, possibly computed by another caller
+        """
+        task = cls._in_flight.get(key)
+        if task is None:
+            # The computation runs detached so that a cancelled caller (e.g. a
+            # client disconnect) does not cancel it for everybody else
+            task = asyncio.ensure_future(cls._do_across_workers(key, fn, decode))
+            cls._in_flight[key] = task
+            task.add_done_callback(lambda done: cls._forget(key, done))
+        return await asyncio.shield(task)
+
+    @classmethod
+    def _forget(cls, key: str, task: "asyncio.Task") -> None:
+        """Drop a finished computation so later calls start a new one"""
+        if cls._in_flight.get(key) is task:
+            del cls._in_flight[key]
+
+    @classmethod
+    async def _do_across_workers(
+        cls,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Elect a leader across workers through a Redis lock"""
+        client = RedisService.get_client()
+        lock_key, result_key = cls._lock_key(key), cls._result_key(key)
+        token = uuid.uuid4().hex
+
+        while True:
+            try:
+                # A result published moments ago by a leader is reused, which
+                # also covers followers that poll right after the lock is freed
+                raw = await client.get(result_key)
+                if raw is not None:
+                    result = serialization.loads(codec.decode(raw))
+                    return decode(result) if decode else result
+                acquired = await client.set(
+                    lock_key, token, nx=True, px=int(SINGLE_FLIGHT_LOCK_TTL * 1000)
+                )
+            except Exception as e:
+                logging.warning(f"Single-flight lock unavailable, computing locally: {e}")
+                return await fn()
+
+            if acquired:
+                break
+            # The lock lives as long as its leader renews it; once it is gone
+            # without a result, the next poll takes over
+            await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+
+        renewal = asyncio.ensure_future(cls._renew_lock(lock_key, token))
+        try:
+            result = await fn()
+            try:
+                await client.set(
+                    result_key,
+                    codec.encode(serialization.dumps(result)),
+                    ex=SINGLE_FLIGHT_RESULT_TTL,
+                )
+            except Exception as e:
+                logging.warning(f"Failed to publish single-flight result: {e}")
+            return result
+        finally:
+            renewal.cancel()
+            try:
+                await client.eval(_RELEASE_LOCK, 1, lock_key, token)
+            except Exception as e:
+                logging.warning(f"Failed to release single-flight lock: {e}")
+
+    @staticmethod
+    async def _renew_lock(lock_key: str, token: str) -> None:
+        """Extend a leader's lock every third of its lifetime until cancelled"""
+        client = RedisService.get_client()
+        while True:
+            await asyncio.sleep(SINGLE_FLIGHT_LOCK_TTL / 3)
+            try:
+                renewed = await client.eval(
+                    _RENEW_LOCK, 1, lock_key, token, int(SINGLE_FLIGHT_LOCK_TTL * 1000)
+                )
+            except Exception as e:
+                logging.warning(f"Failed to renew single-flight lock: {e}")
+                continue
+            if not renewed:
+                logging.warning(f"Lost single-flight lock {lock_key}")
+                return
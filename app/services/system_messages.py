@@ -4,6 +4,7 @@ resume_prompts = """You are an expert HR professional. Your task is to extract i
                     Job Title: {job_title}
                     Job Description : {job_description}
                     User Data : {user_data}
+                    Detected Skills : {detected_skills}
 
                     Instructions:
                     1. Extract relevant information and map it to the appropriate fields in the schema.
@@ -13,6 +14,7 @@ resume_prompts = """You are an expert HR professional. Your task is to extract i
                     5. Make it ATS Friendly.
                     6. make sure to return something with validation of it's type so that i don't get error
                     7. if job title and job description is none then use user_data and make an resume based on that. 
+                    8. Detected Skills were found in the resume text by exact matching; include each of them in skills with a fitting level.
                     """
 
 enhance_resume_prompts = """You are an expert resume writer. Enhance the following text to be more professional and ATS-friendly.
@@ -65,7 +67,7 @@ extract_keyword_prompts = """You are an expert in resume optimization. Extract r
             2. Identify soft skills
             3. Identify industry-specific terms
             4. Prioritize keywords that appear in the job description
-            5. Return a list of unique keywords
+            5. Return only a comma-separated list of unique keywords, most relevant first, without headings or explanations
             """
 
 bullet_format_prompts = """You are an expert in resume optimization. Extract relevant keywords from the text that match the job description.
@@ -90,4 +92,35 @@ Instructions:
 3. If a section is missing, leave it empty or omit it.
 4. Ensure the output is well-structured, clear, and free of errors.
 5. Return the result as a JSON object matching the expected schema.
-"""
\ No newline at end of file
+"""
+
+analyze_job_description_prompt = """You are an expert technical recruiter. Analyze the following job description for a resume writer.
+            
+            Job Description: {job_description}
+            
+            Instructions:
+            1. summary: the role, seniority, location and main responsibilities as short phrases
+            2. requirements: every required and preferred qualification, e.g. years of experience or degrees, as short phrases
+            3. key_skills: every skill, tool and certification the job asks for, one name each
+            4. Drop company boilerplate, benefits and legal statements
+            5. Use at most {max_words} words in total
+            6. Return the result as a JSON object matching the expected schema
+            """
+
+combined_enhance_prompt = """You are an expert resume writer and HR professional. Enhance the following resume for the job, extract its keywords and structure it, all in one answer.
+            
+            Resume Text: {text}
+            Domain: {domain}
+            Job Title: {job_title}
+            Job Description: {job_description}
+            User Data: {user_data}
+            Detected Skills: {detected_skills}
+            
+            Instructions:
+            1. enhanced_text: rewrite the resume to be professional and ATS-friendly, using strong action verbs, quantified achievements and keywords from the job description, keeping all the data of the user in an organized way
+            2. keywords: list the unique technical skills, soft skills and industry terms of the enhanced resume, prioritizing those in the job description
+            3. resume: extract the enhanced resume into the structured schema, inferring fields from context or leaving them blank, with sufficient projects for the job title and description
+            4. Make sure that everything is written perfectly in english
+            5. If job title and job description are none then use user_data
+            6. Detected Skills were found in the resume text by exact matching; include each of them in the skills of resume with a fitting level
+            """
@@ -1,174 +1,266 @@
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from app.types.responseFormat import Response
-from app.services.system_messages import resume_prompts, enhance_resume_prompts, grammar_resume_prompts, adjust_resume_prompts, extract_keyword_prompts, bullet_format_prompts, user_data_resume_prompt
-from app.utils.pdf_text import fetch_pdf_text
-from typing import Dict, List, Optional
-from app import (MODEL, GROQ_MODEL, GROQ_API_KEY, USE_GROQ)
+from app.types.responseFormat import CombinedResponse, JobAnalysis, Response
+from app.services.llm import CHAIN_SPECS, BatchDispatcher, ChainRegistry, LLMCache, LLMLimiter, LLMRouter
+from app.utils.pdf_executor import PageCache, PDFExtractor
+from app.utils.pdf_text import PDFDownload, fetch_pdf
+from app.utils.keywords import keyword_records, parse_keyword_list, rank_keywords
+from app.utils.skills import detected_skills
+from app.utils.tokens import compact_text, count_tokens, truncate_to_tokens
+from app import KEYWORD_EXTRACTOR, LLM_BATCHING, LLM_COMPLETION_TOKEN_ESTIMATE, LLM_JOB_DESCRIPTION_TOKEN_BUDGET
+from typing import Any, AsyncIterator, Dict, List, Optional
 import re
 import asyncio
+import logging
 from app.utils.errors.exceptions import PDFTextExtractionError, LLMServiceError
 
 class TextEditingService:
     def __init__(self):
-        self.model_structured = self._load_model()
-        self.model = self._load_llm()
-
-    def _load_llm(self):
-        model = ChatGroq(
-            model=GROQ_MODEL,
-            api_key=GROQ_API_KEY
-        ) if USE_GROQ else ChatOllama(model=MODEL)
-
-        parser = StrOutputParser()
-        chain = model | parser
-        return chain
-    
-    def _load_model(self):
-        model = ChatGroq(
-            model=GROQ_MODEL,
-            api_key=GROQ_API_KEY
-        ) if USE_GROQ else ChatOllama(model=MODEL)
-        model = model.with_structured_output(Response)
-        return model
+        # Chains are built once per process and shared by every instance
+        ChainRegistry.load()
 
     async def load_resume_content(self, file_url: str) -> str:
         """Load content from PDF resume files asynchronously"""
+        download = await fetch_pdf(file_url)
+        if not download:
+            raise PDFTextExtractionError("Failed to download PDF")
         try:
-            content = await fetch_pdf_text(file_url)
+            return await self.extract_resume_text(download)
+        finally:
+            download.close()
+
+    async def extract_resume_text(
+        self,
+        download: PDFDownload,
+        content_key: Optional[str] = None,
+        page_cache: Optional[PageCache] = None,
+        engine: Optional[str] = None,
+    ) -> str:
+        """Extract text from a downloaded PDF in the extraction process pool"""
+        try:
+            content = await PDFExtractor.extract(
+                download.source(), content_key, page_cache, engine=engine
+            )
             if not content:
                 raise PDFTextExtractionError()
             return content
+        except PDFTextExtractionError:
+            raise
+        except asyncio.TimeoutError:
+            raise PDFTextExtractionError("Timed out extracting text from PDF")
         except Exception as e:
             raise PDFTextExtractionError(str(e))
 
+    @staticmethod
+    def _fit_inputs(name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compact the text inputs of a chain and cut them to the chain's token
+        budgets, logging every input that loses its tail
+        """
+        budgets = CHAIN_SPECS[name].budgets
+        fitted = {}
+        for key, value in inputs.items():
+            if key in budgets and isinstance(value, str):
+                compacted = compact_text(value)
+                value = truncate_to_tokens(compacted, budgets[key])
+                if len(value) < len(compacted):
+                    logging.warning(
+                        f"Truncated {key} of {name} to {budgets[key]} tokens, "
+                        f"from {count_tokens(compacted)}"
+                    )
+            fitted[key] = value
+        return fitted
+
+    @staticmethod
+    def _estimate_tokens(name: str, inputs: Dict[str, Any]) -> int:
+        """Prompt tokens of a chain call plus the expected completion, for rate limiting"""
+        prompt = count_tokens(CHAIN_SPECS[name].template) + sum(
+            count_tokens(value) for value in inputs.values() if isinstance(value, str)
+        )
+        return prompt + LLM_COMPLETION_TOKEN_ESTIMATE
+
+    async def _ainvoke(self, name: str, inputs: Dict[str, Any]) -> Any:
+        """
+        Invoke a shared chain natively async, within the backend's concurrency
+        limit, serving repeated calls from the LLM cache. Calls throttled by the
+        provider are retried with backoff, and slow calls are hedged to the
+        secondary backend with ``LLM_ROUTING=hedged``. With ``LLM_BATCHING``
+        concurrent calls are sent in batches to the primary backend instead.
+        """
+        inputs = self._fit_inputs(name, inputs)
+        cache_key = LLMCache.key(
+            name, CHAIN_SPECS[name].version, ChainRegistry.model_id(), inputs
+        )
+        hit, cached = await LLMCache.get(name, cache_key)
+        if hit:
+            return cached
+
+        tokens = self._estimate_tokens(name, inputs)
+        if LLM_BATCHING:
+            result = await BatchDispatcher.submit(name, inputs, tokens)
+        else:
+            try:
+                result = await LLMRouter.invoke(name, inputs, tokens)
+            except Exception as e:
+                raise LLMServiceError(str(e))
+
+        await LLMCache.set(name, cache_key, result)
+        return result
+
+    async def _astream(self, name: str, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream the output chunks of a shared text chain, within the backend's
+        concurrency limit. A cached output is yielded as a single chunk.
+        """
+        inputs = self._fit_inputs(name, inputs)
+        cache_key = LLMCache.key(
+            name, CHAIN_SPECS[name].version, ChainRegistry.model_id(), inputs
+        )
+        hit, cached = await LLMCache.get(name, cache_key)
+        if hit:
+            yield cached
+            return
+
+        chain = ChainRegistry.get(name)
+        chunks = []
+        async with LLMLimiter.limit(
+            ChainRegistry.backend(), tokens=self._estimate_tokens(name, inputs), chain=name
+        ):
+            try:
+                async for chunk in chain.astream(inputs):
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                raise LLMServiceError(str(e))
+
+        await LLMCache.set(name, cache_key, "".join(chunks))
+
     async def process_resume(self, text: str, domain: str, job_title: str, job_description: str, user_data: str) -> Response:
         """Process resume text and return structured data asynchronously"""
-        prompts = PromptTemplate(
-            template=resume_prompts,
-            input_variables=["text", "domain", "job_title", "job_description","user_data"],
+        return await self._ainvoke(
+            "process_resume",
+            {
+                "text": text,
+                "domain": domain,
+                "job_title": job_title,
+                "job_description": job_description,
+                "user_data" : user_data,
+                # Skills matched locally pre-fill the structured output
+                "detected_skills": ", ".join(detected_skills(text))
+            }
+        )
+
+    async def enhance_combined(self, text: str, domain: str, job_title: str, job_description: str, user_data: str) -> CombinedResponse:
+        """Enhance resume text, extract its keywords and structure it in a single call asynchronously"""
+        return await self._ainvoke(
+            "combined_enhance",
+            {
+                "text": text,
+                "domain": domain,
+                "job_title": job_title,
+                "job_description": job_description,
+                "user_data": user_data,
+                "detected_skills": ", ".join(detected_skills(text))
+            }
         )
-        chain = prompts | self.model_structured
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {
-                    "text": text,
-                    "domain": domain,
-                    "job_title": job_title,
-                    "job_description": job_description,
-                    "user_data" : user_data
-                }
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
 
     async def enhance_text(self, text: str, job_title: str, job_description: str) -> str:
         """Enhance the text to be more professional and ATS-friendly asynchronously"""
-        prompts = PromptTemplate(
-            template=enhance_resume_prompts,
-            input_variables=["text", "job_title", "job_description"]
+        return await self._ainvoke(
+            "enhance_text",
+            {
+                "text": text,
+                "job_title": job_title,
+                "job_description": job_description
+            }
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {
-                    "text": text,
-                    "job_title": job_title,
-                    "job_description": job_description
-                }
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
+
+    async def stream_enhance_text(self, text: str, job_title: str, job_description: str) -> AsyncIterator[str]:
+        """Stream the enhanced text token by token as the model generates it"""
+        async for chunk in self._astream(
+            "enhance_text",
+            {
+                "text": text,
+                "job_title": job_title,
+                "job_description": job_description
+            }
+        ):
+            yield chunk
+
+    async def analyze_job_description(self, job_description: str) -> JobAnalysis:
+        """
+        Requirements, key skills and a compact summary of a job description
+
+        Descriptions within ``LLM_JOB_DESCRIPTION_TOKEN_BUDGET`` are only
+        cleaned up and used whole as the summary; longer ones are analyzed by
+        the model. Skills of the taxonomy found in the description always
+        lead the key skills.
+        """
+        compacted = compact_text(job_description)
+        skills = detected_skills(compacted)
+        if LLM_JOB_DESCRIPTION_TOKEN_BUDGET <= 0 or count_tokens(compacted) <= LLM_JOB_DESCRIPTION_TOKEN_BUDGET:
+            return JobAnalysis(summary=compacted, key_skills=skills)
+
+        analysis = await self._ainvoke(
+            "analyze_job_description",
+            {
+                "job_description": compacted,
+                # Words run at roughly 1.3 tokens each
+                "max_words": str(int(LLM_JOB_DESCRIPTION_TOKEN_BUDGET / 1.3))
+            }
+        )
+        known = {skill.lower() for skill in skills}
+        analysis.key_skills = skills + [
+            skill for skill in analysis.key_skills if skill.lower() not in known
+        ]
+        return analysis
 
     async def check_grammar(self, text: str) -> Dict[str, List[str]]:
         """Check grammar and provide suggestions for improvement asynchronously"""
-        prompts = PromptTemplate(
-            template=grammar_resume_prompts,
-            input_variables=["text"]
+        return await self._ainvoke(
+            "check_grammar",
+            {"text": text}
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {"text": text}
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
 
     async def adjust_tone(self, text: str, tone: str = "professional") -> str:
         """Adjust the tone of the text to be more professional, confident, or other specified tone asynchronously"""
-        prompts = PromptTemplate(
-            template=adjust_resume_prompts,
-            input_variables=["text", "tone"]
+        return await self._ainvoke(
+            "adjust_tone",
+            {
+                "text": text,
+                "tone": tone
+            }
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {
-                    "text": text,
-                    "tone": tone
-                }
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
 
-    async def extract_keywords(self, text: str, job_description: str) -> List[str]:
-        """Extract relevant keywords from the text that match the job description asynchronously"""
-        prompts = PromptTemplate(
-            template=extract_keyword_prompts,
-            input_variables=["text", "job_description"]
+    async def extract_keywords(self, text: str, job_description: str) -> List[Dict[str, Any]]:
+        """
+        Extract relevant keywords from the text that match the job description asynchronously
+
+        With ``KEYWORD_EXTRACTOR=local`` the keywords are ranked locally, without
+        an LLM call; otherwise the model lists them. Either way they come most
+        relevant first in the records of ``rank_keywords``, with no scores when
+        the model listed them (see ``keyword_records``).
+        """
+        if KEYWORD_EXTRACTOR == "local":
+            return rank_keywords(text, job_description)
+        answer = await self._ainvoke(
+            "extract_keywords",
+            {
+                "text": text,
+                "job_description": job_description
+            }
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {
-                    "text": text,
-                    "job_description": job_description
-                }
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
+        return keyword_records(parse_keyword_list(answer))
 
     async def format_bullet_points(self, text: str) -> str:
         """Format text into professional bullet points asynchronously"""
-        prompts = PromptTemplate(
-            template=bullet_format_prompts,
-            input_variables=["text"]
+        return await self._ainvoke(
+            "format_bullet_points",
+            {"text": text}
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {"text": text}
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
 
     async def create_resume_from_user_data(self, user_data: dict) -> str:
         """Create a resume from user data using a custom prompt asynchronously."""
-        prompts = PromptTemplate(
-            template=user_data_resume_prompt,
-            input_variables=["user_data"]
+        return await self._ainvoke(
+            "create_resume_from_user_data",
+            {"user_data": str(user_data)}
         )
-        chain = prompts | self.model
-        try:
-            result = await asyncio.to_thread(
-                chain.invoke,
-                {"user_data": str(user_data)}
-            )
-            return result
-        except Exception as e:
-            raise LLMServiceError(str(e))
     
\ No newline at end of file
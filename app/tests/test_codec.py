@@ -0,0 +1,44 @@
+import json
+import zlib
+
+from app.utils import codec
+from app.utils.codec import MAGIC, decode, encode
+
+TEXT = "\n".join(
+    f"Senior Software Engineer {index} - Built Python APIs with FastAPI and Redis"
+    for index in range(200)
+)
+
+
+def test_large_values_round_trip_compressed():
+    """Every installed codec shrinks large text and reads it back"""
+    for name in codec._CODECS:
+        encoded = encode(TEXT, codec=name, min_bytes=1024)
+
+        assert encoded.startswith(MAGIC)
+        assert len(encoded) * 4 < len(TEXT)
+        assert decode(encoded).decode("utf-8") == TEXT
+
+
+def test_small_and_legacy_values_are_stored_as_they_are():
+    """Values under the threshold and values written without a codec read unchanged"""
+    small = json.dumps({"text": "short"})
+
+    assert encode(small, codec="zlib", min_bytes=1024) == small.encode("utf-8")
+    assert encode(TEXT, codec="none") == TEXT.encode("utf-8")
+    assert decode(TEXT.encode("utf-8")) == TEXT.encode("utf-8")
+    assert decode(zlib.compress(b"x" * 10)) == zlib.compress(b"x" * 10)
+
+
+def test_incompressible_values_are_not_wrapped():
+    """Values that would not shrink are stored raw"""
+    data = bytes(range(256)) * 8
+    noise = zlib.compress(data, 9)
+
+    assert encode(noise, codec="zlib", min_bytes=16) == noise
+
+
+if __name__ == "__main__":
+    test_large_values_round_trip_compressed()
+    test_small_and_legacy_values_are_stored_as_they_are()
+    test_incompressible_values_are_not_wrapped()
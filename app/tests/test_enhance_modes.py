@@ -0,0 +1,100 @@
+import asyncio
+
+from app.services.llm import cache
+from app.services.llm.chains import ChainRegistry
+from app.services.resume_processor import ResumeProcessor
+from app.types.responseFormat import CombinedResponse, Response
+
+RESUME = (
+    "Jane Doe\n"
+    "Backend engineer building Python APIs with FastAPI, PostgreSQL and Redis.\n"
+    "Deployed services on Kubernetes in AWS."
+)
+JOB_DESCRIPTION = "Senior backend engineer for Python APIs with FastAPI and PostgreSQL on AWS"
+STRUCTURED = Response(
+    name="Jane Doe",
+    graduation="Bachelor of Technology",
+    experience_level="Advanced",
+    description="Backend engineer",
+    email="jane@example.com",
+)
+
+
+class _FakeChain:
+    """Chain answering with a fixed output and recording its calls"""
+
+    def __init__(self, name, output, calls):
+        self.name = name
+        self.output = output
+        self.calls = calls
+
+    async def ainvoke(self, inputs):
+        self.calls.append(self.name)
+        return self.output
+
+
+def _enhance(mode):
+    """Enhance ``RESUME`` in ``mode`` with stubbed chains, returning the result and chain calls"""
+    outputs = {
+        "enhance_text": RESUME,
+        "process_resume": STRUCTURED,
+        "combined_enhance": CombinedResponse(
+            enhanced_text=RESUME, keywords=["Python", "FastAPI", "PostgreSQL"], resume=STRUCTURED
+        ),
+    }
+    calls, stored = [], []
+    processor = ResumeProcessor()
+
+    async def get_resume_text(user_id):
+        return RESUME
+
+    async def get_job_brief(job_description):
+        return job_description
+
+    async def store_enhanced_resume(user_id, job_title, result):
+        stored.append(result)
+
+    processor.get_resume_text = get_resume_text
+    processor.get_job_brief = get_job_brief
+    processor.redis_service.store_enhanced_resume = store_enhanced_resume
+
+    get, ttl = ChainRegistry.__dict__["get"], cache.LLM_CACHE_TTL
+    ChainRegistry.get = classmethod(
+        lambda cls, name, backend=None: _FakeChain(name, outputs[name], calls)
+    )
+    cache.LLM_CACHE_TTL = 0
+    try:
+        result = asyncio.run(
+            processor._enhance_resume(
+                "user", "Backend Engineer", JOB_DESCRIPTION, "", "", "professional", mode
+            )
+        )
+    finally:
+        ChainRegistry.get, cache.LLM_CACHE_TTL = get, ttl
+
+    assert stored == [result]
+    return result, calls
+
+
+def test_combined_mode_matches_the_pipeline_result_shape():
+    """Both modes return the same fields, keyword records and structured resume"""
+    pipeline, pipeline_calls = _enhance("pipeline")
+    combined, combined_calls = _enhance("combined")
+
+    assert sorted(pipeline_calls) == ["enhance_text", "process_resume"]
+    assert combined_calls == ["combined_enhance"]
+
+    assert set(combined) == set(pipeline)
+    assert (combined["mode"], pipeline["mode"]) == ("combined", "pipeline")
+    for field in ("user_id", "original_text", "enhanced_text", "processed_resume"):
+        assert combined[field] == pipeline[field], field
+
+    assert [record["keyword"] for record in combined["keywords"]] == ["Python", "FastAPI", "PostgreSQL"]
+    for record in combined["keywords"] + pipeline["keywords"]:
+        assert set(record) == set(pipeline["keywords"][0])
+    assert all(record["score"] is None for record in combined["keywords"])
+    assert set(combined["timings"]) == {"resume_text", "job_brief", "combined", "total"}
+
+
+if __name__ == "__main__":
+    test_combined_mode_matches_the_pipeline_result_shape()
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.services.resume_processor import ResumeProcessor
+from app.services.textEditing import TextEditingService
+
+
+def test_job_analysis_key_ignores_formatting():
+    """Postings differing only in whitespace share one analysis"""
+    key = ResumeProcessor._job_analysis_key
+
+    assert key("Python developer\n\n  with  Go") == key("Python developer with Go")
+    assert key("Python developer") != key("Java developer")
+
+
+def test_short_job_description_is_analyzed_locally():
+    """Descriptions within budget are kept whole, with their taxonomy skills"""
+    analysis = asyncio.run(
+        TextEditingService().analyze_job_description(
+            "Senior engineer with  Python, k8s and Go.\n5+ years"
+        )
+    )
+
+    assert analysis.summary == "Senior engineer with Python, k8s and Go.\n5+ years"
+    assert analysis.key_skills == ["Python", "Kubernetes", "Go"]
+    assert analysis.requirements == []
+
+
+if __name__ == "__main__":
+    test_job_analysis_key_ignores_formatting()
+    test_short_job_description_is_analyzed_locally()
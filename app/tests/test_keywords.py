@@ -0,0 +1,87 @@
+import asyncio
+
+from app.services import textEditing
+from app.services.textEditing import TextEditingService
+from app.utils.keywords import keyword_records, parse_keyword_list, rank_keywords
+from app.utils.skills import detected_skills
+
+RESUME = """Jane Doe - Senior Software Engineer
+Skills: Python, FastAPI, PostgreSQL, Redis, Docker, k8s, node.js, C++
+Led migration of 40 services to Kubernetes, cutting costs by 30%.
+Designed event-driven pipelines with RabbitMQ. I go to the gym."""
+
+JOB_DESCRIPTION = """We are looking for a senior backend engineer to build Python APIs
+with FastAPI, Postgres and Redis on Kubernetes. You will own event-driven services on RabbitMQ."""
+
+
+def test_skills_are_matched_through_aliases_and_case():
+    """Aliases map to canonical names and case-sensitive names skip plain words"""
+    skills = detected_skills(RESUME)
+
+    assert "Kubernetes" in skills
+    assert "Node.js" in skills
+    assert "C++" in skills
+    assert "Go" not in skills
+
+
+def test_rank_keywords_prefers_job_description_terms():
+    """Keywords shared with the job description outrank resume-only skills"""
+    keywords = rank_keywords(RESUME, JOB_DESCRIPTION)
+    ranked = [keyword["keyword"] for keyword in keywords]
+
+    assert {"Python", "FastAPI", "PostgreSQL", "Redis", "RabbitMQ"} <= set(ranked)
+    assert ranked.index("PostgreSQL") < ranked.index("Docker")
+    assert all(0 <= keyword["overlap"] <= 1 for keyword in keywords)
+    assert keywords == sorted(keywords, key=lambda keyword: -keyword["score"])
+    assert rank_keywords("", JOB_DESCRIPTION) == []
+
+
+def test_model_keyword_lists_are_parsed():
+    """Comma-separated, bulleted and headed answers give the same names"""
+    answers = [
+        "Python, FastAPI, PostgreSQL, python",
+        "Here are the keywords:\n- Python\n- FastAPI\n2. PostgreSQL",
+        "**Technical skills:** Python, FastAPI\nDatabases: PostgreSQL.",
+    ]
+    for answer in answers:
+        assert parse_keyword_list(answer) == ["Python", "FastAPI", "PostgreSQL"]
+
+    assert parse_keyword_list("These keywords match the job description well") == []
+
+
+def test_keywords_have_the_same_shape_in_every_mode():
+    """Local, LLM and combined keywords are all ranked records, scored when local"""
+    editor = object.__new__(TextEditingService)
+
+    async def answer(name, inputs):
+        return "Python, k8s, Spring, on-call rotations"
+
+    editor._ainvoke = answer
+    extractor = textEditing.KEYWORD_EXTRACTOR
+    shapes = {}
+    try:
+        for mode in ("local", "llm"):
+            textEditing.KEYWORD_EXTRACTOR = mode
+            shapes[mode] = asyncio.run(editor.extract_keywords(RESUME, JOB_DESCRIPTION))
+    finally:
+        textEditing.KEYWORD_EXTRACTOR = extractor
+    # Combined mode maps the model's list the same way
+    shapes["combined"] = keyword_records(["Python", "k8s", "Spring", "on-call rotations"])
+
+    fields = set(rank_keywords(RESUME, JOB_DESCRIPTION)[0])
+    for mode, keywords in shapes.items():
+        assert keywords and all(set(keyword) == fields for keyword in keywords), mode
+    assert shapes["local"] == rank_keywords(RESUME, JOB_DESCRIPTION)
+    assert shapes["llm"] == shapes["combined"]
+    assert [keyword["keyword"] for keyword in shapes["llm"]] == [
+        "Python", "Kubernetes", "Spring", "on-call rotations"
+    ]
+    assert [keyword["skill"] for keyword in shapes["llm"]] == [True, True, True, False]
+    assert all(keyword["score"] is None for keyword in shapes["llm"])
+
+
+if __name__ == "__main__":
+    test_skills_are_matched_through_aliases_and_case()
+    test_rank_keywords_prefers_job_description_terms()
+    test_model_keyword_lists_are_parsed()
+    test_keywords_have_the_same_shape_in_every_mode()
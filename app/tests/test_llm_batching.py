@@ -0,0 +1,146 @@
+import asyncio
+
+from app.services.llm import batching
+from app.services.llm.batching import BatchDispatcher
+from app.services.llm.chains import ChainRegistry
+from app.services.llm.limiter import LLMLimiter
+from app.utils.errors.exceptions import LLMServiceError
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class _FakeChain:
+    """Chain echoing its input text, failing for "bad" and throttling "busy" once"""
+
+    def __init__(self):
+        self.batches = []
+        self.in_flight = []
+        self.invoked = []
+
+    def _answer(self, inputs):
+        if inputs["text"] == "bad":
+            return ValueError("Model refused")
+        if inputs["text"] == "busy":
+            return _RateLimitError("Too many requests")
+        return inputs["text"].upper()
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batches.append(len(inputs))
+        self.in_flight.append(LLMLimiter.in_flight("groq"))
+        await asyncio.sleep(0.01)
+        return [self._answer(item) for item in inputs]
+
+    async def ainvoke(self, inputs):
+        self.invoked.append(inputs["text"])
+        return inputs["text"].upper()
+
+
+def _with_chain(test, max_size=4, max_wait_ms=50):
+    """Run an async test with a fake chain on the groq backend"""
+    chain = _FakeChain()
+    get, backend = ChainRegistry.__dict__["get"], ChainRegistry.__dict__["backend"]
+    settings = (
+        batching.LLM_BATCH_MAX_SIZE,
+        batching.LLM_BATCH_MAX_WAIT_MS,
+        batching.LLM_RATE_LIMIT_BACKOFF,
+    )
+    ChainRegistry.get = classmethod(lambda cls, name, backend=None: chain)
+    ChainRegistry.backend = staticmethod(lambda: "groq")
+    batching.LLM_BATCH_MAX_SIZE, batching.LLM_BATCH_MAX_WAIT_MS = max_size, max_wait_ms
+    batching.LLM_RATE_LIMIT_BACKOFF = 0
+    try:
+        asyncio.run(test(chain))
+    finally:
+        ChainRegistry.get, ChainRegistry.backend = get, backend
+        (
+            batching.LLM_BATCH_MAX_SIZE,
+            batching.LLM_BATCH_MAX_WAIT_MS,
+            batching.LLM_RATE_LIMIT_BACKOFF,
+        ) = settings
+        BatchDispatcher._queues, BatchDispatcher._timers = {}, {}
+
+
+def _submit(*texts):
+    return [
+        asyncio.ensure_future(BatchDispatcher.submit("extract_keywords", {"text": text}))
+        for text in texts
+    ]
+
+
+def test_calls_within_the_window_are_sent_together():
+    """Calls arriving within the batch window go out in one batch after it"""
+
+    async def run(chain):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*_submit("a", "b", "c"))
+
+        assert results == ["A", "B", "C"]
+        assert chain.batches == [3]
+        assert loop.time() - started >= 0.05
+
+    _with_chain(run)
+
+
+def test_full_batches_are_sent_without_waiting():
+    """A batch reaching the maximum size is sent at once, the rest after the window"""
+
+    async def run(chain):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first = _submit("a", "b")
+        await asyncio.gather(*first)
+
+        assert loop.time() - started < 0.2
+        rest = _submit("c")
+        assert await asyncio.gather(*rest) == ["C"]
+        assert chain.batches == [2, 1]
+
+    _with_chain(run, max_size=2, max_wait_ms=300)
+
+
+def test_errors_only_fail_their_own_call():
+    """A failing item raises for its caller, the rest of the batch succeeds"""
+
+    async def run(chain):
+        results = await asyncio.gather(*_submit("a", "bad", "c"), return_exceptions=True)
+
+        assert results[0] == "A" and results[2] == "C"
+        assert isinstance(results[1], LLMServiceError) and "Model refused" in str(results[1])
+
+    _with_chain(run)
+
+
+def test_batches_hold_one_limiter_slot_per_call():
+    """A batch of n calls holds n slots while it runs and returns them after"""
+
+    async def run(chain):
+        await asyncio.gather(*_submit("a", "b", "c"))
+
+        assert chain.in_flight == [3]
+        assert LLMLimiter.in_flight("groq") == 0
+
+    _with_chain(run)
+
+
+def test_throttled_calls_are_retried_alone():
+    """Items the provider throttled are retried one by one"""
+
+    async def run(chain):
+        results = await asyncio.gather(*_submit("a", "busy"))
+
+        assert results == ["A", "BUSY"]
+        assert chain.batches == [2]
+        assert chain.invoked == ["busy"]
+
+    _with_chain(run)
+
+
+if __name__ == "__main__":
+    test_calls_within_the_window_are_sent_together()
+    test_full_batches_are_sent_without_waiting()
+    test_errors_only_fail_their_own_call()
+    test_batches_hold_one_limiter_slot_per_call()
+    test_throttled_calls_are_retried_alone()
@@ -0,0 +1,86 @@
+import asyncio
+
+from app.services.llm import LLMCache
+from app.services.redis import RedisService
+from app.types.responseFormat import JobAnalysis
+
+
+class _FakeRedis:
+    """In-memory stand-in for the namespaced RedisService helpers"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def getKeyWithNamespace(self, namespace, key):
+        return self.values.get(f"{namespace}:{key}")
+
+    async def setKeyWithNamespace(self, namespace, key, value, ex=None):
+        self.values[f"{namespace}:{key}"] = value
+        return True
+
+    async def deleteKeyWithNamespace(self, namespace, key):
+        self.values.pop(f"{namespace}:{key}", None)
+
+
+def _with_fake_redis(test):
+    """Run an async test against a fresh ``_FakeRedis``"""
+    fake = _FakeRedis()
+    names = ("getKeyWithNamespace", "setKeyWithNamespace", "deleteKeyWithNamespace")
+    originals = {name: RedisService.__dict__[name] for name in names}
+    for name in names:
+        setattr(RedisService, name, staticmethod(getattr(fake, name)))
+    try:
+        asyncio.run(test(fake))
+    finally:
+        for name, original in originals.items():
+            setattr(RedisService, name, original)
+
+
+def test_keys_ignore_formatting_and_depend_on_version_and_model():
+    """Formatting-only input differences share a key; template or model changes do not"""
+    inputs = {"text": "Python  developer\n\nwith Go", "job_title": "Engineer"}
+    key = LLMCache.key("enhance_text", "v1", "groq:llama", inputs)
+
+    assert key == LLMCache.key(
+        "enhance_text", "v1", "groq:llama", {"job_title": "Engineer", "text": "Python developer with Go"}
+    )
+    assert key != LLMCache.key("enhance_text", "v2", "groq:llama", inputs)
+    assert key != LLMCache.key("enhance_text", "v1", "ollama:llama", inputs)
+    assert key != LLMCache.key("extract_keywords", "v1", "groq:llama", inputs)
+
+
+def test_outputs_round_trip_as_text_and_models():
+    """Cached text and structured outputs read back as they were stored"""
+    analysis = JobAnalysis(summary="Backend role", requirements=["Python"], key_skills=["Go"])
+
+    async def run(fake):
+        await LLMCache.set("enhance_text", "text-key", "Enhanced resume")
+        await LLMCache.set("analyze_job_description", "model-key", analysis)
+
+        assert await LLMCache.get("enhance_text", "text-key") == (True, "Enhanced resume")
+        assert await LLMCache.get("analyze_job_description", "model-key") == (True, analysis)
+
+    _with_fake_redis(run)
+
+
+def test_corrupt_entries_are_misses_and_dropped():
+    """Entries that no longer decode are recomputed instead of failing the call"""
+    namespace = RedisService.Namespace.LLM_RESPONSE
+
+    async def run(fake):
+        fake.values[f"{namespace}:garbage"] = b"\xff not json"
+        fake.values[f"{namespace}:old"] = b'{"response": {"unexpected": true}}'
+        misses = LLMCache.stats().get("analyze_job_description", {}).get("misses", 0)
+
+        assert await LLMCache.get("analyze_job_description", "garbage") == (False, None)
+        assert await LLMCache.get("analyze_job_description", "old") == (False, None)
+        assert fake.values == {}
+        assert LLMCache.stats()["analyze_job_description"]["misses"] == misses + 2
+
+    _with_fake_redis(run)
+
+
+if __name__ == "__main__":
+    test_keys_ignore_formatting_and_depend_on_version_and_model()
+    test_outputs_round_trip_as_text_and_models()
+    test_corrupt_entries_are_misses_and_dropped()
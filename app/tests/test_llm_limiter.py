@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from app.services.llm.limiter import AdaptiveLimit, TokenBucket, is_rate_limit_error
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+def test_adaptive_limit_halves_on_throttle_and_grows_back():
+    """A throttled call halves the limit, successful calls raise it additively"""
+    limit = AdaptiveLimit(minimum=1, maximum=8)
+
+    async def scenario():
+        await limit.acquire()
+        limit.release(throttled=True)
+        assert int(limit.limit) == 4
+
+        for _ in range(8):
+            await limit.acquire()
+            limit.release(latency=0.1)
+        assert 4 < limit.limit <= 8
+
+    asyncio.run(scenario())
+
+
+def test_adaptive_limit_compares_latency_per_chain():
+    """Long chains mixed with short ones keep the limit, a spike within a chain halves it"""
+    limit = AdaptiveLimit(minimum=1, maximum=64)
+    latencies = {"extract_keywords": 0.3, "enhance_text": 6.0, "structure_resume": 12.0}
+
+    async def scenario():
+        for index in range(600):
+            chain = list(latencies)[index % len(latencies)]
+            await limit.acquire()
+            limit.release(latency=latencies[chain] * (0.8 + 0.05 * (index % 9)), chain=chain)
+        assert limit.limit == 64
+
+        await limit.acquire()
+        limit.release(latency=3.0, chain="extract_keywords")
+        assert int(limit.limit) == 32
+
+    asyncio.run(scenario())
+
+
+def test_adaptive_limit_admits_waiters_in_order():
+    """Callers over the limit wait and are admitted first come, first served"""
+    limit = AdaptiveLimit(minimum=1, maximum=1)
+    order = []
+
+    async def caller(name):
+        await limit.acquire()
+        order.append(name)
+        await asyncio.sleep(0.01)
+        limit.release(latency=0.01)
+
+    async def scenario():
+        await asyncio.gather(*(caller(name) for name in "abcd"))
+
+    asyncio.run(scenario())
+    assert order == list("abcd")
+    assert limit.in_flight == 0
+
+
+def test_token_bucket_waits_for_refill():
+    """Taking more than the bucket holds waits for the refill"""
+    bucket = TokenBucket(per_minute=600)
+
+    async def scenario():
+        await bucket.acquire(600)
+        started = time.monotonic()
+        await bucket.acquire(2)
+        return time.monotonic() - started
+
+    assert 0.15 < asyncio.run(scenario()) < 1
+
+
+def test_rate_limit_errors_are_detected_through_causes():
+    """A 429 wrapped in another error is still recognized"""
+    try:
+        try:
+            raise _RateLimitError("Too many requests")
+        except _RateLimitError as e:
+            raise RuntimeError("LLM call failed") from e
+    except RuntimeError as wrapped:
+        assert is_rate_limit_error(wrapped)
+
+    assert not is_rate_limit_error(ValueError("bad input"))
+
+
+if __name__ == "__main__":
+    test_adaptive_limit_halves_on_throttle_and_grows_back()
+    test_adaptive_limit_compares_latency_per_chain()
+    test_adaptive_limit_admits_waiters_in_order()
+    test_token_bucket_waits_for_refill()
+    test_rate_limit_errors_are_detected_through_causes()
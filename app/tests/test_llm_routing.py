@@ -0,0 +1,108 @@
+import asyncio
+
+from app.services.llm import routing
+from app.services.llm.chains import ChainRegistry
+from app.services.llm.routing import LLMRouter
+from app.utils.errors.exceptions import LLMServiceError
+
+
+class _FakeChain:
+    """Chain answering ``result`` after ``seconds``, or raising ``error``"""
+
+    def __init__(self, result, seconds=0.0, error=None):
+        self.result = result
+        self.seconds = seconds
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _with_backends(primary, secondary, test, hedge_delay=0.1):
+    """Run an async test with hedged routing between two fake chains"""
+    chains = {"groq": primary, "ollama": secondary}
+    get, backends = ChainRegistry.__dict__["get"], ChainRegistry.__dict__["backends"]
+    settings = (routing.LLM_ROUTING, routing.LLM_HEDGE_MAX_DELAY)
+    ChainRegistry.get = classmethod(lambda cls, name, backend=None: chains[backend])
+    ChainRegistry.backends = staticmethod(lambda: ["groq", "ollama"])
+    routing.LLM_ROUTING, routing.LLM_HEDGE_MAX_DELAY = "hedged", hedge_delay
+    LLMRouter._latencies, LLMRouter._hedged = {}, {}
+    try:
+        asyncio.run(test())
+    finally:
+        ChainRegistry.get, ChainRegistry.backends = get, backends
+        routing.LLM_ROUTING, routing.LLM_HEDGE_MAX_DELAY = settings
+        LLMRouter._latencies, LLMRouter._hedged = {}, {}
+
+
+def test_fast_primary_is_not_hedged():
+    """A primary answering within the hedge delay is the only call made"""
+    primary, secondary = _FakeChain("groq"), _FakeChain("ollama")
+
+    async def run():
+        assert await LLMRouter.invoke("extract_keywords", {}) == "groq"
+        assert secondary.calls == 0
+        assert LLMRouter.stats()["groq"]["samples"] == 1
+
+    _with_backends(primary, secondary, run)
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    """The secondary answers for a slow primary, which is cancelled and still recorded"""
+    primary, secondary = _FakeChain("groq", seconds=5), _FakeChain("ollama")
+
+    async def run():
+        assert await LLMRouter.invoke("extract_keywords", {}) == "ollama"
+        await asyncio.sleep(0.01)
+
+        assert primary.cancelled
+        assert LLMRouter.stats()["ollama"]["hedged_wins"] == 1
+        # The cancelled primary ran at least the hedge delay
+        assert LLMRouter.percentile("groq", 0.5) >= 0.1
+
+    _with_backends(primary, secondary, run)
+
+
+def test_failed_primary_falls_back_without_waiting():
+    """A primary error sends the call to the secondary right away"""
+    primary = _FakeChain("groq", error=LLMServiceError("Groq 503"))
+    secondary = _FakeChain("ollama")
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        assert await LLMRouter.invoke("extract_keywords", {}) == "ollama"
+        assert asyncio.get_running_loop().time() - started < 5
+
+    _with_backends(primary, secondary, run, hedge_delay=5)
+
+
+def test_primary_error_is_raised_when_both_fail():
+    """When no backend answers, callers get the primary's error"""
+    primary = _FakeChain("groq", error=LLMServiceError("Groq 503"))
+    secondary = _FakeChain("ollama", error=ValueError("Ollama down"))
+
+    async def run():
+        try:
+            await LLMRouter.invoke("extract_keywords", {})
+            raise AssertionError("No error was raised")
+        except LLMServiceError as e:
+            assert "Groq 503" in str(e)
+
+    _with_backends(primary, secondary, run)
+
+
+if __name__ == "__main__":
+    test_fast_primary_is_not_hedged()
+    test_slow_primary_is_hedged_and_cancelled()
+    test_failed_primary_falls_back_without_waiting()
+    test_primary_error_is_raised_when_both_fail()
@@ -0,0 +1,49 @@
+import time
+
+from app.services.local_cache import LocalCache
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    """The byte budget evicts the least recently used entries first"""
+    cache = LocalCache(max_bytes=30, max_entries=10, ttl=60)
+    cache.set("a", "A", 10)
+    cache.set("b", "B", 10)
+    cache.set("c", "C", 10)
+    cache.get("a")
+    cache.set("d", "D", 10)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "A")
+    assert cache.bytes == 30
+    assert not cache.set("huge", "H", 31)
+
+
+def test_entries_expire_and_respect_the_entry_budget():
+    """Expired entries miss and the entry budget bounds the cache"""
+    cache = LocalCache(max_bytes=1000, max_entries=2, ttl=0.05)
+    cache.set("a", "A", 1)
+    cache.set("b", "B", 1)
+    cache.set("c", "C", 1)
+
+    assert cache.stats()["entries"] == 2
+    time.sleep(0.06)
+    assert cache.get("c") == (False, None)
+
+
+def test_values_read_before_an_invalidation_are_refused():
+    """A value read before a concurrent rewrite is not cached stale"""
+    cache = LocalCache(max_bytes=1000, max_entries=10, ttl=60)
+    cache.set("resume", "old", 3)
+    epoch = cache.epoch
+    cache.invalidate("resume")
+
+    assert cache.get("resume") == (False, None)
+    assert not cache.set("resume", "old", 3, epoch)
+    assert cache.set("resume", "new", 3, cache.epoch)
+    assert cache.get("resume") == (True, "new")
+
+
+if __name__ == "__main__":
+    test_least_recently_used_entries_are_evicted_by_size()
+    test_entries_expire_and_respect_the_entry_budget()
+    test_values_read_before_an_invalidation_are_refused()
@@ -0,0 +1,83 @@
+import asyncio
+
+from app.services.match_scoring import MatchScorer, seniority_level
+from app.services.resume_processor import ResumeProcessor
+
+RESUME = """Jane Doe - Senior Software Engineer
+Skills: Python, FastAPI, PostgreSQL, Redis, Docker, k8s
+8 years building backend APIs. Migrated 40 services to Kubernetes."""
+
+JOBS = [
+    ("Junior iOS Developer", "Build apps with Swift, SwiftUI and Xcode."),
+    (
+        "Senior Backend Engineer",
+        "Build Python APIs with FastAPI, Postgres and Redis on Kubernetes. 5+ years.",
+    ),
+    ("Backend Engineer", "Python services with FastAPI, Django and Kafka."),
+]
+
+
+def test_seniority_level_from_titles_and_years():
+    """Named levels win over years of experience"""
+    assert seniority_level("Senior Backend Engineer") == 3
+    assert seniority_level("Head of Engineering") == 6
+    assert seniority_level("3 years of experience") == 2
+    assert seniority_level("Backend Engineer") is None
+
+
+def test_lead_is_only_a_level_as_a_title():
+    """A "Lead" title counts, "lead" as a verb or in "lead generation" does not"""
+    assert seniority_level("Lead Software Engineer") == 4
+    assert seniority_level("Engineering Lead, Payments") == 4
+    assert seniority_level("Own lead generation campaigns") is None
+    assert seniority_level("You will lead the migration, leading a small team") is None
+
+
+def test_score_many_ranks_fitting_jobs_first():
+    """Jobs sharing the resume's skills and seniority score higher"""
+    matches = MatchScorer(RESUME).score_many(JOBS)
+    scores = [match["score"] for match in matches]
+
+    assert scores[1] > scores[2] > scores[0]
+    assert all(0 <= score <= 1 for score in scores)
+    assert matches[1]["matched_skills"][:2] == ["Python", "FastAPI"]
+    assert matches[1]["missing_skills"] == []
+    assert set(matches[2]["missing_skills"]) == {"Django", "Apache Kafka"}
+    # No seniority cue in the job leaves the component out
+    assert matches[2]["seniority"] is None
+
+
+def test_score_matches_score_many():
+    """Scoring one job gives the same result as scoring it in a batch"""
+    scorer = MatchScorer(RESUME)
+
+    assert scorer.score(*JOBS[1]) == scorer.score_many(JOBS)[1]
+    assert scorer.score_many([]) == []
+
+
+def test_match_jobs_scores_the_cached_resume_text():
+    """Cached text is scored without fetching the resume again"""
+    processor = ResumeProcessor()
+    fetched = []
+
+    async def cached_text(user_id):
+        return RESUME
+
+    async def get_resume_text(user_id, engine=None):
+        fetched.append(user_id)
+        return RESUME
+
+    processor.redis_service.get_resume_raw_text = cached_text
+    processor.get_resume_text = get_resume_text
+    [match] = asyncio.run(processor.match_jobs("user", [JOBS[1]]))
+
+    assert match == MatchScorer(RESUME).score(*JOBS[1])
+    assert fetched == []
+
+
+if __name__ == "__main__":
+    test_seniority_level_from_titles_and_years()
+    test_lead_is_only_a_level_as_a_title()
+    test_score_many_ranks_fitting_jobs_first()
+    test_score_matches_score_many()
+    test_match_jobs_scores_the_cached_resume_text()
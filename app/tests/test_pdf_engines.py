@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from app.benchmarks.pdf_engines import synthetic_pdf
+from app.utils.pdf_engines import TextLayerEngine, available_engines, get_engine
+
+
+_BUILT_IN = ("pypdf2", "pypdf", "pdfminer", "textlayer")
+
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def test_engines_keep_line_breaks():
+    """Every available engine extracts the synthetic PDF line by line"""
+    pdf, text = synthetic_pdf(2)
+    expected = [_lines(page) for page in text.split("\nPage ")]
+
+    # Other tests register their own engines, e.g. ones that never finish
+    for name in (name for name in _BUILT_IN if name in available_engines()):
+        engine = get_engine(name)
+        document = engine.open(pdf)
+        assert engine.page_count(document) == 2, name
+        for page_num in range(2):
+            lines = _lines(engine.extract_page(document, page_num))
+            assert lines[1:] == expected[page_num][1:], name
+            assert lines[0].endswith(f"Page {page_num + 1}"), name
+
+
+def test_text_layer_breaks_on_next_line_operators():
+    """T* ends a line even when followed by whitespace, Td inside a word does not"""
+    stream = b"BT (One) Tj T* (Two) Tj 0 -14 Td (Three) Tj (Tdx) Tj ET"
+    page = SimpleNamespace(get_contents=lambda: SimpleNamespace(get_data=lambda: stream))
+    document = SimpleNamespace(pages=[page])
+
+    text = TextLayerEngine().extract_page(document, 0)
+    assert text.split("\n") == ["One", "Two", "ThreeTdx", ""]
+
+
+if __name__ == "__main__":
+    test_engines_keep_line_breaks()
+    test_text_layer_breaks_on_next_line_operators()
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+
+from app.benchmarks.pdf_engines import synthetic_pdf
+from app.utils.pdf_engines import PyPDF2Engine, register_engine
+from app import PDF_EXTRACT_WORKERS
+from app.utils.pdf_executor import PDFExtractor
+
+
+class _SleepingEngine(PyPDF2Engine):
+    """Engine that takes a while to open a document, like a pathological PDF"""
+
+    def __init__(self, name: str, seconds: float):
+        self.name = name
+        self.seconds = seconds
+
+    def open(self, pdf_bytes: bytes):
+        time.sleep(self.seconds)
+        return super().open(pdf_bytes)
+
+
+# Registered before the pool forks its workers, so they know the engines
+register_engine(_SleepingEngine("stuck", 60))
+register_engine(_SleepingEngine("slow", 1))
+
+
+def test_timed_out_workers_are_killed():
+    """A chunk over its timeout kills its worker and later extractions still work"""
+    pdf, text = synthetic_pdf(1)
+
+    async def run():
+        PDFExtractor.shutdown()
+        executor = PDFExtractor.start()
+        task = asyncio.ensure_future(PDFExtractor.extract(pdf, timeout=0.5, engine="stuck"))
+        await asyncio.sleep(0.2)
+        processes = list(executor._processes.values())
+
+        try:
+            await task
+            raise AssertionError("The stuck extraction did not time out")
+        except asyncio.TimeoutError:
+            pass
+        for process in processes:
+            process.join(5)
+
+        assert processes and not any(process.is_alive() for process in processes)
+        assert PDFExtractor._executor is not executor
+        assert (await PDFExtractor.extract(pdf)).strip() == text
+
+    try:
+        asyncio.run(run())
+    finally:
+        PDFExtractor.shutdown()
+
+
+def test_chunks_on_a_recycled_pool_are_retried():
+    """Extractions running next to a timed out one survive the pool being recycled"""
+    pdf, text = synthetic_pdf(1)
+
+    async def run():
+        PDFExtractor.shutdown()
+        PDFExtractor.start()
+        stuck = asyncio.ensure_future(PDFExtractor.extract(pdf, timeout=0.5, engine="stuck"))
+        slow = asyncio.ensure_future(PDFExtractor.extract(pdf, timeout=5, engine="slow"))
+        results = await asyncio.gather(stuck, slow, return_exceptions=True)
+
+        assert isinstance(results[0], asyncio.TimeoutError)
+        assert results[1].strip() == text
+
+    try:
+        asyncio.run(run())
+    finally:
+        PDFExtractor.shutdown()
+
+
+def test_pages_are_fanned_out_by_path_in_few_chunks():
+    """Chunks after the first read the PDF from one file, at most one chunk per worker"""
+    pdf, text = synthetic_pdf(12)
+    run = PDFExtractor.__dict__["_run"]
+    calls = []
+
+    async def recording(source, pages, *args):
+        calls.append((source, pages))
+        return await run.__func__(PDFExtractor, source, pages, *args)
+
+    async def extract():
+        PDFExtractor.shutdown()
+        return [page async for page in PDFExtractor.iter_pages(pdf)]
+
+    PDFExtractor._run = recording
+    try:
+        pages = asyncio.run(extract())
+    finally:
+        PDFExtractor._run = run
+        PDFExtractor.shutdown()
+
+    assert [page_num for page_num, _ in pages] == list(range(12))
+    assert "".join(page for _, page in pages).strip() == text
+    assert calls[0][0] == pdf
+    paths = {source for source, _ in calls[1:]}
+    assert len(paths) == 1 and isinstance(paths.pop(), str)
+    assert 1 <= len(calls) - 1 <= PDF_EXTRACT_WORKERS
+    assert not os.path.exists(calls[1][0])
+
+
+if __name__ == "__main__":
+    test_timed_out_workers_are_killed()
+    test_chunks_on_a_recycled_pool_are_retried()
+    test_pages_are_fanned_out_by_path_in_few_chunks()
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.utils import pdf_text
+from app.utils.pdf_text import HTTPClient, fetch_pdf
+
+BODY = b"%PDF-1.4\n" + os.urandom(10_000)
+
+
+async def _resume(request):
+    if request.headers.get("If-None-Match") == '"v1"':
+        return web.Response(status=304, headers={"ETag": '"v1"'})
+    return web.Response(body=BODY, headers={"ETag": '"v1"'})
+
+
+async def _streamed(request):
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for start in range(0, len(BODY), 1000):
+        await response.write(BODY[start:start + 1000])
+    await response.write_eof()
+    return response
+
+
+def _with_server(test):
+    """Run an async test against a local server, with a small in-memory spool"""
+    spool = pdf_text.PDF_SPOOL_BYTES
+    pdf_text.PDF_SPOOL_BYTES = 4096
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/resume.pdf", _resume)
+        app.router.add_get("/streamed.pdf", _streamed)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            await test(lambda path: str(server.make_url(path)))
+        finally:
+            await HTTPClient.close()
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        pdf_text.PDF_SPOOL_BYTES = spool
+
+
+def test_large_bodies_are_spooled_to_disk():
+    """Bodies over the spool size are streamed to a temporary file, smaller ones kept in memory"""
+
+    async def run(url):
+        download = await fetch_pdf(url("/streamed.pdf"))
+        try:
+            assert download.path is not None and os.path.exists(download.path)
+            assert download.source() == download.path
+            assert download.sha256 == hashlib.sha256(BODY).hexdigest()
+            assert download.read() == BODY
+        finally:
+            download.close()
+        assert not os.path.exists(download.path)
+
+        pdf_text.PDF_SPOOL_BYTES = len(BODY)
+        in_memory = await fetch_pdf(url("/streamed.pdf"))
+        assert in_memory.path is None and in_memory.source() == BODY
+        in_memory.close()
+
+    _with_server(run)
+
+
+def test_oversized_bodies_are_aborted():
+    """Downloads over the size cap fail, announced or not"""
+
+    async def run(url):
+        assert await fetch_pdf(url("/resume.pdf"), max_bytes=5000) is None
+        assert await fetch_pdf(url("/streamed.pdf"), max_bytes=5000) is None
+
+    _with_server(run)
+
+
+def test_not_modified_and_missing_resumes():
+    """A 304 answer has no body and keeps the validators, a 404 fails"""
+
+    async def run(url):
+        download = await fetch_pdf(url("/resume.pdf"), etag='"v1"')
+        assert download.not_modified and download.file is None
+        assert download.etag == '"v1"'
+
+        assert await fetch_pdf(url("/missing.pdf")) is None
+
+    _with_server(run)
+
+
+if __name__ == "__main__":
+    test_large_bodies_are_spooled_to_disk()
+    test_oversized_bodies_are_aborted()
+    test_not_modified_and_missing_resumes()
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from app.services.pipeline import Pipeline, Stage
+
+
+def _sleep_stage(seconds, value):
+    async def run(ctx):
+        await asyncio.sleep(seconds)
+        return value
+
+    return run
+
+
+def test_independent_stages_run_concurrently():
+    """Stages sharing a dependency should overlap instead of running in sequence"""
+    pipeline = Pipeline(
+        "test",
+        [
+            Stage("first", _sleep_stage(0.1, "text")),
+            Stage("left", _sleep_stage(0.2, "left"), depends_on=("first",)),
+            Stage("right", _sleep_stage(0.2, "right"), depends_on=("first",)),
+        ],
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(pipeline.run())
+    elapsed = time.perf_counter() - started
+
+    assert result.outputs == {"first": "text", "left": "left", "right": "right"}
+    assert elapsed < 0.45
+    assert set(result.timings) == {"first", "left", "right", "total"}
+
+
+def test_stage_receives_inputs_and_dependency_outputs():
+    """A stage context holds the pipeline inputs and its dependencies' outputs"""
+
+    async def upper(ctx):
+        return ctx["text"].upper()
+
+    async def combine(ctx):
+        return f"{ctx['upper']}-{ctx['suffix']}"
+
+    pipeline = Pipeline(
+        "test",
+        [
+            Stage("upper", upper),
+            Stage("combined", combine, depends_on=("upper",)),
+        ],
+    )
+    result = asyncio.run(pipeline.run(text="abc", suffix="x"))
+
+    assert result.outputs["combined"] == "ABC-x"
+
+
+def test_stage_cache_reuses_output():
+    """A stage with a cache TTL runs once for identical contexts"""
+    calls = []
+
+    async def counted(ctx):
+        calls.append(ctx["text"])
+        return len(calls)
+
+    pipeline = Pipeline("test", [Stage("counted", counted, cache_ttl=60)])
+
+    first = asyncio.run(pipeline.run(text="same"))
+    second = asyncio.run(pipeline.run(text="same"))
+    third = asyncio.run(pipeline.run(text="other"))
+
+    assert first.outputs["counted"] == second.outputs["counted"] == 1
+    assert second.cached == ["counted"]
+    assert third.outputs["counted"] == 2
+
+
+def test_cycles_are_rejected():
+    """Pipelines with a dependency cycle cannot be built"""
+    try:
+        Pipeline(
+            "test",
+            [
+                Stage("a", _sleep_stage(0, None), depends_on=("b",)),
+                Stage("b", _sleep_stage(0, None), depends_on=("a",)),
+            ],
+        )
+    except ValueError:
+        return
+    raise AssertionError("cycle was not detected")
+
+
+if __name__ == "__main__":
+    test_independent_stages_run_concurrently()
+    test_stage_receives_inputs_and_dependency_outputs()
+    test_stage_cache_reuses_output()
+    test_cycles_are_rejected()
@@ -0,0 +1,109 @@
+import asyncio
+import os
+
+from app import REDIS_MAX_VALUE_BYTES, REDIS_RESUME_TEXT_TTL
+from app.services.redis import NamespacePolicy, RedisService
+
+
+class _FakeHashes:
+    """In-memory stand-in for the Redis hash commands used by the PDF page cache"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def _hash(self, key):
+        return self.hashes.setdefault(key, {})
+
+    def hget(self, key, field):
+        self.commands.append(lambda: self._hash(key).get(field.encode()))
+
+    def hstrlen(self, key, field):
+        self.commands.append(lambda: len(self._hash(key).get(field.encode(), b"")))
+
+    def hset(self, key, mapping):
+        def run():
+            for field, value in mapping.items():
+                value = value if isinstance(value, bytes) else str(value).encode()
+                self._hash(key)[field.encode()] = value
+
+        self.commands.append(run)
+
+    def hincrby(self, key, field, amount):
+        def run():
+            value = int(self._hash(key).get(field.encode(), 0)) + amount
+            self._hash(key)[field.encode()] = str(value).encode()
+
+        self.commands.append(run)
+
+    def hgetall(self, key):
+        self.commands.append(lambda: dict(self._hash(key)))
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: True)
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [command() for command in commands]
+
+
+def test_cache_namespaces_expire_and_unknown_ones_persist():
+    """Cache namespaces have a TTL; namespaces without a policy keep keys"""
+    policy = RedisService.policy("resume_raw_text")
+
+    assert policy.ttl == (REDIS_RESUME_TEXT_TTL or None)
+    assert policy.sliding
+    assert RedisService.policy(RedisService.Namespace.ENHANCED_RESUME).ttl
+    assert RedisService.policy("unknown").ttl is None
+
+
+def test_values_over_the_namespace_limit_are_dropped():
+    """Values still oversized once compressed are refused before reaching Redis"""
+    value = os.urandom(REDIS_MAX_VALUE_BYTES + 1)
+    stored = asyncio.run(
+        RedisService.setKeyWithNamespace(RedisService.Namespace.PDF_TEXT, "key", value)
+    )
+
+    assert stored is False
+
+
+def test_page_hashes_are_limited_as_a_whole():
+    """Chunks of pages are refused once the hash would exceed the namespace limit"""
+    fake = _FakeHashes()
+    namespace = RedisService.Namespace.PDF_PAGE_TEXT
+    get_client, policy = RedisService.__dict__["get_client"], RedisService.POLICIES[namespace]
+    RedisService.get_client = staticmethod(lambda: fake)
+    RedisService.POLICIES[namespace] = NamespacePolicy(max_bytes=2500)
+    service = RedisService()
+    page = lambda seed: os.urandom(500).hex() + seed
+
+    async def run():
+        await service.store_pdf_pages("key", 4, {0: page("a"), 1: page("b")})
+        # Rewriting stored pages does not count twice
+        await service.store_pdf_pages("key", 4, {1: page("b")})
+        assert sorted((await service.get_pdf_pages("key"))[1]) == [0, 1]
+
+        await service.store_pdf_pages("key", 4, {2: page("c")})
+        count, pages = await service.get_pdf_pages("key")
+        assert count == 4 and sorted(pages) == [0, 1]
+
+    try:
+        asyncio.run(run())
+    finally:
+        RedisService.get_client = get_client
+        RedisService.POLICIES[namespace] = policy
+
+
+if __name__ == "__main__":
+    test_cache_namespaces_expire_and_unknown_ones_persist()
+    test_values_over_the_namespace_limit_are_dropped()
+    test_page_hashes_are_limited_as_a_whole()
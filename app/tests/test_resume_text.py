@@ -0,0 +1,172 @@
+import asyncio
+from io import BytesIO
+
+from app.services import resume_processor
+from app.services.resume_processor import ResumeProcessor
+from app.utils.pdf_engines import extractor_version
+from app.utils.pdf_text import PDFDownload
+
+URL = {"url": "https://cdn.example.com/resume.pdf"}
+
+
+class _FakeStore:
+    """In-memory stand-in for the RedisService methods used by get_resume_text"""
+
+    def __init__(self, max_chars=None):
+        self.sources = {}
+        self.texts = {}
+        self.max_chars = max_chars
+
+    async def get_resume_source(self, user_id):
+        return dict(self.sources[user_id]) if user_id in self.sources else None
+
+    async def store_resume_source(self, user_id, source):
+        self.sources[user_id] = source
+
+    async def get_pdf_text(self, content_key):
+        return self.texts.get(content_key)
+
+    async def store_pdf_text(self, content_key, text):
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return False
+        self.texts[content_key] = text
+        return True
+
+
+def _processor(downloads, url=URL):
+    """Processor fetching ``downloads`` in order and extracting bodies as text"""
+    processor = ResumeProcessor()
+    processor.redis_service = _FakeStore()
+    fetches, extracted = [], []
+
+    async def get_resume_url(user_id):
+        return url
+
+    async def fetch_pdf(pdf_url, etag=None, last_modified=None):
+        fetches.append({"etag": etag, "last_modified": last_modified})
+        return downloads.pop(0)
+
+    async def extract_resume_text(download, content_key, page_cache=None, engine=None):
+        extracted.append(content_key)
+        return download.read().decode()
+
+    processor.get_resume_url = get_resume_url
+    processor.text_editing_service.extract_resume_text = extract_resume_text
+    return processor, fetch_pdf, fetches, extracted
+
+
+def _body(text, sha256, etag):
+    return PDFDownload(BytesIO(text.encode()), sha256, etag=etag)
+
+
+def _not_modified(etag):
+    return PDFDownload(None, None, etag=etag, not_modified=True)
+
+
+def _run(fetch_pdf, coroutine_fn):
+    """Run a coroutine function with ``fetch_pdf`` stubbed"""
+    original = resume_processor.fetch_pdf
+    resume_processor.fetch_pdf = fetch_pdf
+    try:
+        return asyncio.run(coroutine_fn())
+    finally:
+        resume_processor.fetch_pdf = original
+
+
+def test_unchanged_resumes_reuse_the_cached_text():
+    """A 304 answer serves the text of the recorded hash without extracting"""
+    processor, fetch_pdf, fetches, extracted = _processor(
+        [_body("Jane Doe", "a", "e1"), _not_modified("e1")]
+    )
+
+    async def run():
+        assert await processor.get_resume_text("user") == "Jane Doe"
+        assert await processor.get_resume_text("user") == "Jane Doe"
+
+    _run(fetch_pdf, run)
+    assert fetches == [
+        {"etag": None, "last_modified": None},
+        {"etag": "e1", "last_modified": None},
+    ]
+    assert extracted == [f"{extractor_version()}:a"]
+
+
+def test_changed_resumes_are_extracted_again():
+    """A new body is extracted and recorded under its own content key"""
+    processor, fetch_pdf, fetches, extracted = _processor(
+        [_body("Jane Doe", "a", "e1"), _body("Jane Doe, PhD", "b", "e2")]
+    )
+
+    async def run():
+        await processor.get_resume_text("user")
+        return await processor.get_resume_text("user")
+
+    assert _run(fetch_pdf, run) == "Jane Doe, PhD"
+    assert extracted == [f"{extractor_version()}:a", f"{extractor_version()}:b"]
+    assert processor.redis_service.sources["user"]["content_key"] == f"{extractor_version()}:b"
+
+
+def test_evicted_text_is_fetched_again():
+    """A 304 for text that was evicted downloads the body unconditionally"""
+    processor, fetch_pdf, fetches, extracted = _processor(
+        [_body("Jane Doe", "a", "e1"), _not_modified("e1"), _body("Jane Doe", "a", "e1")]
+    )
+
+    async def run():
+        await processor.get_resume_text("user")
+        processor.redis_service.texts.clear()
+        return await processor.get_resume_text("user")
+
+    assert _run(fetch_pdf, run) == "Jane Doe"
+    assert fetches[-1] == {"etag": None, "last_modified": None}
+    assert len(extracted) == 2
+
+
+def test_failed_downloads_fall_back_to_the_cached_text():
+    """Cached text of the same URL is served when the resume cannot be fetched"""
+    processor, fetch_pdf, fetches, extracted = _processor([_body("Jane Doe", "a", "e1"), None])
+
+    async def run():
+        await processor.get_resume_text("user")
+        return await processor.get_resume_text("user")
+
+    assert _run(fetch_pdf, run) == "Jane Doe"
+
+    # Text cached for another URL is never served
+    processor, fetch_pdf, fetches, extracted = _processor([None])
+    processor.redis_service.sources["user"] = {
+        "url": {"url": "https://cdn.example.com/old.pdf"},
+        "sha256": "a",
+        "content_key": "key",
+    }
+    processor.redis_service.texts["key"] = "Old resume"
+    try:
+        _run(fetch_pdf, lambda: processor.get_resume_text("user"))
+        raise AssertionError("The failed download was not raised")
+    except Exception as e:
+        assert "Failed to download PDF" in str(e)
+
+
+def test_text_too_large_to_cache_is_not_recorded():
+    """Text the store refused is neither recorded nor revalidated, only extracted again"""
+    processor, fetch_pdf, fetches, extracted = _processor(
+        [_body("Jane Doe", "a", "e1"), _body("Jane Doe", "a", "e1")]
+    )
+    processor.redis_service.max_chars = 4
+
+    async def run():
+        await processor.get_resume_text("user")
+        return await processor.get_resume_text("user")
+
+    assert _run(fetch_pdf, run) == "Jane Doe"
+    assert fetches == [{"etag": None, "last_modified": None}] * 2
+    assert len(extracted) == 2
+    assert processor.redis_service.sources["user"]["content_key"] is None
+
+
+if __name__ == "__main__":
+    test_unchanged_resumes_reuse_the_cached_text()
+    test_changed_resumes_are_extracted_again()
+    test_evicted_text_is_fetched_again()
+    test_failed_downloads_fall_back_to_the_cached_text()
+    test_text_too_large_to_cache_is_not_recorded()
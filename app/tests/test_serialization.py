@@ -0,0 +1,47 @@
+import json
+
+from app.services.redis import RedisService
+from app.types.responseFormat import Response
+from app.utils.serialization import dumps, loads, loads_record
+
+RESUME = Response(
+    name="Jane Doe",
+    graduation="Bachelor of Technology",
+    experience_level="Advanced",
+    description="Backend engineer",
+    email="jane@example.com",
+    skills=[{"name": "Python", "level": "Advanced"}],
+)
+
+RESULT = {
+    "user_id": "user",
+    "enhanced_text": "Enhanced",
+    "keywords": [{"keyword": "Python", "score": 1.0}],
+    "processed_resume": RESUME,
+    "timings": {"total": 1.5},
+}
+
+
+def test_results_with_models_round_trip():
+    """Nested models are encoded and read back as models on access"""
+    record = loads_record(dumps(RESULT), RedisService.ENHANCED_RESUME_TYPES)
+
+    assert isinstance(record.raw["processed_resume"], dict)
+    assert record["processed_resume"] == RESUME
+    assert record["processed_resume"] is record["processed_resume"]
+    assert record["keywords"] == RESULT["keywords"]
+    assert dict(record) == RESULT
+
+
+def test_legacy_and_text_results_decode():
+    """Records written with json.dumps and text resumes still read"""
+    legacy = json.dumps({"user_id": "user", "processed_resume": "Plain resume"}).encode()
+    record = loads_record(legacy, RedisService.ENHANCED_RESUME_TYPES)
+
+    assert record["processed_resume"] == "Plain resume"
+    assert loads(dumps({"a": [1, "b"]})) == {"a": [1, "b"]}
+
+
+if __name__ == "__main__":
+    test_results_with_models_round_trip()
+    test_legacy_and_text_results_decode()
@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+from app.services import single_flight
+from app.services.redis import RedisService
+from app.services.resume_processor import ResumeProcessor
+from app.services.single_flight import SingleFlight
+from app.types.responseFormat import JobAnalysis
+from app.utils.errors.exceptions import LLMServiceError
+
+
+class _FakeRedis:
+    """In-memory stand-in for the Redis commands used by SingleFlight"""
+
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    def _alive(self, key):
+        if key in self.expiry and self.expiry[key] <= time.monotonic():
+            self.values.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.values
+
+    async def get(self, key):
+        return self.values[key] if self._alive(key) else None
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and self._alive(key):
+            return None
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        self.expiry.pop(key, None)
+        if px or ex:
+            self.expiry[key] = time.monotonic() + (px / 1000 if px else ex)
+        return True
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if not (self._alive(key) and self.values[key] == token.encode()):
+            return 0
+        if "pexpire" in script:
+            self.expiry[key] = time.monotonic() + int(args[0]) / 1000
+        else:
+            del self.values[key]
+            self.expiry.pop(key, None)
+        return 1
+
+
+def _with_fake_redis(test, lock_ttl=30.0):
+    """Run an async test against a fresh ``_FakeRedis`` with fast polling"""
+    fake = _FakeRedis()
+    get_client = RedisService.__dict__["get_client"]
+    settings = (single_flight.SINGLE_FLIGHT_LOCK_TTL, single_flight.SINGLE_FLIGHT_POLL_INTERVAL)
+    RedisService.get_client = staticmethod(lambda: fake)
+    single_flight.SINGLE_FLIGHT_LOCK_TTL = lock_ttl
+    single_flight.SINGLE_FLIGHT_POLL_INTERVAL = 0.01
+    try:
+        asyncio.run(test(fake))
+    finally:
+        RedisService.get_client = get_client
+        single_flight.SINGLE_FLIGHT_LOCK_TTL, single_flight.SINGLE_FLIGHT_POLL_INTERVAL = settings
+
+
+def _counted(result, seconds=0.0, failures=0):
+    """Coroutine function returning ``result`` after failing ``failures`` times"""
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(seconds)
+        if len(calls) <= failures:
+            raise LLMServiceError("Groq 503")
+        return result
+
+    return fn, calls
+
+
+def test_followers_on_other_workers_reuse_the_leader_result():
+    """A second worker waits for the leader and decodes its result into the same type"""
+    analysis = JobAnalysis(summary="Backend role", key_skills=["Python"])
+
+    async def run(fake):
+        fn, calls = _counted(analysis, seconds=0.1)
+        leader = asyncio.ensure_future(SingleFlight._do_across_workers("key", fn))
+        await asyncio.sleep(0.02)
+        follower = await SingleFlight._do_across_workers(
+            "key", fn, decode=JobAnalysis.model_validate
+        )
+
+        assert await leader == analysis
+        assert follower == analysis and isinstance(follower, JobAnalysis)
+        assert len(calls) == 1
+
+    _with_fake_redis(run)
+
+
+def test_failures_are_not_published():
+    """A failed computation raises for its callers and the next call computes again"""
+
+    async def run(fake):
+        fn, calls = _counted("enhanced", failures=1)
+        try:
+            await SingleFlight.do("key", fn)
+            raise AssertionError("The failure was not raised")
+        except LLMServiceError:
+            pass
+
+        assert await SingleFlight.do("key", fn) == "enhanced"
+        assert len(calls) == 2
+
+    _with_fake_redis(run)
+
+
+def test_enhancement_errors_are_not_replayed_to_retries():
+    """A retry after a failed enhancement runs it again instead of reusing the error"""
+    processor = ResumeProcessor()
+    fn, calls = _counted({"user_id": "user", "enhanced_text": "Enhanced"}, failures=1)
+    processor._enhance_resume = lambda *args: fn()
+
+    async def run(fake):
+        failed = await processor.enhance_resume("user", "Engineer", "Python")
+        retried = await processor.enhance_resume("user", "Engineer", "Python")
+
+        assert failed["status"] == "error" and "Groq 503" in failed["error"]
+        assert retried["enhanced_text"] == "Enhanced"
+        assert len(calls) == 2
+
+    _with_fake_redis(run)
+
+
+def test_leaders_renew_their_lock_past_its_ttl():
+    """A leader computing longer than the lock TTL keeps followers waiting"""
+
+    async def run(fake):
+        fn, calls = _counted("enhanced", seconds=0.5)
+        leader = asyncio.ensure_future(SingleFlight._do_across_workers("key", fn))
+        await asyncio.sleep(0.02)
+        follower = await SingleFlight._do_across_workers("key", fn)
+
+        assert await leader == follower == "enhanced"
+        assert len(calls) == 1
+
+    _with_fake_redis(run, lock_ttl=0.15)
+
+
+def test_locks_of_crashed_leaders_expire():
+    """A lock nobody renews expires and a waiting worker takes over"""
+
+    async def run(fake):
+        await fake.set(SingleFlight._lock_key("key"), "crashed", nx=True, px=150)
+        fn, calls = _counted("enhanced")
+        started = time.monotonic()
+
+        assert await SingleFlight._do_across_workers("key", fn) == "enhanced"
+        assert 0.1 < time.monotonic() - started < 1
+        assert len(calls) == 1
+
+    _with_fake_redis(run, lock_ttl=0.15)
+
+
+if __name__ == "__main__":
+    test_followers_on_other_workers_reuse_the_leader_result()
+    test_failures_are_not_published()
+    test_enhancement_errors_are_not_replayed_to_retries()
+    test_leaders_renew_their_lock_past_its_ttl()
+    test_locks_of_crashed_leaders_expire()
@@ -0,0 +1,88 @@
+from app.utils import skills
+from app.utils.skills import Skill, SkillIndex, detected_skills, load_skills, scan_skills
+
+
+def test_aliases_map_to_canonical_names_with_positions():
+    """Every hit carries its canonical name and offsets into the original text"""
+    text = "Deployed on k8s and GCP, wrote Node.JS services"
+    hits = scan_skills(text)
+
+    assert [hit.name for hit in hits] == ["Kubernetes", "Google Cloud", "Node.js"]
+    assert all(text[hit.start:hit.end] == hit.text for hit in hits)
+    assert hits[0].text == "k8s"
+
+
+def test_case_sensitive_names_skip_plain_words():
+    """Names that are also words only match as written"""
+    assert "Go" in detected_skills("Backend services in Go and Rust")
+    assert "Go" not in detected_skills("I go to the gym")
+
+
+def test_overlapping_names_resolve_to_leftmost_longest():
+    """The longest name wins over the shorter names it contains"""
+    index = SkillIndex(
+        [
+            Skill(name=".NET", category="web framework"),
+            Skill(name="ASP.NET", category="web framework"),
+            Skill(name="Machine Learning", category="machine learning", aliases=("ML",)),
+        ]
+    )
+    text = "Built ASP.NET apps and .NET tools with machine\n  learning"
+
+    assert [hit.name for hit in index.scan(text)] == ["ASP.NET", ".NET", "Machine Learning"]
+
+
+def test_names_match_on_word_boundaries_across_line_breaks():
+    """Names never match inside words and multi-word names span line breaks"""
+    index = SkillIndex([Skill(name="Machine Learning", category="", aliases=("ML",))])
+    text = "HTML and XML, some ML and machine\nlearning"
+    hits = index.scan(text)
+
+    assert [hit.text for hit in hits] == ["ML", "machine\nlearning"]
+    assert text[hits[1].start:hits[1].end] == "machine\nlearning"
+
+
+def test_ambiguous_names_need_tech_context():
+    """Names that are also common words only match among skills or tech terms"""
+    assert detected_skills("Marketing intern, Spring 2020") == []
+    assert detected_skills("Graduated with a C grade") == []
+    assert detected_skills("Chef at a restaurant") == []
+
+    assert detected_skills("Skills: Java, Spring, Chef") == ["Java", "Spring", "Chef"]
+    assert "C" in detected_skills("Embedded C developer")
+    assert "Spring" not in detected_skills("Spring 2020: Java internship")
+
+
+def test_native_and_fallback_automatons_match_the_same_skills():
+    """pyahocorasick and the pure Python automaton find identical hits"""
+    if skills.ahocorasick is None:
+        return
+    text = (
+        "Jane Doe - Senior Software Engineer\nSkills: Python, FastAPI, PostgreSQL, Redis, "
+        "k8s, node.js, C++, C#, Go, machine\n learning, ASP.NET and .NET\n"
+        "Spring 2020: Java internship with Spring Boot. Chef at a restaurant. "
+        "Ünïcode lines, Kafka-based pipelines and CI/CD on AWS."
+    ) * 3
+    vocabulary = load_skills()
+    native = SkillIndex(vocabulary)
+    assert not isinstance(native._automaton, skills._Automaton)
+
+    module = skills.ahocorasick
+    skills.ahocorasick = None
+    try:
+        fallback = SkillIndex(vocabulary)
+    finally:
+        skills.ahocorasick = module
+
+    assert isinstance(fallback._automaton, skills._Automaton)
+    assert native.scan(text) == fallback.scan(text)
+    assert len(native.scan(text)) > 20
+
+
+if __name__ == "__main__":
+    test_aliases_map_to_canonical_names_with_positions()
+    test_case_sensitive_names_skip_plain_words()
+    test_overlapping_names_resolve_to_leftmost_longest()
+    test_names_match_on_word_boundaries_across_line_breaks()
+    test_ambiguous_names_need_tech_context()
+    test_native_and_fallback_automatons_match_the_same_skills()
@@ -0,0 +1,121 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.app_v1 import app
+from app.dependencies import authorize, get_resume_processor
+from app.services.llm import LLMCache
+from app.services.resume_processor import ResumeProcessor
+from app.utils.errors.exceptions import LLMServiceError
+
+JOB = {"job_title": "Backend Engineer", "job_description": "Python APIs with FastAPI"}
+KEYWORDS = [
+    {"keyword": "Python", "score": 1.5, "overlap": 1.0, "skill": True, "category": "language"}
+]
+
+
+def _processor(chunks=("Jane ", "Doe, ", "engineer"), structure_error=None):
+    """Processor with every stage stubbed"""
+    processor = ResumeProcessor()
+    editor = processor.text_editing_service
+    stored = []
+
+    async def get_resume_text(user_id):
+        return "Jane Doe"
+
+    async def get_job_brief(job_description):
+        return "Backend role"
+
+    async def stream_enhance_text(text, job_title, job_description):
+        for chunk in chunks:
+            yield chunk
+
+    async def extract_keywords(text, job_description):
+        return KEYWORDS
+
+    async def process_resume(**inputs):
+        if structure_error:
+            raise structure_error
+        return {"name": "Jane Doe"}
+
+    async def store_enhanced_resume(user_id, job_title, result):
+        stored.append(result)
+
+    processor.get_resume_text = get_resume_text
+    processor.get_job_brief = get_job_brief
+    if chunks is not None:
+        editor.stream_enhance_text = stream_enhance_text
+    editor.extract_keywords = extract_keywords
+    editor.process_resume = process_resume
+    processor.redis_service.store_enhanced_resume = store_enhanced_resume
+    return processor, stored
+
+
+def _events(processor):
+    """Stream an enhancement through the router and parse its events"""
+    app.dependency_overrides[authorize] = lambda: "user"
+    app.dependency_overrides[get_resume_processor] = lambda: processor
+    try:
+        response = TestClient(app).post("/resume/process/user/stream", json=JOB)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_events_come_in_order():
+    """Tokens, then the full text, then both stages, then done"""
+    processor, stored = _processor()
+    events = _events(processor)
+    names = [event for event, _ in events]
+
+    assert names[:4] == ["token", "token", "token", "enhanced_text"]
+    assert sorted(names[4:6]) == ["keywords", "processed_resume"]
+    assert names[6:] == ["done"]
+    assert "".join(data["text"] for event, data in events if event == "token") == "Jane Doe, engineer"
+    assert dict(events)["keywords"] == KEYWORDS
+    assert stored[0]["enhanced_text"] == "Jane Doe, engineer"
+
+
+def test_stream_ends_with_an_error_event():
+    """A failing stage ends the stream with an error event and nothing is cached"""
+    processor, stored = _processor(structure_error=LLMServiceError("Groq 503"))
+    events = _events(processor)
+
+    assert events[-1][0] == "error"
+    assert "Groq 503" in events[-1][1]["error"]
+    assert "done" not in [event for event, _ in events]
+    assert stored == []
+
+
+def test_cached_enhancements_stream_as_one_chunk():
+    """A cached enhanced text is sent as a single token event"""
+    processor, stored = _processor(chunks=None)
+    get = LLMCache.__dict__["get"]
+
+    async def cached(cls, chain, key):
+        return True, "Cached enhanced text"
+
+    LLMCache.get = classmethod(cached)
+    try:
+        events = _events(processor)
+    finally:
+        LLMCache.get = get
+
+    assert events[:2] == [
+        ("token", {"text": "Cached enhanced text"}),
+        ("enhanced_text", {"text": "Cached enhanced text"}),
+    ]
+    assert events[-1][0] == "done"
+
+
+if __name__ == "__main__":
+    test_stream_events_come_in_order()
+    test_stream_ends_with_an_error_event()
+    test_cached_enhancements_stream_as_one_chunk()
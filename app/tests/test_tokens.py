@@ -0,0 +1,161 @@
+import logging
+
+from app.services.textEditing import TextEditingService
+from app.utils.tokens import (
+    PAGE_BREAK,
+    compact_text,
+    count_tokens,
+    fit_to_budget,
+    truncate_to_tokens,
+)
+
+
+def test_compact_text_drops_page_boilerplate():
+    """Page markers and headers starting every page are removed"""
+    pages = [
+        f"Jane Doe   -  Resume\nExperience {page}\n\n\n\nPage {page} of 3"
+        for page in range(1, 4)
+    ]
+    compacted = compact_text(PAGE_BREAK.join(pages))
+
+    assert compacted.count("Jane Doe - Resume") == 1
+    assert "Page 2 of 3" not in compacted
+    assert "\n\n\n" not in compacted
+    assert "Experience 3" in compacted
+
+
+def test_compact_text_keeps_resume_content():
+    """Years, phone numbers, grades and repeated role lines are content, not boilerplate"""
+    resume = PAGE_BREAK.join(
+        [
+            "Jane Doe\n5550100123\nBackend Engineer\nAcme\n2019\nPresent\nRemote\n1/2",
+            "Platform Engineer\nGlobex\n2016\nPresent\nRemote\n"
+            "Data Engineer\nInitech\n2015\n2016\nRemote\n2/2",
+            "Education\nB.Sc. Computer Science\nGPA\n4\n06/2015\nRemote\nPresent",
+        ]
+    )
+    lines = compact_text(resume).split("\n")
+
+    for line in ("2019", "2016", "2015", "5550100123", "4", "06/2015"):
+        assert line in lines
+    assert lines.count("Present") == 3
+    assert lines.count("Remote") == 4
+    assert "1/2" not in lines and "2/2" not in lines
+
+
+def test_truncate_to_tokens_respects_budget():
+    """Texts over budget are cut, texts within it are returned unchanged"""
+    text = "\n".join(f"line number {index}" for index in range(500))
+
+    cut = truncate_to_tokens(text, 50)
+    assert count_tokens(cut) <= 50
+    assert text.startswith(cut)
+    assert truncate_to_tokens("short", 50) == "short"
+    assert fit_to_budget(text, 0) == compact_text(text)
+
+
+def _two_page_resume():
+    """A dense two-page resume of about 850 words"""
+    roles = [
+        ("Senior Backend Engineer", "Acme Corp", "2021 - Present"),
+        ("Backend Engineer", "Globex", "2018 - 2021"),
+        ("Software Engineer", "Initech", "2016 - 2018"),
+        ("Software Engineering Intern", "Hooli", "2015"),
+    ]
+    bullets = [
+        "Designed and operated Python APIs with FastAPI serving {n} million requests per day at p99 under 120 ms.",
+        "Led the migration of {n} services from virtual machines to Kubernetes on AWS, cutting hosting costs by 30%.",
+        "Built event-driven pipelines on RabbitMQ and Redis streams processing {n} million messages per day.",
+        "Introduced contract tests and canary releases, reducing production incidents by {n}% over two quarters.",
+        "Mentored {n} engineers through code reviews, design documents and a weekly reliability guild.",
+        "Optimized PostgreSQL queries and indexes, lowering the median report latency from {n} s to 300 ms.",
+        "Owned on-call for {n} critical services and wrote the runbooks, alerts and SLO dashboards for them.",
+        "Partnered with product and data teams to ship {n} features end to end, from design review to rollout.",
+        "Automated infrastructure with Terraform and GitHub Actions, bringing deploys down to {n} minutes.",
+        "Ran load tests and capacity planning ahead of {n} seasonal peaks without a single customer-facing outage.",
+    ]
+    first = [
+        "Jane Doe",
+        "Senior Backend Engineer",
+        "jane.doe@example.com | +1 555 0100 | Berlin, Germany | github.com/janedoe",
+        "Summary",
+        "Backend engineer with eight years of experience designing, building and operating "
+        "distributed systems in Python and Go, with a focus on reliability, observability and "
+        "developer experience across payments, logistics and analytics products.",
+        "Experience",
+    ]
+    for index, (title, company, years) in enumerate(roles[:2]):
+        first.append(f"{title} - {company} - {years}")
+        first.extend(f"- {bullet.format(n=index + 4)}" for bullet in bullets)
+    second = []
+    for index, (title, company, years) in enumerate(roles[2:]):
+        second.append(f"{title} - {company} - {years}")
+        second.extend(f"- {bullet.format(n=index + 2)}" for bullet in bullets)
+    second += [
+        "Projects",
+        "- Resume parser: open source PDF parser extracting structured resumes with 95% field accuracy.",
+        "- Realtime analytics dashboard: WebSocket dashboard over ClickHouse used by 400 operators.",
+        "- Rate limiter library: token bucket limiter for asyncio services with Redis backing.",
+        "Education",
+        "B.Tech Computer Science - Example University - 2016 - GPA 3.8",
+        "Skills",
+        "Python, Go, FastAPI, Django, PostgreSQL, Redis, RabbitMQ, Kafka, Docker, Kubernetes, "
+        "Terraform, AWS, GCP, Prometheus, Grafana, OpenTelemetry, CI/CD, system design",
+        "Certifications",
+        "AWS Certified Solutions Architect - Professional - 2022",
+        "Certified Kubernetes Administrator - 2021",
+        "Languages",
+        "English (fluent), German (professional), Spanish (conversational)",
+    ]
+    return "\n".join(first + ["Page 1 of 2"]) + PAGE_BREAK + "\n".join(second + ["Page 2 of 2"])
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _fit_inputs(name, inputs):
+    """``TextEditingService._fit_inputs`` and the warnings it logged"""
+    handler = _Records()
+    logging.getLogger().addHandler(handler)
+    try:
+        return TextEditingService._fit_inputs(name, inputs), handler.messages
+    finally:
+        logging.getLogger().removeHandler(handler)
+
+
+def test_default_budgets_keep_a_two_page_resume_whole():
+    """A typical two-page resume fits the default text budget without losing content"""
+    resume = _two_page_resume()
+    assert len(resume.split()) > 800
+
+    fitted, warnings = _fit_inputs(
+        "enhance_text",
+        {"text": resume, "job_title": "Backend Engineer", "job_description": "Python APIs"},
+    )
+    assert fitted["text"] == compact_text(resume)
+    assert fitted["text"].endswith("Spanish (conversational)")
+    assert warnings == []
+
+
+def test_truncated_inputs_are_logged():
+    """Inputs cut to their budget log a warning naming the input and chain"""
+    resume = "\n".join([_two_page_resume()] * 4)
+
+    fitted, warnings = _fit_inputs("extract_keywords", {"text": resume, "job_description": "Python"})
+    assert count_tokens(fitted["text"]) < count_tokens(compact_text(resume))
+    assert len(warnings) == 1
+    assert warnings[0].startswith("Truncated text of extract_keywords to 3000 tokens")
+
+
+if __name__ == "__main__":
+    test_compact_text_drops_page_boilerplate()
+    test_compact_text_keeps_resume_content()
+    test_truncate_to_tokens_respects_budget()
+    test_default_budgets_keep_a_two_page_resume_whole()
+    test_truncated_inputs_are_logged()
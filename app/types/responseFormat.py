@@ -55,6 +55,16 @@ class Response(BaseModel):
     languages: Optional[List[str]] = Field(None, description="Languages known")
     interests: Optional[List[str]] = Field(None, description="Personal or professional interests")
 
+class CombinedResponse(BaseModel):
+    enhanced_text: str = Field(..., description="Enhanced, ATS-friendly resume text")
+    keywords: List[str] = Field(default_factory=list, description="Keywords of the resume matching the job description")
+    resume: Response = Field(..., description="Structured resume")
+
+class JobAnalysis(BaseModel):
+    summary: str = Field(..., description="Role, seniority, location and main responsibilities of the job")
+    requirements: List[str] = Field(default_factory=list, description="Required and preferred qualifications as short phrases")
+    key_skills: List[str] = Field(default_factory=list, description="Skills, tools and certifications the job asks for")
+
 class ApiResponse(BaseModel):
     status: str = Field(..., description="Status of the response, e.g., success or error")
     message: str = Field(..., description="A human-readable message describing the result")
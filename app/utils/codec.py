@@ -0,0 +1,92 @@
+import logging
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from app import REDIS_COMPRESSION, REDIS_COMPRESSION_MIN_BYTES
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4 = None
+
+MAGIC = b"\x00\xc5"
+"""Prefix of compressed values; stored text and JSON never start with NUL."""
+
+_FORMATS = {"zlib": 1, "zstd": 2, "lz4": 3}
+"""Format byte following the magic prefix, by codec name."""
+
+
+def _codecs() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    """Compress and decompress functions of the installed codecs"""
+    codecs = {"zlib": (zlib.compress, zlib.decompress)}
+    if zstandard is not None:
+        codecs["zstd"] = (
+            zstandard.ZstdCompressor().compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    if lz4 is not None:
+        codecs["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+    return codecs
+
+
+_CODECS = _codecs()
+_NAMES = {format_id: name for name, format_id in _FORMATS.items()}
+
+
+@lru_cache(maxsize=None)
+def _resolve(name: str) -> str:
+    """Codec to write with, zlib when the configured one is not installed"""
+    if name == "none" or name in _CODECS:
+        return name
+    logging.warning(f"{name} is not installed, compressing cached values with zlib")
+    return "zlib"
+
+
+def encode(
+    value: Any,
+    codec: str = REDIS_COMPRESSION,
+    min_bytes: int = REDIS_COMPRESSION_MIN_BYTES,
+) -> bytes:
+    """
+    Encode a value for storage, compressing it when large enough
+
+    Values under ``min_bytes``, with compression disabled, or that do not
+    shrink are stored as they are, so they read the same as values written
+    before compression existed.
+
+    Args:
+        value: Bytes, or a value stored as its text
+        codec: ``zlib``, ``zstd``, ``lz4`` or ``none``
+        min_bytes: Smallest value that is compressed
+    """
+    data = bytes(value) if isinstance(value, (bytes, bytearray)) else str(value).encode("utf-8")
+    codec = _resolve(codec)
+    if codec == "none" or len(data) < min_bytes:
+        return data
+
+    compressed = _CODECS[codec][0](data)
+    if len(compressed) + len(MAGIC) + 1 >= len(data):
+        return data
+    return MAGIC + bytes([_FORMATS[codec]]) + compressed
+
+
+def decode(raw: bytes) -> bytes:
+    """
+    Decode a stored value, compressed or not
+
+    Raises:
+        ValueError: The value was compressed with a codec that is not installed
+    """
+    if not raw.startswith(MAGIC):
+        return raw
+
+    name = _NAMES.get(raw[len(MAGIC)])
+    if name not in _CODECS:
+        raise ValueError(f"Cached value compressed with unavailable codec {name or raw[len(MAGIC)]}")
+    return _CODECS[name][1](raw[len(MAGIC) + 1:])
@@ -0,0 +1,211 @@
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app import KEYWORD_LIMIT
+from app.utils.skills import SkillIndex, scan_skills
+
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#./-]*[A-Za-z0-9+#]|[A-Za-z0-9]")
+_SEGMENT_TEXT = re.compile(r"[^\n;•▪●]+?(?:[.!?](?=\s)|(?=[\n;•▪●])|$)")
+_LIST_MARKER = re.compile(r"^(?:[-*•▪●]|\d{1,2}[.)])\s*")
+
+_STOPWORDS = frozenset(
+    """
+    a about above after all also am an and any are as at be been being both but by can
+    could did do does doing for from further had has have having he her here hers him his
+    how i if in into is it its itself just me more most my no nor not of off on once only
+    or other our ours out over own same she should so some such than that the their them
+    then there these they this those through to too under until up very was we were what
+    when where which while who whom why will with would you your yours etc e.g i.e per via
+    ability able across apply candidate candidates company day excellent experience
+    familiarity good great including join knowledge looking must new plus preferred
+    required requirements responsibilities role strong team understanding using well work
+    working year years within want help make get us
+    """.split()
+)
+
+K1 = 1.2
+"""BM25 term frequency saturation."""
+B = 0.75
+"""BM25 segment length normalization."""
+SKILL_BOOST = 1.5
+"""Weight of skills from the vocabulary over plain terms of the job description."""
+RESUME_WEIGHT = 0.25
+"""Weight of a term's prominence in the resume in its score."""
+KEYWORD_MAX_WORDS = 5
+"""Longest item of a model's keyword list kept; longer items are prose."""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word tokens, keeping names like C++, C#, Node.js and CI/CD"""
+    return _TOKEN.findall(text)
+
+
+def _add_ngrams(terms: Counter, text: str) -> None:
+    """Count the plain unigrams and bigrams of a text"""
+    words = [
+        word if word not in _STOPWORDS and len(word) > 1 and not word.isdigit() else None
+        for word in (token.lower() for token in tokenize(text))
+    ]
+    for index, word in enumerate(words):
+        if word is None:
+            continue
+        terms[word] += 1
+        if index + 1 < len(words) and words[index + 1] is not None:
+            terms[f"{word} {words[index + 1]}"] += 1
+
+
+def _segment_terms(text: str) -> List[Counter]:
+    """Skills and plain unigrams/bigrams of every line or sentence of a text"""
+    hits = scan_skills(text)
+    segments = []
+    next_hit = 0
+    for match in _SEGMENT_TEXT.finditer(text):
+        start, end = match.span()
+        terms: Counter = Counter()
+        position = start
+        # Plain n-grams are counted between skills, so they never span one
+        while next_hit < len(hits) and hits[next_hit].start < end:
+            hit = hits[next_hit]
+            if hit.start >= start:
+                _add_ngrams(terms, text[position:hit.start])
+                terms[hit.name] += 1
+                position = max(position, hit.end)
+            next_hit += 1
+        _add_ngrams(terms, text[position:end])
+        if terms:
+            segments.append(terms)
+    return segments
+
+
+def term_counts(text: str) -> Counter:
+    """Counts of the skills and plain unigrams/bigrams of a text"""
+    return sum(_segment_terms(text), Counter())
+
+
+def rank_keywords(
+    resume_text: str, job_description: str, limit: Optional[int] = KEYWORD_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Rank the keywords of a resume that matter for a job description
+
+    Lines and sentences of both texts are scored with BM25. A keyword is kept
+    when it appears in the resume and either in the job description or in
+    the skill vocabulary, and is ranked by its weight in the job description
+    plus a smaller weight for its prominence in the resume.
+
+    Args:
+        resume_text: Text of the resume
+        job_description: Text of the job description
+        limit: Maximum number of keywords, None for all
+
+    Returns:
+        Keywords from most to least relevant, each with its ``score``, its
+        ``overlap`` (1.0 when equally prominent in both texts), whether it
+        is a vocabulary ``skill`` and its ``category``
+    """
+    job_segments = _segment_terms(job_description)
+    resume_segments = _segment_terms(resume_text)
+    segments = job_segments + resume_segments
+    if not job_segments or not resume_segments:
+        return []
+
+    skills = {skill.name: skill for skill in SkillIndex.get().skills}
+    job_terms = set().union(*job_segments)
+    resume_terms = set().union(*resume_segments)
+    # Plain terms only count when shared; skills of the resume always count
+    vocabulary = sorted(
+        term for term in resume_terms if term in job_terms or term in skills
+    )
+    if not vocabulary:
+        return []
+    index = {term: row for row, term in enumerate(vocabulary)}
+
+    counts = np.zeros((len(vocabulary), len(segments)))
+    for column, terms in enumerate(segments):
+        for term, count in terms.items():
+            row = index.get(term)
+            if row is not None:
+                counts[row, column] = count
+
+    lengths = np.array([sum(terms.values()) for terms in segments], dtype=float)
+    frequency = (counts > 0).sum(axis=1)
+    idf = np.log((len(segments) - frequency + 0.5) / (frequency + 0.5) + 1)
+    saturation = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+    weights = counts * (K1 + 1) / (counts + saturation) * idf[:, None]
+
+    is_job = np.arange(len(segments)) < len(job_segments)
+    job_weight = weights[:, is_job].sum(axis=1)
+    resume_weight = weights[:, ~is_job].sum(axis=1)
+    job_weight /= job_weight.max() or 1.0
+    resume_weight /= resume_weight.max() or 1.0
+
+    is_skill = np.array([term in skills for term in vocabulary])
+    scores = job_weight * np.where(is_skill, SKILL_BOOST, 1.0) + RESUME_WEIGHT * resume_weight
+    overlap = np.divide(
+        np.minimum(job_weight, resume_weight),
+        np.maximum(job_weight, resume_weight),
+        out=np.zeros_like(job_weight),
+        where=np.maximum(job_weight, resume_weight) > 0,
+    )
+
+    order = sorted(range(len(vocabulary)), key=lambda row: (-scores[row], vocabulary[row]))
+    return [
+        {
+            "keyword": vocabulary[row],
+            "score": round(float(scores[row]), 4),
+            "overlap": round(float(overlap[row]), 4),
+            "skill": bool(is_skill[row]),
+            "category": skills[vocabulary[row]].category if is_skill[row] else None,
+        }
+        for row in order[:limit]
+    ]
+
+
+def keyword_records(names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Keywords listed by a model, in the shape of ``rank_keywords``
+
+    The model gives no scores, so ``score`` and ``overlap`` are None; vocabulary
+    skills are recognized by name or alias.
+    """
+    index = SkillIndex.get()
+    records = []
+    for name in names:
+        skill = index.find(name)
+        records.append(
+            {
+                "keyword": skill.name if skill else name,
+                "score": None,
+                "overlap": None,
+                "skill": skill is not None,
+                "category": skill.category if skill else None,
+            }
+        )
+    return records
+
+
+def parse_keyword_list(text: str, limit: Optional[int] = KEYWORD_LIMIT) -> List[str]:
+    """
+    Keywords of a model's list answer, in order and without duplicates
+
+    Items may be comma-separated or on bulleted or numbered lines. Headings
+    such as "Technical skills:" and sentences around the list are dropped.
+
+    Args:
+        text: Answer of the model
+        limit: Maximum number of keywords, None for all
+    """
+    keywords: Dict[str, str] = {}
+    for line in text.splitlines():
+        line = _LIST_MARKER.sub("", line.strip()).strip("*_#` ")
+        if not line or line.endswith(":"):
+            continue
+        _, _, line = line.rpartition(":")
+        for item in line.split(","):
+            item = item.strip("*_`\"'. ")
+            if item and len(item.split()) <= KEYWORD_MAX_WORDS:
+                keywords.setdefault(item.lower(), item)
+    return list(keywords.values())[:limit]
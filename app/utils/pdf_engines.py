@@ -0,0 +1,194 @@
+import re
+from importlib import import_module
+from importlib.util import find_spec
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+from app import PDF_ENGINE
+
+
+class PDFEngine:
+    """
+    Base class for PDF text extraction backends
+
+    Engines are registered by name and looked up inside the extraction worker
+    processes, so they must be importable and stateless.
+    """
+
+    name: str = ""
+    """Registry name of the engine."""
+    module: str = ""
+    """Module the engine depends on, used for availability and versioning."""
+    revision: int = 1
+    """Bump when the engine's own extraction logic changes."""
+
+    def available(self) -> bool:
+        """Whether the backing library is installed"""
+        return find_spec(self.module) is not None
+
+    @property
+    def version(self) -> str:
+        """Engine name, revision and library version, used in cache keys"""
+        library = import_module(self.module)
+        library_version = getattr(library, "__version__", "unknown")
+        return f"{self.name}-{self.revision}-{library_version}"
+
+    def open(self, pdf_bytes: bytes) -> Any:
+        """Parse a PDF and return a document handle"""
+        raise NotImplementedError
+
+    def page_count(self, document: Any) -> int:
+        """Number of pages in an opened document"""
+        raise NotImplementedError
+
+    def extract_page(self, document: Any, page_num: int) -> str:
+        """Text of a zero-based page of an opened document"""
+        raise NotImplementedError
+
+
+class PyPDF2Engine(PDFEngine):
+    """Layout-aware extraction with PyPDF2 (the historical default)"""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, pdf_bytes: bytes) -> Any:
+        from PyPDF2 import PdfReader
+
+        return PdfReader(BytesIO(pdf_bytes))
+
+    def page_count(self, document: Any) -> int:
+        return len(document.pages)
+
+    def extract_page(self, document: Any, page_num: int) -> str:
+        return document.pages[page_num].extract_text() or ""
+
+
+class PyPDFEngine(PyPDF2Engine):
+    """Extraction with pypdf, the maintained successor of PyPDF2"""
+
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, pdf_bytes: bytes) -> Any:
+        from pypdf import PdfReader
+
+        return PdfReader(BytesIO(pdf_bytes))
+
+
+class PdfMinerEngine(PDFEngine):
+    """Extraction with pdfminer.six, slow but robust on complex layouts"""
+
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def open(self, pdf_bytes: bytes) -> Any:
+        from pdfminer.pdfpage import PDFPage
+
+        pages = list(PDFPage.get_pages(BytesIO(pdf_bytes)))
+        return pdf_bytes, len(pages)
+
+    def page_count(self, document: Any) -> int:
+        return document[1]
+
+    def extract_page(self, document: Any, page_num: int) -> str:
+        from pdfminer.high_level import extract_text
+
+        return extract_text(BytesIO(document[0]), page_numbers=[page_num])
+
+
+class TextLayerEngine(PyPDF2Engine):
+    """
+    Fast path that reads text-showing operators straight from the content
+    streams, without layout analysis or font decoding
+
+    Works well for simple single-byte encoded resumes exported from word
+    processors, and poorly for CID fonts and scanned documents.
+    """
+
+    name = "textlayer"
+    revision = 2
+
+    _TOKENS = re.compile(
+        rb"\((?P<string>(?:\\.|[^\\)])*)\)\s*(?P<show>Tj|'|\")"
+        rb"|\[(?P<array>(?:\((?:\\.|[^\\)])*\)|[^\]])*)\]\s*TJ"
+        rb"|(?P<break>T\*|\b(?:Td|TD|ET)\b)"
+    )
+    _ARRAY_STRINGS = re.compile(rb"\((?P<string>(?:\\.|[^\\)])*)\)")
+    _ESCAPES = re.compile(rb"\\([0-7]{1,3}|.)", re.S)
+    _ESCAPE_MAP = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+    @classmethod
+    def _unescape(cls, value: bytes) -> bytes:
+        def replace(match):
+            escaped = match.group(1)
+            if escaped[:1].isdigit():
+                return bytes([int(escaped, 8) & 0xFF])
+            return cls._ESCAPE_MAP.get(escaped, escaped)
+
+        return cls._ESCAPES.sub(replace, value)
+
+    def extract_page(self, document: Any, page_num: int) -> str:
+        contents = document.pages[page_num].get_contents()
+        if contents is None:
+            return ""
+
+        parts: List[bytes] = []
+        for match in self._TOKENS.finditer(contents.get_data()):
+            if match.group("break"):
+                if parts and not parts[-1].endswith(b"\n"):
+                    parts.append(b"\n")
+            elif match.group("array") is not None:
+                parts.extend(
+                    self._unescape(string)
+                    for string in self._ARRAY_STRINGS.findall(match.group("array"))
+                )
+            else:
+                if match.group("show") != b"Tj":
+                    parts.append(b"\n")
+                parts.append(self._unescape(match.group("string")))
+
+        return b"".join(parts).decode("latin-1")
+
+
+ENGINES: Dict[str, PDFEngine] = {}
+"""Registered extraction engines by name."""
+
+
+def register_engine(engine: PDFEngine) -> PDFEngine:
+    """Register an extraction engine under its name"""
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: Optional[str] = None) -> PDFEngine:
+    """
+    Look up an extraction engine
+
+    Args:
+        name: Registered engine name, defaults to the ``PDF_ENGINE`` setting
+
+    Raises:
+        ValueError: If the engine is unknown or its library is not installed
+    """
+    name = name or PDF_ENGINE
+    engine = ENGINES.get(name)
+    if engine is None:
+        raise ValueError(f"Unknown PDF engine {name!r}, choose from {sorted(ENGINES)}")
+    if not engine.available():
+        raise ValueError(f"PDF engine {name!r} requires the {engine.module!r} package")
+    return engine
+
+
+def available_engines() -> List[str]:
+    """Names of the registered engines whose libraries are installed"""
+    return [name for name, engine in ENGINES.items() if engine.available()]
+
+
+def extractor_version(name: Optional[str] = None) -> str:
+    """Cache version of an engine; changes when the engine or library changes"""
+    return get_engine(name).version
+
+
+for _engine in (PyPDF2Engine(), PyPDFEngine(), PdfMinerEngine(), TextLayerEngine()):
+    register_engine(_engine)
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from tempfile import NamedTemporaryFile
+from typing import AsyncIterator, Dict, List, Optional, Protocol, Tuple, Union
+
+from app import (
+    PDF_EXTRACT_TIMEOUT,
+    PDF_EXTRACT_WORKERS,
+    PDF_MAX_PAGES,
+    PDF_PAGES_PER_TASK,
+)
+from app.utils.pdf_engines import get_engine
+from app.utils.tokens import PAGE_BREAK
+
+
+def _extract_pages(
+    pdf: Union[bytes, str], pages: List[int], max_pages: int, engine_name: str
+) -> Tuple[int, Dict[int, str]]:
+    """
+    Extract the text of some pages of a PDF. Runs inside a worker process.
+
+    ``pdf`` is the content of the PDF, or the path of a file holding it.
+    Returns the page count of the document and the text of every requested
+    page that exists.
+    """
+    if isinstance(pdf, str):
+        with open(pdf, "rb") as pdf_file:
+            pdf = pdf_file.read()
+    engine = get_engine(engine_name)
+    document = engine.open(pdf)
+    page_count = engine.page_count(document)
+    if page_count > max_pages:
+        raise ValueError(f"PDF has {page_count} pages, limit is {max_pages}")
+
+    return page_count, {
+        page_num: engine.extract_page(document, page_num)
+        for page_num in pages
+        if page_num < page_count
+    }
+
+
+class PageCache(Protocol):
+    """Storage for per-page extraction results"""
+
+    async def get_pdf_pages(
+        self, content_key: str
+    ) -> Tuple[Optional[int], Dict[int, str]]: ...
+
+    async def store_pdf_pages(
+        self, content_key: str, page_count: int, pages: Dict[int, str]
+    ) -> None: ...
+
+
+class PDFExtractor:
+    """Process pool that keeps PDF parsing off the event loop"""
+
+    _executor: Union[ProcessPoolExecutor, None] = None
+    _slots: Union[asyncio.Semaphore, None] = None
+
+    @classmethod
+    def start(cls) -> ProcessPoolExecutor:
+        """Start the extraction process pool"""
+        if cls._executor:
+            return cls._executor
+
+        cls._executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+        # Bound queued work so a burst of uploads cannot pile up unbounded
+        # PDF payloads waiting for a worker.
+        cls._slots = asyncio.Semaphore(PDF_EXTRACT_WORKERS * 2)
+        logging.info(f"Started PDF extraction pool with {PDF_EXTRACT_WORKERS} workers")
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """Shut down the extraction process pool"""
+        if cls._executor:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            cls._slots = None
+            logging.info("Stopped PDF extraction pool")
+
+    @classmethod
+    def _recycle(cls, executor: ProcessPoolExecutor):
+        """
+        Replace a pool with a stuck worker and kill its processes
+
+        A worker cannot be interrupted in the middle of a task, so the whole
+        pool is replaced; the other chunks it was running are retried on the
+        new pool by ``_run``.
+        """
+        if cls._executor is executor:
+            cls._executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+            logging.warning("Recycled the PDF extraction pool after a timeout")
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    @classmethod
+    async def _run(
+        cls,
+        pdf: Union[bytes, str],
+        pages: List[int],
+        max_pages: int,
+        timeout: float,
+        engine_name: str,
+    ) -> Tuple[int, Dict[int, str]]:
+        """Extract a chunk of pages in the process pool"""
+        cls.start()
+        loop = asyncio.get_running_loop()
+        async with cls._slots:
+            for attempt in range(2):
+                executor = cls._executor
+                try:
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(
+                            executor, _extract_pages, pdf, pages, max_pages, engine_name
+                        ),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    # Abandoning the future leaves the worker parsing, holding
+                    # a process the slots no longer account for
+                    cls._recycle(executor)
+                    raise
+                except BrokenProcessPool:
+                    # Another chunk timed out and recycled the pool under this one
+                    if attempt or cls._executor is executor:
+                        raise
+
+    @classmethod
+    async def iter_pages(
+        cls,
+        pdf: Union[bytes, str],
+        content_key: Optional[str] = None,
+        page_cache: Optional[PageCache] = None,
+        max_pages: int = PDF_MAX_PAGES,
+        timeout: float = PDF_EXTRACT_TIMEOUT,
+        engine: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Extract the pages of a PDF in parallel, yielding them in order
+
+        The first ``PDF_PAGES_PER_TASK`` pages are extracted together with the
+        page count; the remaining pages are fanned out across the pool in at
+        most one chunk per worker, since every chunk parses the whole
+        document. Chunks read the PDF from a file, so its content is sent to
+        the pool once. Each page is yielded as soon as it and all pages before
+        it are ready, so consumers can start on page 1 while later pages are
+        parsed.
+
+        Args:
+            pdf: The raw PDF content, or the path of a file holding it
+            content_key: Key of the PDF content, enables ``page_cache``
+            page_cache: Cache consulted for and updated with page text
+            max_pages: Reject documents with more pages than this
+            timeout: Seconds to wait for each chunk before giving up
+            engine: Extraction engine name, defaults to the ``PDF_ENGINE``
+                setting. ``content_key`` must be derived from the same engine.
+
+        Yields:
+            Tuples of zero-based page number and page text
+
+        Raises:
+            asyncio.TimeoutError: If a chunk takes longer than ``timeout``.
+                The pool is recycled to stop the worker parsing it.
+            ValueError: If the PDF has more than ``max_pages`` pages or the
+                engine is not available
+        """
+        engine_name = get_engine(engine).name
+        if not (page_cache and content_key):
+            page_cache = None
+
+        page_count, pages = None, {}
+        if page_cache:
+            page_count, pages = await page_cache.get_pdf_pages(content_key)
+
+        if page_count is None:
+            page_count, pages = await cls._run(
+                pdf,
+                list(range(PDF_PAGES_PER_TASK)),
+                max_pages,
+                timeout,
+                engine_name,
+            )
+            if page_cache:
+                await page_cache.store_pdf_pages(content_key, page_count, pages)
+
+        missing = [page_num for page_num in range(page_count) if page_num not in pages]
+        size = max(PDF_PAGES_PER_TASK, math.ceil(len(missing) / PDF_EXTRACT_WORKERS))
+        chunks = [missing[i : i + size] for i in range(0, len(missing), size)]
+
+        pdf_file = None
+        if chunks and not isinstance(pdf, str):
+            pdf_file = NamedTemporaryFile(prefix="resume-", suffix=".pdf")
+            pdf_file.write(pdf)
+            pdf_file.flush()
+            pdf = pdf_file.name
+
+        tasks = {}
+        for chunk in chunks:
+            task = asyncio.ensure_future(
+                cls._run(pdf, chunk, max_pages, timeout, engine_name)
+            )
+            tasks.update(dict.fromkeys(chunk, task))
+
+        try:
+            for page_num in range(page_count):
+                if page_num not in pages:
+                    _, chunk_pages = await tasks[page_num]
+                    pages.update(chunk_pages)
+                    if page_cache:
+                        await page_cache.store_pdf_pages(
+                            content_key, page_count, chunk_pages
+                        )
+                yield page_num, pages[page_num]
+        finally:
+            for task in set(tasks.values()):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark failures of chunks nobody awaited as retrieved
+                    task.exception()
+            if pdf_file:
+                pdf_file.close()
+
+    @classmethod
+    async def extract(
+        cls,
+        pdf: Union[bytes, str],
+        content_key: Optional[str] = None,
+        page_cache: Optional[PageCache] = None,
+        max_pages: int = PDF_MAX_PAGES,
+        timeout: float = PDF_EXTRACT_TIMEOUT,
+        engine: Optional[str] = None,
+    ) -> str:
+        """
+        Extract the text of a PDF in the process pool
+
+        See ``iter_pages`` for the arguments and raised errors.
+
+        Returns:
+            The extracted text of all pages, separated by ``PAGE_BREAK``
+        """
+        return PAGE_BREAK.join(
+            [
+                text
+                async for _, text in cls.iter_pages(
+                    pdf, content_key, page_cache, max_pages, timeout, engine
+                )
+            ]
+        )
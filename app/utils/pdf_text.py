@@ -1,42 +1,173 @@
+import asyncio
+import hashlib
 import logging
+from dataclasses import dataclass
 from io import BytesIO
+from tempfile import NamedTemporaryFile
+from typing import IO, Optional, Union
 
 import aiohttp
-from PyPDF2 import PdfReader
 
+from app import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_TIMEOUT,
+    PDF_CHUNK_BYTES,
+    PDF_MAX_BYTES,
+    PDF_SPOOL_BYTES,
+)
 
-async def fetch_pdf(pdf_url):
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(pdf_url) as response:
-                response.raise_for_status()
-                pdf_content = await response.read()
 
-        return pdf_content
-    except aiohttp.ClientError as e:
-        logging.error(f"Error downloading the PDF: {e}")
-        return
+class PDFTooLargeError(Exception):
+    """Raised when a PDF exceeds the configured download size."""
 
 
-async def fetch_pdf_text(pdf_url):
-    logging.info(f"Fetching PDF text from: {pdf_url}")
-    try:
-        pdf_content = await fetch_pdf(pdf_url)
-        if isinstance(pdf_content, str):
-            return pdf_content
+class HTTPClient:
+    """Process-wide pooled HTTP client used to download resumes"""
+
+    _session: Union[aiohttp.ClientSession, None] = None
+
+    @classmethod
+    async def connect(cls) -> aiohttp.ClientSession:
+        """Create the shared client session"""
+        if cls._session and not cls._session.closed:
+            return cls._session
+
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        cls._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+        logging.info("Created shared HTTP client session")
+        return cls._session
+
+    @classmethod
+    async def close(cls):
+        """Close the shared client session"""
+        if cls._session:
+            await cls._session.close()
+            cls._session = None
+            logging.info("Closed shared HTTP client session")
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared client session, creating it on first use"""
+        if cls._session is None or cls._session.closed:
+            return await cls.connect()
+        return cls._session
+
+
+def _roll_over(buffer: BytesIO) -> IO[bytes]:
+    """Move a body outgrowing the in-memory spool to a named temporary file"""
+    pdf_file = NamedTemporaryFile(prefix="resume-", suffix=".pdf")
+    pdf_file.write(buffer.getbuffer())
+    return pdf_file
+
+
+@dataclass
+class PDFDownload:
+    """Result of a (conditional) PDF download"""
 
-        if not pdf_content:
-            return
+    file: Optional[IO[bytes]]
+    """PDF body positioned at offset 0, None when not modified. Held in memory
+    up to ``PDF_SPOOL_BYTES``, in a named temporary file beyond."""
+    sha256: Optional[str]
+    """Hex SHA-256 of the body, None when not modified."""
+    etag: Optional[str] = None
+    """ETag validator returned by the server."""
+    last_modified: Optional[str] = None
+    """Last-Modified validator returned by the server."""
+    not_modified: bool = False
+    """True when the server answered 304 to the conditional request."""
 
-        pdf_file = BytesIO(pdf_content)
-        reader = PdfReader(pdf_file)
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the body on disk, None while it is held in memory"""
+        name = getattr(self.file, "name", None)
+        return name if isinstance(name, str) else None
 
-        text = ""
-        for page_num in range(len(reader.pages)):
-            page = reader.pages[page_num]
-            text += page.extract_text()
+    def read(self) -> bytes:
+        """Read the full PDF body"""
+        return self.file.read() if self.file else b""
 
-        return text
-    except Exception as e:
-        logging.error(f"Error processing the PDF: {e}")
+    def source(self) -> Union[bytes, str]:
+        """
+        Body to hand to the extraction workers
+
+        Bodies spooled to disk are passed by path and read by the worker, so
+        a large PDF is never loaded into this process; only bodies under
+        ``PDF_SPOOL_BYTES`` are passed as bytes.
+        """
+        return self.path or self.read()
+
+    def close(self):
+        """Release the spooled body"""
+        if self.file:
+            self.file.close()
+
+
+async def fetch_pdf(
+    pdf_url,
+    max_bytes: int = PDF_MAX_BYTES,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Optional[PDFDownload]:
+    """
+    Stream a PDF into a spooled temporary file.
+
+    Bodies up to ``PDF_SPOOL_BYTES`` stay in memory, larger ones roll over to
+    a named temporary file on disk. The download is aborted once ``max_bytes``
+    is exceeded. When ``etag`` or ``last_modified`` are given the request is
+    conditional and a 304 answer is returned as
+    ``PDFDownload(not_modified=True)`` without a body.
+
+    Returns the download, or None on failure. The caller owns the download and
+    must close it.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    pdf_file: IO[bytes] = BytesIO()
+    try:
+        session = await HTTPClient.get_session()
+        async with session.get(pdf_url, headers=headers) as response:
+            validators = {
+                "etag": response.headers.get("ETag") or etag,
+                "last_modified": response.headers.get("Last-Modified")
+                or last_modified,
+            }
+            if response.status == 304 and headers:
+                pdf_file.close()
+                return PDFDownload(None, None, not_modified=True, **validators)
+
+            response.raise_for_status()
+            if response.content_length and response.content_length > max_bytes:
+                raise PDFTooLargeError(
+                    f"PDF is {response.content_length} bytes, limit is {max_bytes}"
+                )
+
+            digest = hashlib.sha256()
+            size = 0
+            async for chunk in response.content.iter_chunked(PDF_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise PDFTooLargeError(f"PDF exceeds limit of {max_bytes} bytes")
+                digest.update(chunk)
+                if size > PDF_SPOOL_BYTES and isinstance(pdf_file, BytesIO):
+                    pdf_file = _roll_over(pdf_file)
+                pdf_file.write(chunk)
+
+        pdf_file.flush()
+        pdf_file.seek(0)
+        return PDFDownload(pdf_file, digest.hexdigest(), **validators)
+    except (aiohttp.ClientError, asyncio.TimeoutError, PDFTooLargeError) as e:
+        pdf_file.close()
+        logging.error(f"Error downloading the PDF: {e}")
         return
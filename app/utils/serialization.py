@@ -0,0 +1,86 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping
+
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Serialize the pydantic models nested in a value"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as JSON, including the pydantic models nested in it
+
+    Uses orjson when installed and pydantic's Rust serializer otherwise;
+    both are several times faster than ``json.dumps``.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return pydantic_core.to_json(value)
+
+
+def loads(raw: bytes) -> Any:
+    """Decode JSON into plain Python values"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return pydantic_core.from_json(raw)
+
+
+@lru_cache(maxsize=None)
+def adapter(type_: Any) -> TypeAdapter:
+    """Validator of a type, built on first use and shared"""
+    return TypeAdapter(type_)
+
+
+class LazyRecord(Mapping[str, Any]):
+    """
+    Decoded JSON object whose typed fields are validated on first access
+
+    Validating a structured resume costs more than parsing its JSON, so
+    fields holding models are only validated when read; ``raw`` serves the
+    plain values to callers that only pass them on.
+    """
+
+    def __init__(self, data: Dict[str, Any], types: Mapping[str, Any]):
+        self.raw = data
+        """Plain decoded values."""
+        self._types = types
+        self._typed: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._typed:
+            return self._typed[key]
+        value = self.raw[key]
+        if key in self._types:
+            value = self._typed[key] = adapter(self._types[key]).validate_python(value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f"LazyRecord({self.raw!r})"
+
+
+def loads_record(raw: bytes, types: Mapping[str, Any]) -> LazyRecord:
+    """
+    Decode a JSON object, validating its typed fields lazily
+
+    Args:
+        raw: JSON of an object
+        types: Type of the fields holding models, by name
+    """
+    return LazyRecord(loads(raw), types)
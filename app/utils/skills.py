@@ -0,0 +1,288 @@
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app import SKILLS_PATH
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - required, the pure Python automaton is a fallback
+    ahocorasick = None
+
+_SHORT_NAME = 2
+"""Names up to this length also need a boundary that is not - & or '."""
+_SHORT_NAME_JOINERS = frozenset("-&'")
+
+_TECH_CONTEXT = re.compile(
+    r"\b(?:skills?|stack|tech|technolog(?:y|ies)|tools?|tooling|languages?|frameworks?|"
+    r"librar(?:y|ies)|programming|software|developer|development|engineer(?:ing)?|coding|"
+    r"apis?|backend|frontend|devops)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+_NEXT_WORD = re.compile(r"[^\S\n]*([\w']+)")
+_PREVIOUS_WORD = re.compile(r"([\w']+)[^\S\n]*$")
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+_NON_SKILL_NEIGHBOURS = frozenset(
+    "grade grades level semester term quarter season break vitamin class".split()
+)
+"""Words next to an ambiguous name that show it is not the skill, e.g. "C grade"."""
+
+
+@dataclass(frozen=True)
+class Skill:
+    """A skill of the taxonomy"""
+
+    name: str
+    """Canonical name."""
+    category: str
+    aliases: Tuple[str, ...] = ()
+    """Other spellings matched as this skill."""
+    case_sensitive: bool = False
+    """Whether names only match with the same case, for names that are also words."""
+    ambiguous: bool = False
+    """Whether names are common outside of tech, e.g. Spring or Chef, and only
+    match on a line with other skills or tech terms."""
+
+
+@dataclass(frozen=True)
+class SkillHit:
+    """A skill found in a text"""
+
+    skill: Skill
+    start: int
+    """Offset of the first matched character in the text."""
+    end: int
+    """Offset after the last matched character in the text."""
+    text: str
+    """Matched text as written."""
+
+    @property
+    def name(self) -> str:
+        return self.skill.name
+
+
+def load_skills(path: str = SKILLS_PATH) -> List[Skill]:
+    """Load the skill taxonomy"""
+    data = json.loads(Path(path).read_text())
+    return [
+        Skill(
+            name=entry["name"],
+            category=entry.get("category", ""),
+            aliases=tuple(entry.get("aliases", ())),
+            case_sensitive=entry.get("case_sensitive", False),
+            ambiguous=entry.get("ambiguous", False),
+        )
+        for entry in data["skills"]
+    ]
+
+
+def _normalize(text: str) -> Tuple[str, str, Sequence[int]]:
+    """
+    Collapse whitespace runs to one space
+
+    Runs in C through ``re`` and ``str.lower``; only texts with characters
+    whose lowercase is longer, e.g. "İ", fall back to a per-character pass.
+
+    Returns:
+        The collapsed text, its lowercased form of the same length, and the
+        offset in the original text of every collapsed character
+    """
+    collapsed = _WHITESPACE.sub(" ", text)
+    lowered = collapsed.lower()
+    if len(lowered) != len(collapsed):
+        lowered = "".join(
+            lower if len(lower) == 1 else char
+            for char, lower in ((char, char.lower()) for char in collapsed)
+        )
+    if len(collapsed) == len(text):
+        return collapsed, lowered, range(len(text))
+
+    offsets: List[int] = []
+    position = 0
+    for run in _WHITESPACE_RUN.finditer(text):
+        offsets.extend(range(position, run.start() + 1))
+        position = run.end()
+    offsets.extend(range(position, len(text)))
+    return collapsed, lowered, offsets
+
+
+class _Automaton:
+    """Pure Python Aho-Corasick automaton, used when pyahocorasick is not installed"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[int, ...]]] = [[]]
+
+    def add_word(self, word: str, value: Tuple[int, ...]) -> None:
+        state = 0
+        for char in word:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.outputs[state].append(value)
+
+    def make_automaton(self) -> None:
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """Yield (offset of the last character, value) of every occurrence"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for offset, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for value in outputs[state]:
+                yield offset, value
+
+
+class SkillIndex:
+    """
+    Aho-Corasick automaton over every name and alias of the skill taxonomy,
+    finding all skills of a text in one linear pass
+    """
+
+    _default: Optional["SkillIndex"] = None
+    """Index of the configured taxonomy, shared by the process."""
+
+    def __init__(self, skills: Iterable[Skill]):
+        self.skills = list(skills)
+        self._patterns: List[Tuple[str, Skill]] = []
+        keys: Dict[str, List[int]] = {}
+        for skill in self.skills:
+            for name in dict.fromkeys((skill.name, *skill.aliases)):
+                pattern, key, _ = _normalize(name.strip())
+                if not key:
+                    continue
+                keys.setdefault(key, []).append(len(self._patterns))
+                self._patterns.append((pattern, skill))
+
+        self._keys = keys
+        self._automaton = ahocorasick.Automaton() if ahocorasick else _Automaton()
+        for key, patterns in keys.items():
+            self._automaton.add_word(key, tuple(patterns))
+        self._automaton.make_automaton()
+
+    @classmethod
+    def load(cls, path: str = SKILLS_PATH) -> None:
+        """Compile the configured taxonomy, once per process"""
+        if cls._default is not None:
+            return
+        cls._default = cls(load_skills(path))
+        logging.info(
+            f"Compiled {len(cls._default._patterns)} names of "
+            f"{len(cls._default.skills)} skills"
+        )
+
+    @classmethod
+    def get(cls) -> "SkillIndex":
+        """Get the index of the configured taxonomy"""
+        cls.load()
+        return cls._default
+
+    def find(self, name: str) -> Optional[Skill]:
+        """Skill a whole name or alias stands for, without context checks"""
+        pattern, key, _ = _normalize(name.strip())
+        for pattern_id in self._keys.get(key, ()):
+            candidate, skill = self._patterns[pattern_id]
+            if not skill.case_sensitive or candidate == pattern:
+                return skill
+        return None
+
+    @staticmethod
+    def _is_boundary(text: str, offset: int, short: bool) -> bool:
+        if offset < 0 or offset >= len(text):
+            return True
+        char = text[offset]
+        return not char.isalnum() and not (short and char in _SHORT_NAME_JOINERS)
+
+    @staticmethod
+    def _in_context(text: str, hit: SkillHit, hits: List[SkillHit]) -> bool:
+        """
+        Whether an ambiguous skill is meant as one: not next to a year or a
+        word like "grade", and on a line with an unambiguous skill or a tech term
+        """
+        start = text.rfind("\n", 0, hit.start) + 1
+        end = text.find("\n", hit.end)
+        end = len(text) if end < 0 else end
+        neighbours = (_NEXT_WORD.match(text, hit.end), _PREVIOUS_WORD.search(text, start, hit.start))
+        for match in neighbours:
+            word = match.group(1) if match else ""
+            if _YEAR.fullmatch(word) or word.lower() in _NON_SKILL_NEIGHBOURS:
+                return False
+        if any(
+            start <= other.start and other.end <= end and not other.skill.ambiguous
+            for other in hits
+        ):
+            return True
+        return bool(_TECH_CONTEXT.search(text, start, end))
+
+    def scan(self, text: str) -> List[SkillHit]:
+        """
+        Find the skills of a text
+
+        Names match case-insensitively, except for case-sensitive skills, on
+        word boundaries and across line breaks. Overlapping matches resolve
+        to the leftmost, then longest one. Ambiguous skills only match in
+        context (see ``_in_context``).
+
+        Returns:
+            Skill hits in order of appearance, with offsets into ``text``
+        """
+        collapsed, lowered, offsets = _normalize(text)
+        candidates = []
+        for last, patterns in self._automaton.iter(lowered):
+            # Most hits of short names end inside a word; skip them in one check
+            if last + 1 < len(collapsed) and collapsed[last + 1].isalnum():
+                continue
+            for pattern_id in patterns:
+                pattern, skill = self._patterns[pattern_id]
+                start = last - len(pattern) + 1
+                short = len(pattern) <= _SHORT_NAME
+                if not (
+                    self._is_boundary(collapsed, start - 1, short)
+                    and self._is_boundary(collapsed, last + 1, short)
+                ):
+                    continue
+                if skill.case_sensitive and collapsed[start:last + 1] != pattern:
+                    continue
+                candidates.append((start, last + 1, skill))
+
+        hits = []
+        covered = 0
+        for start, end, skill in sorted(candidates, key=lambda hit: (hit[0], hit[0] - hit[1])):
+            if start < covered:
+                continue
+            covered = end
+            original_start, original_end = offsets[start], offsets[end - 1] + 1
+            hits.append(
+                SkillHit(skill, original_start, original_end, text[original_start:original_end])
+            )
+        return [hit for hit in hits if not hit.skill.ambiguous or self._in_context(text, hit, hits)]
+
+
+def scan_skills(text: str) -> List[SkillHit]:
+    """Find the skills of a text with the configured taxonomy"""
+    return SkillIndex.get().scan(text)
+
+
+def detected_skills(text: str) -> List[str]:
+    """Canonical names of the skills of a text, in order of first appearance"""
+    return list(dict.fromkeys(hit.name for hit in scan_skills(text)))
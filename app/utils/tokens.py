@@ -0,0 +1,126 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Set
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+_CHARS_PER_TOKEN = 4
+"""Rough ratio used when no tokenizer is installed."""
+
+_SPACES = re.compile(r"[ \t\f\v ]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_CONTROL = re.compile(r"[\x00-\x08\x0b\x0e-\x1f\x7f]")
+_PAGE_MARKER = re.compile(
+    r"^(?:page\s*(?P<page>\d{1,3})(?:\s*(?:of|/)\s*(?P<of>\d{1,3}))?"
+    r"|(?P<number>\d{1,3})\s*(?:of|/)\s*(?P<total>\d{1,3}))$",
+    re.IGNORECASE,
+)
+
+PAGE_BREAK = "\f"
+"""Separator of the pages of extracted PDF text."""
+_HEADER_MAX_CHARS = 120
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional["tiktoken.Encoding"]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # The encoding is downloaded on first use and may be unavailable
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of prompt tokens in a text, estimated when tiktoken is missing"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _is_page_marker(line: str) -> bool:
+    """Whether a line is an explicit page marker, e.g. "Page 2", "2 of 3" or "2/3"."""
+    match = _PAGE_MARKER.match(line)
+    if not match:
+        return False
+    if match.group("page"):
+        return not match.group("of") or int(match.group("page")) <= int(match.group("of"))
+    # A bare fraction such as a grade is only a marker when it reads like one
+    return 0 < int(match.group("number")) <= int(match.group("total"))
+
+
+def _running_line(pages: List[List[str]], end: int) -> Optional[str]:
+    """
+    Line at the same end of every page, i.e. a running header (``end=0``) or
+    footer (``end=-1``)
+
+    Only the first and last line of every page count, so text repeated
+    inside the pages, such as dates or "Present", is never matched.
+    """
+    if len(pages) < 2:
+        return None
+    lines = {content[end] if content else None for content in pages}
+    line = lines.pop() if len(lines) == 1 else None
+    return line if line and len(line) <= _HEADER_MAX_CHARS else None
+
+
+def compact_text(text: str) -> str:
+    """
+    Drop control characters, page markers, running headers/footers and extra whitespace
+
+    Running headers and footers can only be told apart from content when the
+    text marks its pages with ``PAGE_BREAK``; they are kept on the first page,
+    e.g. the name heading of a resume.
+    """
+    text = _CONTROL.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    pages = [
+        [
+            line for line in (_SPACES.sub(" ", line).strip() for line in page.split("\n"))
+            if not _is_page_marker(line)
+        ]
+        for page in text.split(PAGE_BREAK)
+    ]
+
+    content = [[line for line in lines if line] for lines in pages]
+    header, footer = _running_line(content, 0), _running_line(content, -1)
+    kept = list(pages[0])
+    for lines in pages[1:]:
+        indexes = [index for index, line in enumerate(lines) if line]
+        dropped = set()
+        if header:
+            dropped.add(indexes[0])
+        if footer:
+            dropped.add(indexes[-1])
+        kept.append("")
+        kept.extend(line for index, line in enumerate(lines) if index not in dropped)
+
+    return _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut a text to at most ``budget`` tokens, preferring a line boundary"""
+    if budget <= 0 or count_tokens(text) <= budget:
+        return text
+
+    encoding = _encoding()
+    if encoding is None:
+        cut = text[: budget * _CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+
+    newline = cut.rfind("\n")
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut.rstrip()
+
+
+def fit_to_budget(text: str, budget: int) -> str:
+    """Compact a text, then truncate it to ``budget`` tokens (0 for no limit)"""
+    return truncate_to_tokens(compact_text(text), budget)